@@ -0,0 +1,167 @@
+"""
+benchmark som sammenligner integratorene over en lang integrasjon av solsystemet (standard 100 år). For hver integrator og hvert tidssteg måles tiden det tar, hvor mye den totale energien driver og hvor langt posisjonene ender fra en referanseløsning regnet ut med et lite tidssteg.
+Med --check blir det istedenfor kontrollert at block_hermite er minst CHECK_MIN_SPEEDUP ganger raskere enn leapfrog ved samme nøyaktighet, for solsystemet med et asteroidebelte. Programmet avslutter med feilkode 1 hvis ikke.
+Kjøres fra mappen til prosjektet med:
+    python3 -m benchmarks.integrators [--years 100] [--json resultater.json]
+    python3 -m benchmarks.integrators --check
+"""
+import argparse # importerer bibliotek for å lese argumenter fra kommandolinjen
+import json # importerer bibliotek for å lagre resultatene som json
+import sys # importerer bibliotek for å avslutte med feilkode
+import time # importerer bibliotek for å måle tid
+import numpy as np # importerer numpy for å regne ut feil
+from src.physics import total_energy # importerer funksjon som regner ut total energi
+from src.simulation import Simulator, SystemState, init_system_state, SECONDS_PER_DAY # importerer simuleringskjernen
+from src.catalog import load_catalog, generate_belt, BELTS # importerer katalogen og asteroidebeltet
+from src.integrators import get_integrator # importerer funksjon som lager en integrator ut fra navnet
+
+SECONDS_PER_YEAR = 365.25 * SECONDS_PER_DAY # antall sekunder i et år
+
+### integrator, tidssteg i dager og eventuelle innstillinger. rk45 og block_hermite velger delsteg selv ut fra toleransen, så tidssteget der er bare hvor ofte de stopper
+CONFIGURATIONS = [
+    ("euler", 0.5, {}),
+    ("euler", 2, {}),
+    ("leapfrog", 0.5, {}),
+    ("leapfrog", 2, {}),
+    ("yoshida4", 1, {}),
+    ("yoshida4", 4, {}),
+    ("wisdom_holman", 2, {}),
+    ("wisdom_holman", 8, {}),
+    ("rk45", 10, {"tol": 1e-8}),
+    ("rk45", 10, {"tol": 1e-10}),
+    ("block_hermite", 180, {"eta": 0.004}),
+    ("block_hermite", 180, {"eta": 0.001}),
+]
+
+REFERENCE = ("yoshida4", 0.1, {}) # referanseløsning som posisjonsfeilen måles mot
+ENERGY_SAMPLES = 200 # antall ganger energien måles underveis
+
+### kontroll av kostnad ved samme nøyaktighet
+CHECK_CANDIDATE = "block_hermite" # integratoren som skal være raskere
+CHECK_OTHERS = ["yoshida4"] # integratorer som bare blir skrevet ut til sammenligning
+CHECK_BASELINE = "leapfrog" # integratoren CHECK_CANDIDATE sammenlignes med
+CHECK_BASELINE_ACCURACY = 0.02 # nøyaktighetsmålet til CHECK_BASELINE, som gir nøyaktigheten de andre integratorene må klare
+CHECK_MIN_SPEEDUP = 2.0 # hvor mange ganger raskere CHECK_CANDIDATE må være enn CHECK_BASELINE
+CHECK_ASTEROIDS = 1000 # antall testpartikler i asteroidebeltet
+CHECK_YEARS = 5 # antall år det hoppes
+CHECK_REFERENCE_ACCURACY = 0.0025 # nøyaktighetsmål for referanseløsningen (yoshida4)
+ACCURACY_LADDER = [0.08, 0.04, 0.02, 0.01, 0.005, 0.0025] # nøyaktighetsmål som prøves, fra grovest til finest
+
+
+def run(integrator: str, dt_days: float, options: dict, years: float) -> dict:
+    """
+    funksjon som integrerer solsystemet i years år med integratoren og tidssteget, og returnerer sluttilstanden, tiden det tok og største relative energiendring underveis
+    """
+    simulator = Simulator(init_system_state(), solver="direct") # simulator med direkte summering
+    simulator.integrator = get_integrator(integrator, **options) # setter integratoren med innstillinger, f.eks toleranse
+    state = simulator.state
+    total = years * SECONDS_PER_YEAR # hvor langt det skal integreres
+    n_steps = max(1, round(total / (dt_days * SECONDS_PER_DAY))) # antall steg
+    dt = total / n_steps # tidssteg som går opp i total
+    e0 = total_energy(state.pos, state.vel, state.mass) # energien ved start
+    max_drift = 0.0 # største relative energiendring
+    compute_time = 0.0 # tid brukt på integrasjonen, uten energimålingene
+
+    done = 0 # antall steg som er tatt
+    for sample in range(1, ENERGY_SAMPLES + 1): # integrerer i biter og måler energien mellom hver bit
+        n = n_steps * sample // ENERGY_SAMPLES - done # antall steg i denne biten
+        start = time.perf_counter()
+        simulator.step(dt, n)
+        compute_time += time.perf_counter() - start
+        done += n
+        e = total_energy(state.pos, state.vel, state.mass)
+        max_drift = max(max_drift, abs((e - e0) / e0))
+
+    return {"integrator": integrator, "dt_days": dt_days, "options": options, "steps": n_steps, "wall_time": compute_time, "energy_drift": max_drift, "final_energy_drift": abs((e - e0) / e0), "pos": state.pos.copy(), "names": state.names}
+
+
+def belt_system(n: int) -> SystemState:
+    """
+    funksjon som lager solsystemet fra katalogen med n testpartikler i asteroidebeltet
+    """
+    catalog = load_catalog()
+    sun = int(np.argmax(catalog.state.mass))
+    r_min, r_max, prefix = BELTS["asteroids"]
+    catalog.extend(generate_belt(n, r_min, r_max, prefix, catalog.state.mass[sun], catalog.state.pos[sun], catalog.state.vel[sun]))
+    return catalog.state
+
+
+def jump(state: SystemState, integrator: str, accuracy: float, years: float) -> tuple[np.ndarray, float]:
+    """
+    funksjon som hopper years år fram med fast_forward, slik som når man velger en dato, og returnerer sluttposisjonene og tiden det tok
+    """
+    simulator = Simulator(state.copy(), solver="direct")
+    start = time.perf_counter()
+    simulator.fast_forward(round(years * SECONDS_PER_YEAR), accuracy, integrator=integrator)
+    return simulator.state.pos.copy(), time.perf_counter() - start
+
+
+def cost_at_accuracy(state: SystemState, integrator: str, target: float, reference: np.ndarray, years: float) -> dict|None:
+    """
+    funksjon som prøver nøyaktighetsmålene i ACCURACY_LADDER fra grovest til finest, og returnerer det første som gir største posisjonsfeil under target, med tiden det tok. Returnerer None hvis ingen av dem er nøyaktige nok
+    """
+    for accuracy in ACCURACY_LADDER:
+        pos, wall = jump(state, integrator, accuracy, years)
+        error = float(np.max(np.hypot(*(pos - reference).T)))
+        if error <= target:
+            return {"integrator": integrator, "accuracy": accuracy, "wall_time": wall, "max_position_error_m": error}
+    return None
+
+
+def check() -> bool:
+    """
+    funksjon som kontrollerer at CHECK_CANDIDATE er minst CHECK_MIN_SPEEDUP ganger raskere enn CHECK_BASELINE ved samme nøyaktighet. Nøyaktigheten er største posisjonsfeil CHECK_BASELINE får med nøyaktighetsmålet CHECK_BASELINE_ACCURACY, og for de andre integratorene brukes det groveste nøyaktighetsmålet som er minst like nøyaktig
+    """
+    state = belt_system(CHECK_ASTEROIDS)
+    print(f"{len(state)} legemer, {CHECK_YEARS} år, referanse: yoshida4 med nøyaktighetsmål {CHECK_REFERENCE_ACCURACY} ...", flush=True)
+    reference, _ = jump(state, "yoshida4", CHECK_REFERENCE_ACCURACY, CHECK_YEARS)
+    pos, baseline_time = jump(state, CHECK_BASELINE, CHECK_BASELINE_ACCURACY, CHECK_YEARS)
+    target = float(np.max(np.hypot(*(pos - reference).T))) # største posisjonsfeil med CHECK_BASELINE
+    print(f"{'integrator':<16}{'nøyaktighet':>12}{'tid (s)':>10}{'posisjonsfeil (km)':>20}{'speedup':>9}")
+    print(f"{CHECK_BASELINE:<16}{CHECK_BASELINE_ACCURACY:>12g}{baseline_time:>10.2f}{target/1000:>20.4g}{1.0:>9.2f}", flush=True)
+    speedups = {}
+    for integrator in [CHECK_CANDIDATE] + CHECK_OTHERS:
+        result = cost_at_accuracy(state, integrator, target, reference, CHECK_YEARS)
+        if result is None:
+            print(f"{integrator:<16}{'':>12}{'':>10}{'for unøyaktig':>20}", flush=True)
+            speedups[integrator] = 0.0
+            continue
+        speedups[integrator] = baseline_time / result["wall_time"]
+        print(f"{integrator:<16}{result['accuracy']:>12g}{result['wall_time']:>10.2f}{result['max_position_error_m']/1000:>20.4g}{speedups[integrator]:>9.2f}", flush=True)
+    passed = speedups[CHECK_CANDIDATE] >= CHECK_MIN_SPEEDUP
+    print(f"{CHECK_CANDIDATE} er {speedups[CHECK_CANDIDATE]:.1f} ganger raskere enn {CHECK_BASELINE} ved samme nøyaktighet (krav {CHECK_MIN_SPEEDUP:g}): {'ok' if passed else 'FEIL'}")
+    return passed
+
+
+def main() -> None:
+    """
+    funksjon som kjører alle konfigurasjonene og skriver ut en tabell
+    """
+    parser = argparse.ArgumentParser(description="sammenligner integratorene over en lang integrasjon av solsystemet")
+    parser.add_argument("--years", type=float, default=100, help="antall år det integreres (standard 100)")
+    parser.add_argument("--json", help="fil resultatene lagres til som json")
+    parser.add_argument("--check", action="store_true", help=f"kontrollerer at {CHECK_CANDIDATE} er minst {CHECK_MIN_SPEEDUP:g} ganger raskere enn {CHECK_BASELINE} ved samme nøyaktighet")
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(0 if check() else 1)
+
+    print(f"referanse: {REFERENCE[0]} med tidssteg {REFERENCE[1]} dager over {args.years:g} år ...", flush=True)
+    reference = run(*REFERENCE, args.years) # referanseløsning
+    print(f"{'integrator':<16}{'dt (dager)':>11}{'steg':>10}{'tid (s)':>10}{'energidrift':>14}{'posisjonsfeil (km)':>20}  verste legeme")
+
+    results = []
+    for integrator, dt_days, options in CONFIGURATIONS:
+        result = run(integrator, dt_days, options, args.years)
+        error = np.hypot(*(result["pos"] - reference["pos"]).T) # posisjonsfeil for hvert legeme
+        worst = int(np.argmax(error)) # legemet med størst feil
+        label = integrator + "".join(f" {k}={v:g}" for k, v in options.items()) # navn med innstillinger
+        print(f"{label:<16}{dt_days:>11g}{result['steps']:>10}{result['wall_time']:>10.2f}{result['energy_drift']:>14.2e}{error[worst]/1000:>20.4g}  {result['names'][worst]}", flush=True)
+        results.append({"integrator": integrator, "dt_days": dt_days, "options": options, "steps": result["steps"], "wall_time": result["wall_time"], "energy_drift": result["energy_drift"], "final_energy_drift": result["final_energy_drift"], "max_position_error_m": float(error[worst]), "worst_body": result["names"][worst]})
+
+    if args.json: # lagrer resultatene
+        with open(args.json, "w") as f:
+            json.dump({"years": args.years, "reference": {"integrator": REFERENCE[0], "dt_days": REFERENCE[1]}, "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+benchmark som måler hvor mye raskere kraftberegningen går når den fordeles på flere prosesser (src/parallel_forces.py), sammenlignet med direkte summering i en prosess.
+For hvert antall legemer og prosesser skrives tiden per kraftberegning, tiden til den tregeste flisen, speedup og hvor stor del av tiden prosessene regnet. Kjøres fra mappen til prosjektet med:
+    python3 -m benchmarks.parallel_forces [--bodies 2000 5000 20000] [--processes 1 2 4 8] [--json resultater.json]
+"""
+import argparse # importerer bibliotek for å lese argumenter fra kommandolinjen
+import json # importerer bibliotek for å lagre resultatene som json
+import os # importerer bibliotek for å finne antall kjerner
+import statistics # importerer bibliotek for å regne ut median
+import time # importerer bibliotek for å måle tid
+from benchmarks.suite import random_system # importerer tilfeldige systemer med samme tilfeldige tall hver gang
+from src.parallel_forces import ParallelForces # importerer kraftberegning fordelt på flere prosesser
+from src.physics import compute_direct_accelerations # importerer direkte summering i en prosess
+
+DEFAULT_BODIES = [2000, 5000, 20000] # antall legemer som måles
+DEFAULT_REPEATS = 5 # antall målinger per konfigurasjon. Medianen blir rapportert
+
+
+def process_counts() -> list[int]:
+    """
+    funksjon som returnerer 1, 2, 4, ... opp til antall kjerner, og antall kjerner
+    """
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    return counts if counts[-1] == cores else counts + [cores]
+
+
+def measure(function, repeats: int) -> float:
+    """
+    funksjon som kaller function en gang for å varme opp og returnerer medianen av repeats målinger i sekunder
+    """
+    function()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """
+    funksjon som måler alle kombinasjoner av antall legemer og prosesser og skriver ut en tabell
+    """
+    parser = argparse.ArgumentParser(description="måler speedup for kraftberegning fordelt på flere prosesser")
+    parser.add_argument("--bodies", nargs="+", type=int, default=DEFAULT_BODIES, help=f"antall legemer (standard {' '.join(map(str, DEFAULT_BODIES))})")
+    parser.add_argument("--processes", nargs="+", type=int, default=process_counts(), help="antall prosesser (standard 1, 2, 4, ... opp til antall kjerner)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help=f"antall målinger per konfigurasjon (standard {DEFAULT_REPEATS})")
+    parser.add_argument("--json", help="fil resultatene lagres til som json")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} kjerner")
+    print(f"{'legemer':>8}{'prosesser':>10}{'tid (ms)':>10}{'tregeste flis (ms)':>20}{'speedup':>9}{'utnyttelse':>12}", flush=True)
+    results = []
+    for n_bodies in args.bodies:
+        state = random_system(n_bodies)
+        serial = measure(lambda: compute_direct_accelerations(state.pos, state.mass, out=state.acc), args.repeats) # en prosess, med Newtons tredje lov
+        print(f"{n_bodies:>8}{'serielt':>10}{1000*serial:>10.2f}{'':>20}{1.0:>9.2f}{'':>12}", flush=True)
+        results.append({"bodies": n_bodies, "processes": 0, "wall_ms": 1000*serial, "speedup": 1.0})
+        for processes in args.processes:
+            backend = ParallelForces(processes, threshold=0) # bruker prosessene uansett antall legemer
+            wall = measure(lambda: backend.accelerations(state.pos, state.mass, out=state.acc), args.repeats)
+            summary = backend.summary()
+            backend.close()
+            slowest, efficiency = summary.get("slowest_tile_ms", 1000*wall), summary.get("efficiency", 1.0) # med en prosess regnes alt i prosessen selv
+            print(f"{n_bodies:>8}{processes:>10}{1000*wall:>10.2f}{slowest:>20.2f}{serial/wall:>9.2f}{efficiency:>12.0%}", flush=True)
+            results.append({"bodies": n_bodies, "processes": processes, "wall_ms": 1000*wall, "slowest_tile_ms": slowest, "speedup": serial/wall, "efficiency": efficiency, "parallel": summary["parallel_calls"] > 0})
+
+    if args.json: # lagrer resultatene
+        with open(args.json, "w") as f:
+            json.dump({"cores": os.cpu_count(), "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
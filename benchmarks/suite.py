@@ -0,0 +1,259 @@
+"""
+benchmark suite som måler de mest brukte delene av programmet uten skjerm (SDL dummy driver): kraftberegning for mange legemer, hopp til en dato, en hel frame i simuleringen, zoom, tekst og lagring.
+Resultatene kan lagres som json og sammenlignes med en tidligere kjøring. Hvis en benchmark er tregere enn tidligere ganger terskelen i thresholds.json, regnes det som en regresjon og programmet avslutter med feilkode 1.
+Kjøres fra mappen til prosjektet med:
+    python3 -m benchmarks.suite [--json resultater.json] [--baseline forrige.json] [--only navn] [--repeats 5]
+"""
+import os # importerer bibliotek for å jobbe med filer og miljøvariabler
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # pygame tegner til minnet istedenfor et vindu
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse # importerer bibliotek for å lese argumenter fra kommandolinjen
+import contextlib # importerer bibliotek for å skjule utskrift når simulering.py importeres
+import importlib.util # importerer bibliotek for å laste simulering.py, som er et script og ikke en modul
+import io
+import json # importerer bibliotek for å lagre resultatene som json
+import statistics # importerer bibliotek for å regne ut median
+import subprocess # importerer bibliotek for å finne commit resultatene hører til
+import sys
+import tempfile # importerer bibliotek for å lage midlertidige mapper
+import time # importerer bibliotek for å måle tid
+from typing import Callable
+import numpy as np # importerer numpy for å lage tilfeldige systemer
+import pygame # importerer pygame for å tegne uten skjerm
+from src.simulation import Simulator, SystemState, init_system_state, SECONDS_PER_DAY # importerer simuleringskjernen
+from src.checkpoints import CheckpointStore # importerer checkpoints som brukes når man hopper til en dato
+from src.storage import Storage # importerer lagring av simuleringen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # mappen til prosjektet
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json") # standard terskler for regresjoner
+DEFAULT_REPEATS = 5 # antall ganger hver benchmark måles. Medianen blir rapportert
+TEMP_DIR = tempfile.TemporaryDirectory() # mappe for filer benchmarks skriver. Slettes når programmet avslutter
+
+BENCHMARKS: dict[str, tuple[Callable[[], tuple[Callable[[], None], int]], int]] = {} # navn -> (setup, antall målinger)
+
+
+def benchmark(name: str, repeats: int=DEFAULT_REPEATS):
+    """
+    dekorator som registrerer en benchmark. Funksjonen gjør oppsettet og returnerer (funksjonen som måles, antall kall per måling). repeats er antall målinger, som kan være færre for benchmarks som tar lang tid
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeats)
+        return setup
+    return register
+
+
+def load_simulering():
+    """
+    funksjon som laster simulering.py uten å starte programmet. Laster bare en gang. Import leser og skriver ingen lagringer eller checkpoints, men argumentene til benchmarken skal ikke leses som argumenter til programmet
+    """
+    if "simulering" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("simulering", os.path.join(ROOT, "simulering.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["simulering"] = module
+        argv, cwd = sys.argv, os.getcwd() # simulering.py leser sys.argv og bytter mappe når den importeres
+        sys.argv = [spec.origin]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()): # simulering.py skriver en melding når den importeres
+                spec.loader.exec_module(module)
+        finally:
+            sys.argv = argv
+            os.chdir(cwd)
+    return sys.modules["simulering"]
+
+
+def random_system(n: int) -> SystemState:
+    """
+    funksjon som lager et system med en sol og n - 1 legemer i tilfeldige baner, med samme tilfeldige tall hver gang
+    """
+    state = init_system_state()
+    rng = np.random.default_rng(n)
+    radius = rng.uniform(5e10, 5e12, n - 1) # avstand fra sola
+    angle = rng.uniform(0, 2 * np.pi, n - 1)
+    speed = np.sqrt(6.674e-11 * state.mass[0] / radius) # sirkelbane
+    pos = np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+    vel = np.column_stack((-speed * np.sin(angle), speed * np.cos(angle)))
+    return SystemState(["Sola"] + [f"legeme {i}" for i in range(1, n)], np.concatenate(([state.mass[0]], rng.uniform(1e20, 1e26, n - 1))), np.vstack(([0, 0], pos)), np.vstack(([0, 0], vel)))
+
+
+### kraftberegning
+for n_bodies in (9, 100, 1000, 10000):
+    def force_setup(n_bodies=n_bodies):
+        simulator = Simulator(init_system_state() if n_bodies == 9 else random_system(n_bodies)) # solver "auto" velger Barnes-Hut for mange legemer
+        return simulator.update_aks, max(1, 20000 // n_bodies)
+    benchmark(f"force_n{n_bodies}", repeats=3 if n_bodies >= 10000 else DEFAULT_REPEATS)(force_setup)
+
+
+### hopp til en dato uten lagrede checkpoints (første gang en dato velges) og med checkpoints
+for years in (1, 10, 100):
+    def fast_forward_setup(years=years):
+        target = int(years * 365.25) * SECONDS_PER_DAY # simuleringstiden det hoppes til
+        def jump():
+            with tempfile.TemporaryDirectory(dir=TEMP_DIR.name) as directory: # tom checkpoint mappe hver gang
+                store = CheckpointStore(os.path.join(directory, "checkpoints"), init_system_state())
+                store.fast_forward(Simulator(init_system_state()), target)
+        return jump, 1
+    benchmark(f"fast_forward_{years}y", repeats=1 if years >= 100 else 3)(fast_forward_setup)
+
+    def fast_forward_warm_setup(years=years):
+        target = int(years * 365.25) * SECONDS_PER_DAY
+        directory = tempfile.mkdtemp(dir=TEMP_DIR.name)
+        start = init_system_state() # leses fra katalogen utenfor målingen
+        store = CheckpointStore(os.path.join(directory, "checkpoints"), start)
+        store.fast_forward(Simulator(start.copy()), target) # fyller checkpoints
+        return lambda: store.fast_forward(Simulator(start.copy()), target), 1
+    benchmark(f"fast_forward_{years}y_checkpoints", repeats=3)(fast_forward_warm_setup)
+
+
+@benchmark("simulation_frame")
+def frame_setup():
+    """
+    en frame i simulation_screen: fysikk for 1/60 s, posisjonene til bildene, kamera, tekst og tegning der hele skjermen blir tegnet på nytt
+    """
+    simulering = load_simulering()
+    from src.scheduler import FixedStepScheduler
+    from src.dirty_renderer import DirtyRenderer, sprite_items
+    camera_group = simulering.init_camera_group()
+    scheduler = FixedStepScheduler()
+    renderer = DirtyRenderer()
+    info_group = pygame.sprite.Group()
+    texts = [simulering.Text(info_group, "", (5, 5 + 25*i), font_size=15) for i in range(3)]
+    def frame():
+        scheduler.advance(1/60, camera_group.dt_per_s, camera_group.simulator.step, camera_group.simulator.state.time)
+        camera_group.update_rects()
+        camera_group.record_trails()
+        camera_group.update_camera()
+        items = camera_group.visible_items()
+        for i, text in enumerate(texts): # teksten endres hver frame, som datoen gjør når simuleringen går fort
+            text.update_text(f"{i}: {camera_group.simulator.state.time}")
+        items += sprite_items(info_group)
+        renderer.invalidate() # måler verste tilfelle der hele skjermen tegnes
+        renderer.draw(simulering.SCREEN, items, camera_group.view_key())
+    return frame, 20
+
+
+@benchmark("zoom")
+def zoom_setup():
+    """
+    endrer zoom og størrelsen på alle bildene, som når venstre eller høyre pil holdes inne
+    """
+    simulering = load_simulering()
+    camera_group = simulering.init_camera_group()
+    zooms = np.linspace(0.3, 5, 50) # zoom nivåer som brukes etter tur
+    position = [0]
+    def zoom():
+        camera_group.zoom_scale = zooms[position[0] % len(zooms)]
+        camera_group.update_image_sizes()
+        position[0] += 1
+    return zoom, 100
+
+
+@benchmark("text_update")
+def text_setup():
+    """
+    oppdaterer en tekst med ny verdi hver gang, som informasjonen om romobjektet kameraet følger
+    """
+    simulering = load_simulering()
+    text = simulering.Text(pygame.sprite.Group(), "", (5, 5), font_size=15)
+    counter = [0]
+    def update():
+        counter[0] += 1
+        text.update_text(f"Posisjon: ({counter[0] * 12345}, {-counter[0] * 54321})")
+    return update, 1000
+
+
+@benchmark("storage_roundtrip")
+def storage_setup():
+    """
+    lagrer tilstanden og leser den igjen fra disk
+    """
+    state = init_system_state()
+    directory = tempfile.mkdtemp(dir=TEMP_DIR.name)
+    storage = Storage(os.path.join(directory, "storage.bin"))
+    def roundtrip():
+        storage.update(state, 0, 86400, 1, (0, 0))
+        assert storage.get() is not None
+    return roundtrip, 20
+
+
+def measure(setup: Callable[[], tuple[Callable[[], None], int]], repeats: int) -> dict:
+    """
+    funksjon som kjører en benchmark repeats ganger og returnerer median og minste tid per kall i sekunder
+    """
+    function, number = setup()
+    function() # første kall varmer opp cacher
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(times), "min_s": min(times), "repeats": repeats, "number": number}
+
+
+def git_commit() -> str|None:
+    """
+    funksjon som returnerer commit resultatene hører til, eller None hvis det ikke er et git repository
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, thresholds: dict) -> list[str]:
+    """
+    funksjon som sammenligner resultatene med baseline og returnerer navnene på benchmarks der den raskeste målingen er mer enn terskelen ganger tregere. Terskelen er thresholds[navn], eller thresholds["default"]
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min_s"] / baseline[name]["min_s"] # minste tid er minst påvirket av andre prosesser på maskinen
+        threshold = thresholds.get(name, thresholds.get("default", 1.2))
+        status = "REGRESJON" if ratio > threshold else "ok"
+        print(f"  {name:<34}{ratio:>8.2f}x  (terskel {threshold:.2f}x)  {status}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    """
+    funksjon som kjører benchmarks, skriver en tabell og eventuelt sammenligner med baseline
+    """
+    parser = argparse.ArgumentParser(description="måler hastigheten til fysikk, tegning, tekst og lagring")
+    parser.add_argument("--json", help="fil resultatene lagres til som json")
+    parser.add_argument("--baseline", help="json fil fra en tidligere kjøring som resultatene sammenlignes med")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH, help="json fil med tillatt forhold mellom ny og gammel tid per benchmark")
+    parser.add_argument("--only", nargs="+", help="kjører bare benchmarks som har et av disse ordene i navnet")
+    parser.add_argument("--repeats", type=int, help="antall målinger per benchmark")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.only or any(word in name for word in args.only)] # benchmarks som skal kjøres
+    results = {}
+    print(f"{'benchmark':<34}{'median':>12}{'min':>12}")
+    for name in names:
+        setup, repeats = BENCHMARKS[name]
+        results[name] = measure(setup, args.repeats or repeats)
+        print(f"{name:<34}{results[name]['median_s']*1000:>10.3f}ms{results[name]['min_s']*1000:>10.3f}ms", flush=True)
+
+    if args.json: # lagrer resultatene
+        with open(args.json, "w") as f:
+            json.dump({"commit": git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "results": results}, f, indent=4)
+
+    if args.baseline: # sammenligner med en tidligere kjøring
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+        print(f"sammenlignet med {args.baseline} (commit {baseline.get('commit')}):")
+        regressions = compare(results, baseline["results"], thresholds)
+        if regressions:
+            print(f"{len(regressions)} regresjoner: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
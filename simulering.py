@@ -3,9 +3,24 @@ import sys # importerer modul for å manipulere kjøretidsmiljøet
 import pygame # importerer bibliotek for å bruke pygame
 import datetime # importerer bibliotek for å bruke datoer i python
 from dateutil.relativedelta import relativedelta # bibliotek for å kunne manipulere datetime, som f.eks å legge til en måned til en dato
-from src.custom_pygame_elements import Image, Button, Text # importerer modul med klassene Image, Button og Text for å enkelt lage og vise elementer i pygame
-from src.storage import Storage # importerer modul med klassen Storage for å lagre simuleringstilstand slik at man kan gjenoppta en simulering
+from src.custom_pygame_elements import Image, Button, Text, Canvas # importerer modul med klassene Image, Button, Text og Canvas for å enkelt lage og vise elementer i pygame
+from src.save_slots import SaveSlots, Autosaver # importerer modul med lagringsplasser og autolagring slik at man kan gjenoppta en simulering
+from src.simulation import Simulator, date_to_seconds, DEFAULT_DATE, DEFAULT_INTEGRATOR, FAST_FORWARD_INTEGRATOR # importerer modul med simuleringskjernen som holder og integrerer den fysiske tilstanden uten pygame
+from src.scheduler import FixedStepScheduler # importerer modul med klassen FixedStepScheduler som tar fysiske steg med fast lengde uavhengig av FPS
+from src.worker import PhysicsWorker # importerer modul med klassen PhysicsWorker som kan kjøre fysikken i en egen prosess
+from src.checkpoints import CheckpointStore # importerer modul med klassen CheckpointStore som lagrer tilstanden med jevne mellomrom slik at man kan hoppe raskt til en dato
+from src.dirty_renderer import DirtyRenderer, sprite_items # importerer modul som bare tegner de delene av skjermen som er endret
+from src.trails import OrbitTrails # importerer modul med klassen OrbitTrails som husker banene til romobjektene
+from src.texture_cache import textures # importerer felles cache for bilder slik at bildene ikke leses fra disk hver gang zoom endres
+from src.recording import TrajectoryRecorder, TrajectoryReader, latest_recording # importerer modul som tar opp simuleringen til filer og spiller den av igjen
+from src.profiler import FrameProfiler # importerer modul som måler hvor lang tid hver del av en frame tar
+from src.catalog import load_catalog, CATALOG_PATH, RENDER_IMAGE # importerer modul som leser startverdiene til legemene fra en katalog
+from src.pick_grid import PickGrid # importerer modul med rutenettet som brukes for å finne legemet som blir klikket
+from src.kepler_preview import KeplerPreview # importerer modul som regner ut omtrentlige posisjoner for en dato uten å integrere
+from src.horizons import load_horizons_files # importerer modul som leser tilstandsvektorer eksportert fra JPL Horizons
+import numpy as np # importerer numpy for å tegne mange punkter samtidig
 import os
+import time # importerer bibliotek for å måle tid
 
 os.chdir(os.path.dirname(os.path.abspath(__file__))) # set cwd
 
@@ -18,71 +33,126 @@ pygame.display.set_icon(appIcon) # legger til app icon
 
 FPS = 60 # max FPS for simulering 
 
+USE_PHYSICS_WORKER = "--worker" in sys.argv # hvis programmet startes med --worker, kjører fysikken i en egen prosess og skjermen viser interpolerte posisjoner
+
+def get_option(option: str, default: str|None) -> str|None:
+    """
+    funksjon som returnerer verdien etter option i kommandolinjen, f.eks "--integrator leapfrog", eller default hvis option ikke er gitt
+    """
+    if option in sys.argv[:-1]: # hvis option er gitt og har en verdi etter seg
+        return sys.argv[sys.argv.index(option) + 1]
+    return default
+
+INTEGRATOR = get_option("--integrator", DEFAULT_INTEGRATOR) # integrator som brukes når simuleringen spilles av (euler, leapfrog, yoshida4, wisdom_holman eller rk45)
+
+JUMP_INTEGRATOR = get_option("--jump-integrator", FAST_FORWARD_INTEGRATOR) # integrator som brukes når man hopper til en dato
+
+SOLVER = get_option("--solver", "auto") # hvordan gravitasjonen regnes ut (auto, direct, barnes_hut eller parallel)
+
+DATA_DIR = get_option("--data-dir", "./data") # mappe med lagringer, checkpoints og opptak. Tester kan sette en midlertidig mappe slik at dataene til brukeren ikke blir endret
+
+RECORDINGS_DIR = os.path.join(DATA_DIR, "recordings") # mappe med opptak av simuleringen
+
+RECORD_ON_START = "--record" in sys.argv # hvis programmet startes med --record, blir simuleringen tatt opp fra den starter
+
+REPLAY_PATH = get_option("--replay", None) # opptak som spilles av når p trykkes. Hvis det ikke er gitt, brukes det nyeste opptaket i RECORDINGS_DIR
+
+PROFILE_PATH = get_option("--profile", None) # csv eller jsonl fil som tiden til hver fase i hver frame skrives til, hvis den er gitt
+
+PROFILER_HUD_INTERVAL = 0.5 # antall sekunder mellom hver gang teksten med ytelsesmålinger oppdateres
+
+CATALOG = load_catalog(get_option("--catalog", CATALOG_PATH)) # katalog med startverdiene til legemene, bildene deres og om de tegnes som bilde eller punkt
+
+HORIZONS_PATH = get_option("--horizons", None) # fil eller mappe med tabeller fra JPL Horizons. Hvis den er gitt, starter init_simulation fra tidspunktet i tabellen nærmest valgt dato istedenfor fra checkpoints
+
+HORIZONS = load_horizons_files([HORIZONS_PATH]) if HORIZONS_PATH else None # tilstandsvektorer fra Horizons
+
+POINT_COLOR = (170, 170, 170) # fargen til legemer som tegnes som punkter
+
+PREVIEW_SIZE = 130 # bredden og høyden til forhåndsvisningen i choose_date_screen i piksler
+
+PREVIEW_BACKGROUND = (15, 15, 25) # bakgrunnsfargen til forhåndsvisningen
+
 CLOCK = pygame.time.Clock() # lager ny pygame klokke 
 
 CONVERT = 1/4182695000 # et veldig lite tall for å gå fra virkelig avstand til pixler i pygame. 1 pixel tilsvarer altså 4 182 695 000 m i virkeligheten 
 
-GRAV_CONST = 6.67430e-11 # gravitasjonskonstanten 
+save_slots: SaveSlots|None = None # lagringsplasser med navn for å lagre og hente lagret simuleringsstilstand. Lages i main(), slik at import ikke lager mapper eller importerer gamle lagringer
 
-storage = Storage("./data/storage_data.json") # storage objekt for å lagre og hente lagret simuleringsstilstand 
+RESUME_SLOT = "fortsett" # slot som lagres når man går ut av simuleringen
+AUTOSAVE_SLOT = "autosave" # slot som autolagringen skriver til mens simuleringen kjører
+PREVIOUS_SLOT = "forrige" # slot med den forrige simuleringen når en ny simulering startes
 
-def aks(x: float, y: float, mass: float) -> tuple[float, float]: 
+kepler_preview = KeplerPreview(CATALOG.state, CATALOG.satellite_groups()) # regner ut omtrentlige posisjoner for datoen som velges i choose_date_screen
+
+PREVIEW_RADIUS = max(float(np.max(np.hypot(*(CATALOG.state.pos - CATALOG.state.pos[kepler_preview.central]).T))), 1.0) # avstanden fra sola som tilsvarer kanten av forhåndsvisningen
+
+checkpoints: CheckpointStore|None = None # checkpoints med tilstanden til solsystemet med jevne mellomrom slik at init_simulation bare trenger å integrere fra nærmeste checkpoint. Lages av get_checkpoints første gang en dato velges, slik at import ikke leser eller skriver filer
+
+def get_checkpoints() -> CheckpointStore: 
     """
-    funksjon for å finne akselerasjonsvektor til et objekt når gravitasjonskraften fra et objekt med masse lik parameteren masse, virker på objektet. x er avstanden i x retning i et koordinatsystem, og y er avstanden i y retning i et koordinatsystem. 
+    funksjon som returnerer checkpointene, og lager dem første gang. CheckpointStore leser indeksen og regner ut nøkkelen til hele katalogen, så det gjøres ikke før det trengs
+    """
+    global checkpoints
+    if checkpoints is None: 
+        checkpoints = CheckpointStore(os.path.join(DATA_DIR, "checkpoints"), CATALOG.state, integrator=JUMP_INTEGRATOR)
+    return checkpoints
+
+class Body: 
     """
-    r = (x**2 + y**2)**0.5 # avstanden (rett linje) fra objektet som virker med gravitasjonskraft til okjektet vi kalkulerer akselerasjonen til. Lengde av vektor
-    a_x = -GRAV_CONST*mass*x/r**3 # kalkulerer akselerasjonen til objektet i x retning ut fra massen til objektet som trekker med gravitasjonskraften, avstanden i x retning og avstanden i rett linje mellom de to objektene
-    a_y = -GRAV_CONST*mass*y/r**3 # kalkulerer akselerasjonen til objektet i y retning ut fra massen til objektet som trekker med gravitasjonskraften, avstanden i y retning og avstanden i rett linje mellom de to objektene
-    return a_x, a_y # returnerer akselerasjonsvektoren som er kalkulert 
+    Klasse med egenskapene til et legeme i SystemState. Klasser som arver må sette self.state og self.index
+    """
+    @property
+    def name(self) -> str: # navn til objektet
+        return self.state.names[self.index]
+
+    @property
+    def mass(self) -> float: # masse til objektet
+        return self.state.mass[self.index]
+
+    @property
+    def x(self) -> float: # virkelig x koordinat 
+        return self.state.pos[self.index, 0]
+
+    @property
+    def y(self) -> float: # virkelig y koordinat
+        return self.state.pos[self.index, 1]
 
+    @property
+    def v_x(self) -> float: # x verdi i fartsvektor
+        return self.state.vel[self.index, 0]
 
-class Space_object(pygame.sprite.Sprite): 
+    @property
+    def v_y(self) -> float: # y verdi i fartsvektor
+        return self.state.vel[self.index, 1]
+
+    @property
+    def a_x(self) -> float: # x verdi i akselerasjonsvektor
+        return self.state.acc[self.index, 0]
+
+    @property
+    def a_y(self) -> float: # y verdi i akselerasjonsvektor
+        return self.state.acc[self.index, 1]
+
+
+class Space_object(pygame.sprite.Sprite, Body): 
     """ 
     Klasse for å vise, flytte og oppdaterer romobjekter. Arver fra pygame sprite klasse noe som gjør at vi kan lage sprite-er (2D bilder) i pygame og gjør det enkelt å flytte og vise objektetene til skjermen 
     """
-    def __init__(self, sprite_group: pygame.sprite.Group, name: str, img_path: str, size: float, mass: float, x: float, y: float, v_x: float, v_y: float): # initialsierer klasse
+    def __init__(self, sprite_group: CameraGroup, index: int, img_path: str, size: float): # initialsierer klasse
         super().__init__(sprite_group) # initialiserer sprite klasse og legger til objektet til sprite gruppe
         self.size = size # størrelsen på bildet som vises 
         self.img_path = img_path # path til bilde som vises
-        self.name = name # navn til objektet
-        self.mass = mass # masse til objektet
-        self.x = x # virkelig x koordinat 
-        self.y = y # virkelig y koordinat
-        self.v_x = v_x # x verdi i fartsvektor
-        self.v_y = v_y # y verdi i fartsvektor
-        self.a_x = 0 # x verdi i akselerasjonsvektor
-        self.a_y = 0 # y verdi  akselerasjonsvektor
-        self.image = pygame.image.load(self.img_path).convert_alpha() # laster inn bilde som vises til skjermen
-        self.image = pygame.transform.scale(self.image, (self.size, self.size)) # skalerer bilde til riktig størrelse
+        self.state = sprite_group.simulator.state # SystemState som holder den fysiske tilstanden til alle romobjektene. Space_object er bare en visning av en rad i arrayene
+        self.index = index # indeksen til objektet i arrayene i SystemState
+        sprite_group.bodies[index] = self # kamera gruppen slår opp romobjektet ut fra indeksen
+        self.image = textures.get(self.img_path, (self.size, self.size)) # henter bilde med riktig størrelse fra cachen
+        self.trail_color = tuple(pygame.transform.average_color(self.image))[:3] # fargen til banen er gjennomsnittsfargen til bildet
         self.rect = self.image.get_rect() # lager et pygame rect for å endre på posisjonen og manipulere objektet når det vises på skjermen
         self.rect.center = (round(pygame.display.get_surface().get_width()/2), round(pygame.display.get_surface().get_height()/2)) # setter senter av rect til midten av skjermen
         self.rect.x = round(self.x * CONVERT)  # gjør om fra virkelig x koordinat til posisjonen langs x retning i pygame 
         self.rect.y = round(-self.y * CONVERT) # gjør om fra virkelig y koordinat til posisjonen langs y retning i pygame. Siden at jo større y koordinat i pygame betyr lengre ned på skjermen (altså motsatt av et vanligkoordinatsystem), må vi ta den negative y-koordinaten for å få riktig plassering på skjermen.
            
-    def update_aks(self, space_objects: list[Space_object]) -> None: 
-        """ 
-        metode for å oppdaterer akselerasjonsvektoren til objektet
-        """
-        self.a_x = 0 # nullstiller akselerasjonen
-        self.a_y = 0 # nullstiller akselerasjonen 
-        for space_object in space_objects: # looper gjennom alle romobjekter
-            if space_object is not self: # så lenge at romobjektet ikke er den selv, kalkuler akselerasjonen objektet (self) får ut fra gravitasjonskraften fra det fremmede objektet
-                d_x = self.x - space_object.x # avstand mellom objektene i x retning
-                d_y = self.y - space_object.y # avstand mellom objektene i y retning
-                a_x, a_y = aks(d_x, d_y, space_object.mass) # regner ut akselerasjonen objektet får fra det fremmede objektet 
-                self.a_x += a_x # legger til akselerasjon i x retning 
-                self.a_y += a_y # legger til akselerasjon i y retning
-                  
-    def update_pos(self, dt: float, zoom: float, half_w: float, half_h: float) -> None: 
-        """
-        metode for å oppdaterer posisjonen til objektet
-        """
-        self.v_x += self.a_x*dt # oppdaterer fartsvektoren ut fra akselerasjon og tidsendring
-        self.v_y += self.a_y*dt  # oppdaterer fartsvektorenut fra akselerasjon og tidsendring
-        self.x += self.v_x*dt # oppdaterer x koordinat ut fra fartsvektor og tidsendring
-        self.y += self.v_y*dt# oppdaterer y koordinat ut fra fartsvektor og tidsendring
-        self.update_rect(zoom, half_w, half_h) # kaller metode for å oppdaterer rect slik at posisjonen til bildet som vises på skjermen også endres
-        
     def update_rect(self, zoom: float, half_w: float, half_h: float) -> None: 
         """ 
         metode for å oppdaterer rect, altså posisjonen til bildet på skjermen ut fra vireklig posisjon
@@ -92,18 +162,36 @@ class Space_object(pygame.sprite.Sprite):
         self.rect.y -= self.y * CONVERT * zoom # gjør om fra virkelig y koordinat til posisjonen langs y retning i pygame ut fra CONVERT og zoom level. Siden at jo større y koordinat i pygame betyr lengre ned på skjermen (altså motsatt av et vanligkoordinatsystem), må vi ta den negative y-koordinaten for å få riktig plassering på skjermen.
 
     def update_image_size(self, zoom: float, half_w: float, half_h: float) -> None: # metode for å oppdatete bildestørrelse når zoom endres 
-        self.image = pygame.image.load(self.img_path).convert_alpha() # laster inn bilde på nytt
-        self.image = pygame.transform.scale(self.image, (self.size * zoom, self.size*zoom)) # skalerer bilde til riktig størrelse
+        self.image = textures.get(self.img_path, (self.size * zoom, self.size*zoom)) # henter bilde med riktig størrelse fra cachen. Leser ikke fra disk
         self.rect = self.image.get_rect() # lager et nytt pygame rect
         self.update_rect(zoom, half_w, half_h) # oppdaterer rect ut fra zoom level 
         
+
+
+class Point_object(Body): 
+    """
+    Klasse for et legeme som tegnes som punkt. Lages først når legemet blir klikket, slik at kameraet kan følge det og informasjonen om det kan vises uten at alle punktene trenger et eget objekt
+    """
+    def __init__(self, camera_group: CameraGroup, index: int): # initialsierer klasse
+        self.camera_group = camera_group # kamera gruppen punktet tegnes av
+        self.state = camera_group.simulator.state # SystemState som holder den fysiske tilstanden
+        self.index = index # indeksen til legemet i arrayene i SystemState
+        
+    @property
+    def rect(self) -> pygame.Rect: # rect på 1 piksel der punktet er, uten offset, på samme måte som rect til romobjektene
+        scale = CONVERT * self.camera_group.zoom_scale # fra meter til piksler
+        return pygame.Rect(self.camera_group.half_w + self.x * scale, self.camera_group.half_h - self.y * scale, 1, 1)
+        
             
 class CameraGroup(pygame.sprite.Group): 
     """
     Klasse som for å manipulere kameraet. Arver fra sprite gruppe, og inneholder alle romobjekter (space_object)
     """
-    def __init__(self): # initialiserer klasse
+    def __init__(self, simulator: Simulator, image_index: np.ndarray, point_index: np.ndarray): # initialiserer klasse
         super().__init__() # initialiserer sprite group klasse slik at CameraGroup fungerer som sprite gruppe 
+        self.simulator = simulator # simulator som holder og integrerer den fysiske tilstanden til romobjektene
+        self.image_index = image_index # indeksene til legemene som vises med bilde (ett Space_object hver, i samme rekkefølge)
+        self.point_index = point_index # indeksene til legemene som bare tegnes som punkter, uten eget bilde eller Space_object
         self.display_surface = pygame.display.get_surface() # overflate (skjerm) som CameraGroup tegner på 
         self.offset = pygame.math.Vector2(0,0) # camera offset. Trekker fra camera offset fra alle objekter slik at vi får en motbevegelse og det virker derfor som at kameraet beveger på seg. 
         self.half_w = self.display_surface.get_size()[0] // 2 # halve bredden av skjermen 
@@ -112,7 +200,11 @@ class CameraGroup(pygame.sprite.Group):
         self.target = None # kamera target (target som kamera fokuserer på)
         self.zoom_scale = 1 # zoom 
         self.dt_per_s = 86400 # tidssteg per sekund i simuleringen 
-        self.dt = 0 # tidssteg. Blir kalkulert ut fra dt_per_s og FPS slik at tidssteg per sekund blir lik uavhengig av FPS 
+        self.trails = OrbitTrails(len(image_index)) # banene til romobjektene. Legemer som tegnes som punkter har ingen bane, slik at minnebruken ikke vokser med antall småplaneter
+        self.show_trails = False # om banene skal vises
+        self.body_index = {name: i for i, name in enumerate(simulator.state.names)} # navn -> indeks i tilstanden, slik at et legeme kan slås opp uten å lete gjennom alle navnene
+        self.bodies = {} # indeks i tilstanden -> romobjekt eller punkt som er laget for legemet
+        self.pick_grid = PickGrid() # rutenett med legemene på skjermen, bygges på nytt hver frame
         
     def update_display_suface(self) -> None: 
         """ 
@@ -121,41 +213,32 @@ class CameraGroup(pygame.sprite.Group):
         self.display_surface = pygame.display.get_surface() # overflate (skjerm) som CameraGroup tegner på 
         self.half_w = self.display_surface.get_size()[0] // 2 # halve bredden av skjermen 
         self.half_h = self.display_surface.get_size()[1] // 2 # halve høyden av skjermen 
+        self.update_rects() # oppdaterer rect slik at romobjektene blir plassert riktig i skjermen
+    
+    def update_rects(self) -> None: 
+        """ 
+        metode som oppdaterer rect til alle romobjekter ut fra posisjonen i simulatoren
+        """
         for sprite in self.sprites(): # looper igjennom alle romobjekter og oppdaterer rect slik at den blir plassert riktig i skjermen
             sprite.update_rect(self.zoom_scale, self.half_w, self.half_h)
         
-    def init_state(self) -> None: 
+    def init_state(self, storage_data: dict) -> None: 
         """ 
         metode for å initialsierer tilstand ut fra lagret data slik at en simulering kan gjenopptas   
         """
-        storage_data = storage.get() # henter data som er lagret i fil 
+        state = self.simulator.state
+        pairs = [(self.body_index[name], i) for i, name in enumerate(storage_data["names"]) if name in self.body_index] # (indeks i tilstanden, indeks i lagret data) for legemer som er lagret
+        if pairs: # setter posisjoner og fartsvektorer til lagret verdi for alle legemer samtidig
+            target, saved = np.array(pairs).T
+            state.pos[target] = storage_data["pos"][saved] # setter koordinater til lagret koordinater
+            state.vel[target] = storage_data["vel"][saved] # setter fartsvektor til lagret fartsvektor
         for sprite in self.sprites(): # looper igjennom alle romobjekter (altså alle sprites i gruppa)
-            for space_object_json in storage_data["space_objects"]: # looper gjennom lagret data om romobjekter
-                if sprite.name == space_object_json["name"]: # hvis navnet til spriten og navnet til romobjektet som er lagret er lik, oppdater informasjon om sprite 
-                    sprite.x = space_object_json["x"] # setter x koordinat til lagret x koordinat 
-                    sprite.y = space_object_json["y"] # setter y koordinat til lagret y koordinat 
-                    sprite.v_x = space_object_json["v_x"] # setter fartsvektor til lagret fartsvektor
-                    sprite.v_y = space_object_json["v_y"] # setter fartsvektor til lagret fartsvektor
-                    sprite.update_image_size(storage_data["zoom"], self.half_w, self.half_h) # oppdaterer bildestørrelse ut fra lagret zoom
+            sprite.update_image_size(storage_data["zoom"], self.half_w, self.half_h) # oppdaterer bildestørrelse ut fra lagret zoom
         
         self.zoom_scale = storage_data["zoom"] # setter zoom til lagret zoom
         self.offset = pygame.math.Vector2(storage_data["camera_offset"][0],storage_data["camera_offset"][1]) # oppdaterer offset til kameraet slik at kamera er plassert riktig ut fra kameras lagret posisjon
         self.dt_per_s = storage_data["dt_per_s"] # oppdaterer tidsendring per sekundt til lagret tidsendring per sekund
         
-    def update_aks(self) -> None: 
-        """ 
-        kalles metoden update_aks for alle romobjekter (space_object), noe som kalkulerer akselerasjonen for alle romobjektene
-        """
-        for sprite in self.sprites(): # looper gjennom alle sprites
-            sprite.update_aks(self.sprites()) # kaller metoden update_aks
-            
-    def update_pos(self) -> None: 
-        """
-        kaller metoden update_pos for alle romobjekter (space_object)
-        """
-        for sprite in self.sprites(): # looper gjennom alle sprites 
-            sprite.update_pos(self.dt, self.zoom_scale, self.half_w, self.half_h) # kaller metoden update_pos
-            
     def update_image_sizes(self) -> None: 
         """
         metode for å oppdaterer størrelsen på bilene til alle remobjektene i gruppa. Brukes for å gjøre bildene større eller mindre avhengig av zoom_scale 
@@ -199,52 +282,127 @@ class CameraGroup(pygame.sprite.Group):
         if keys[pygame.K_DOWN]: # hvis ned tast er trykket
             self.dt_per_s -= 1000 + self.dt_per_s*0.001 # trekker fra 1000 og en tudendel av dt_per_s slik at tidsendring per sekund synker eksponentielt 
             
+    def body(self, index: int) -> Body: 
+        """
+        metode som returnerer romobjektet til legemet med indeksen index, eller lager et Point_object hvis legemet tegnes som punkt
+        """
+        if index not in self.bodies: # punktet har ikke blitt slått opp før
+            self.bodies[index] = Point_object(self, index)
+        return self.bodies[index]
+        
+    def body_by_name(self, name: str) -> Body: 
+        """
+        metode som returnerer legemet med navnet name
+        """
+        return self.body(self.body_index[name])
+        
+    def update_pick_grid(self, items: list[tuple[Space_object, pygame.Surface, pygame.Rect]]) -> None: 
+        """
+        metode som bygger rutenettet for museklikk fra rect til romobjektene som er tegnet (fra visible_items) og punktene som er innenfor skjermen. Kalles en gang per frame, slik at et klikk bare trenger å se på legemene nær musa
+        """
+        x, y = self.screen_points() # skjermkoordinatene til punktene
+        width, height = self.display_surface.get_size()
+        visible = (x >= 0) & (x < width) & (y >= 0) & (y < height) # punkter som er innenfor skjermen
+        centers = np.array([rect.center for _, _, rect in items], dtype=np.float64).reshape(-1, 2) # senteret til romobjektene på skjermen
+        radii = np.array([max(rect.width, rect.height) / 2 for _, _, rect in items]) # halve størrelsen til bildene
+        keys = np.array([sprite.index for sprite, _, _ in items], dtype=np.int64) # indeksen til romobjektene i tilstanden
+        self.pick_grid.build(np.vstack((centers, np.column_stack((x[visible], y[visible])))), np.concatenate((radii, np.zeros(np.count_nonzero(visible)))), np.concatenate((keys, self.point_index[visible])))
+        
     def check_mouse_click(self, mx: float, my: float) -> None: 
         """ 
-        metode som sjekker om et romobjekt er klikket 
+        metode som setter target til legemet nærmest musa, hvis musa er innenfor noen piksler av et legeme, og ellers nullstiller target
         """
-        for sprite in self.sprites(): # loops gjennom alle spriter (romobjekter) i gruppa
-            rect = sprite.rect # setter rect lik rect til sprite
-            if rect.collidepoint(mx+self.offset.x, my+self.offset.y): # ser om mus posisjonen + offset har samme posisjon som en av elementene, fordi da trykker musa på en av objektene
-                self.target = sprite # setter target til spriten (romobjektet) som ble klikket
-                break # stopper for-loopen 
-            else: # objektet er ikke klikket
-                self.target = None # nullstiller target
+        index = self.pick_grid.query(mx, my) # slår opp i rutenettet fra forrige frame, altså det som vises på skjermen
+        self.target = self.body(index) if index is not None else None # setter target til legemet som ble klikket eller nullstiller target
         
-    def custom_draw(self) -> Space_object: # metode som tegner romobjektene til skjermen
+    def update_camera(self) -> Body: 
+        """
+        metode som flytter kameraet ut fra tastene og target, og returnerer kamera target
+        """
         self.keyboard_control() # kaller metoden keyboard_control for å kontrollere kameraet og tidssteg med taster
         
         if self.target != None: # hvis et target er satt, kall metoden center_target_camera slik at kameraet fokuserer på objektet
             self.center_target_camera() 
-          
-        for sprite in self.sprites(): # looper gjennom alle spriter (romobjekter)
-            offset_position = sprite.rect.topleft - self.offset # kalkulerer posisjonen til bildet ut fra posisjonen til rect minus offset slik at vi får en motbevegelse til kameraet slik at det virker som at kameraet flytter på seg
-            self.display_surface.blit(sprite.image, offset_position) # viser bildet med kalkulert posisjon til skjermen  
-    
         return self.target # returnerer kamera target
+    
+    def record_trails(self) -> None: 
+        """
+        metode som legger til et punkt i banene til romobjektene hvis det har gått lang nok simuleringstid
+        """
+        self.trails.record(self.simulator.state.pos[self.image_index], self.simulator.state.time)
+        
+    def draw_trails(self, surface: pygame.Surface) -> None: 
+        """
+        metode som tegner banene til alle romobjektene
+        """
+        colors = [sprite.trail_color for sprite in self.sprites()] # fargen til banen til hvert romobjekt
+        self.trails.draw(surface, colors, self.simulator.state.pos[self.image_index], CONVERT * self.zoom_scale, (self.half_w, self.half_h), self.offset)
+        
+    def draw_points(self, surface: pygame.Surface) -> None: 
+        """
+        metode som tegner legemene uten bilde som punkter. Punktene skrives direkte til pikslene på skjermen
+        """
+        if len(self.point_index) == 0: # ingen punkter
+            return
+        x, y = self.screen_points() # skjermkoordinater
+        x, y = np.floor(x).astype(np.int64), np.floor(y).astype(np.int64) # pikslene punktene ligger i
+        width, height = surface.get_size()
+        visible = (x >= 0) & (x < width) & (y >= 0) & (y < height) # punkter som er innenfor skjermen
+        pixels = pygame.surfarray.pixels2d(surface) # pikslene til skjermen som et numpy array (x, y)
+        pixels[x[visible], y[visible]] = surface.map_rgb(POINT_COLOR)
+        del pixels # låser opp skjermen igjen
+        
+    def screen_points(self) -> tuple[np.ndarray, np.ndarray]: 
+        """
+        metode som returnerer skjermkoordinatene til punktene. Alle posisjonene gjøres om samtidig med samme formel som romobjektene
+        """
+        pos = self.simulator.state.pos[self.point_index] # posisjonene til punktene
+        scale = CONVERT * self.zoom_scale # fra meter til piksler
+        return pos[:, 0] * scale + self.half_w - self.offset.x, -pos[:, 1] * scale + self.half_h - self.offset.y
+        
+    def draw_underlay(self, surface: pygame.Surface) -> None: 
+        """
+        metode som tegner det som ligger under bildene til romobjektene: banene hvis de skal vises, og punktene
+        """
+        if self.show_trails: 
+            self.draw_trails(surface)
+        self.draw_points(surface)
+        
+    def has_underlay(self) -> bool: 
+        """
+        metode som returnerer om noe skal tegnes under bildene til romobjektene
+        """
+        return self.show_trails or len(self.point_index) > 0
+        
+    def view_key(self) -> tuple[float, float, float]: 
+        """
+        metode som returnerer det som bestemmer hvor kameraet er. Når dette endres må hele skjermen tegnes på nytt
+        """
+        return (self.offset.x, self.offset.y, self.zoom_scale)
+        
+    def visible_items(self) -> list[tuple[Space_object, pygame.Surface, pygame.Rect]]: 
+        """
+        metode som returnerer romobjektene som er innenfor skjermen som (romobjekt, bilde, rect på skjermen). Romobjekter utenfor skjermen blir ikke tegnet
+        """
+        viewport = pygame.Rect(round(self.offset.x), round(self.offset.y), *self.display_surface.get_size()) # området av verden som vises på skjermen
+        items = [] # romobjekter som skal tegnes
+        for sprite in self.sprites(): # looper gjennom alle spriter (romobjekter)
+            if viewport.colliderect(sprite.rect): # romobjektet er innenfor skjermen
+                offset_position = sprite.rect.topleft - self.offset # kalkulerer posisjonen til bildet ut fra posisjonen til rect minus offset slik at vi får en motbevegelse til kameraet slik at det virker som at kameraet flytter på seg
+                items.append((sprite, sprite.image, sprite.image.get_rect(topleft=offset_position)))
+        return items
  
 
-default_date = datetime.date(2022, 1, 1) # startdato for simulering. Startposisjonen til alle objekter er hentet fra denne datoen
+default_date = DEFAULT_DATE # startdato for simulering. Startposisjonen til alle objekter er hentet fra denne datoen
 
 def init_camera_group() -> CameraGroup: 
     """
-    funksjon som initialiserer kamera gruppen med alle romobjektene 
+    funksjon som initialiserer kamera gruppen med alle romobjektene i katalogen. Bare legemer som skal vises med bilde får et Space_object. Legemer med samme bilde deler bildet gjennom textures cachen
     """
-    camera_group = CameraGroup() # lager en kamera gruppe som skal inneholde alle romobjektene som skal vises til skjermen
-    ### Avstand er gitt fra solsystemets barycenter
-    ### basert på 1 januar 2022 
-    ### https://ssd.jpl.nasa.gov/horizons/app.html#/ (tallene står i km, så må endres til m)
-    ### Parametere til space_object (alle tall er oppgitt ut fra SI-enheter)
-    ### sprite gruppe, navn, path til bilde, bildestørrelse, masse, x koordinat, y koordinat, x fartsvektor, y fartsvektor
-    Space_object(camera_group, "Sola", "./assets/sun.jpeg", 15, 1.98847e30, -1.283674643550172e9, 5.007104996950605e8, -5.809369653802155, -1.461959576560110e1)
-    Space_object(camera_group, "Merkur", "./assets/mercury.jpeg", 3, 0.30104e24, 5.242617205495467e10, -5.596063357617276e9, -3.931719860392732e3, 5.056613955108243e4) 
-    Space_object(camera_group, "Venus", "./assets/venus.jpeg", 5, 4.8673e24, -1.143612889654620e10, 1.076180391552140e11, -3.498958532524220e4, -3.509011592387367e3) 
-    Space_object(camera_group, "Jorda", "./assets/earth.jpeg", 6, 5.9722e24, -2.741147560901964e10, 1.452697499646169e11, -2.981801522121922e4, -5.415519940416356e3) 
-    Space_object(camera_group, "Mars", "./assets/mars.jpeg", 4, 0.64169e24, -1.309510737126251e11, -1.893127398896606e11, 2.090994471204196e4, -1.160503586188451e4) 
-    Space_object(camera_group, "Jupiter", "./assets/jupiter.jpeg", 13, 1898.13e24, 6.955554713494443e11, -2.679620040967891e11, 4.539612624165795e3, 1.280513202430234e4) 
-    Space_object(camera_group, "Saturn", "./assets/saturn.png", 20, 568.32e24, 1.039929082221698e12, -1.056650148100382e12, 6.345150014839902e3, 6.756117343710409e3) 
-    Space_object(camera_group, "Uranus", "./assets/uranus.jpeg", 12, 86.811e24, 2.152570437700128e12, 2.016888245555490e12, -4.705853565766252e3, 4.652144641704226e3) 
-    Space_object(camera_group, "Neptun", "./assets/neptune.jpeg", 12, 102.409e24, 4.431790029686977e12, -6.114486878028781e11, 7.066237951457524e2, 5.417076605926207e3)
+    simulator = Simulator(CATALOG.state.copy(), solver=SOLVER, integrator=INTEGRATOR, satellites=CATALOG.satellite_groups()) # lager simulator med startverdiene fra katalogen (1 januar 2022). Månene blir integrert rundt planetene sine
+    camera_group = CameraGroup(simulator, CATALOG.image_indices(), CATALOG.point_indices()) # lager en kamera gruppe som skal inneholde alle romobjektene som skal vises til skjermen
+    for index in camera_group.image_index: # looper gjennom legemene som vises med bilde og lager et Space_object som viser legemet
+        Space_object(camera_group, int(index), CATALOG.textures[index], CATALOG.sizes[index])
     return camera_group  # returnerer kamera gruppe 
     
 def update_display(width: int, height: int) -> tuple[int, int]:
@@ -267,7 +425,8 @@ def welcome_screen() -> None:
     run = True # variabel for å avgjøre om screen loop skal fortsette (hvis den blir satt til False slutter denne skjermen å oppdateres)
     welcome_screen_group = pygame.sprite.Group() # sprite gruppe for alle elementer i welcome screen
     
-    if storage.get() == None:  # hvis storage er tum
+    resume_slot = save_slots.latest() # slotten som ble lagret sist, enten ved å gå ut av simuleringen eller med autolagring
+    if resume_slot == None:  # hvis storage er tum
         start_button = Button(welcome_screen_group, "./assets/snsbtn.png", (70*3.2125, 70), (0, -30), alignments=["centerx", "endy"]) # lager kanpp for å starte simulering 
         continue_button = Button(welcome_screen_group, "./assets/gsbtn.png", (0, 0), (0, 0)) # lager knapp men skal ikke vises fordi man kan ikke gjenoppta en simulering da data ikke eksisterer
         welcome_screen_group.remove(continue_button) # fjerner fra sprite gruppe fordi knapp skal ikke vises
@@ -277,6 +436,10 @@ def welcome_screen() -> None:
         continue_button = Button(welcome_screen_group, "./assets/gsbtn.png", (70*3.2125, 70), (-150, -30), alignments=["centerx", "endy"]) # lager knapp for å gjenoppta simulering
 
     Text(welcome_screen_group, "Simulering solsystemet", (0,30), alignments=["centerx"], font_size=40) # lager tekst som vises til skjermen
+    saved_slots = sorted(save_slots.read_index().items(), key=lambda item: -item[1]["saved_at"]) # lagrede simuleringer fra indeksen, nyeste først. Leser ikke snapshot filene
+    for i, (slot, entry) in enumerate(saved_slots[:4]): # viser de fire nyeste
+        slot_date = datetime.date.fromisoformat(entry["date"]).strftime("%d.%m.%Y") # dato i simuleringen
+        Text(welcome_screen_group, f"{slot}: {slot_date} ({entry['n_bodies']} legemer)", (5, 5 + 20*i), font_size=15) # tekst med slot, dato og antall legemer
     left_button = Button(welcome_screen_group, "./assets/arrow-left.png", (40,40), (15,0), alignments=["centery"]) # lager kanpp for å gå til forrige slide
     right_button = Button(welcome_screen_group, "./assets/arrow-right.png", (40,40), (-15,0), alignments=["centery", "endx"]) # lager kanpp for å gå til neste slide
     welcome_screen_group.remove(left_button) # viser ikke left knapp i starten fordi det ikke går an å gå til venstre da slide er på index 0
@@ -288,6 +451,7 @@ def welcome_screen() -> None:
     current_slider_page = 0 # hvilken slide som skal vises
     background_image = pygame.image.load("./assets/background.jpeg").convert_alpha() # laster inn bakgrunnsbilde som vises
     background_image = pygame.transform.scale(background_image, pygame.display.get_surface().get_size()) # scaler til størrelsen av skjermen
+    renderer = DirtyRenderer(background_image) # tegner bare de delene av skjermen som er endret
 
     def slider_change(index: int, sprite_group: pygame.sprite.Group, text: Text, img: Image, right_button: Button, left_button: Button) -> tuple[Text, Image]: # funksjon som oppdater hvilken slide som vises til skjermen
         sprite_group.remove(text) # fjerner text fra sprite gruppe 
@@ -354,6 +518,7 @@ def welcome_screen() -> None:
                 width, height = update_display(width, height) # oppdaterer størrelsen på skjermen 
                 background_image = pygame.image.load("./assets/background.jpeg").convert_alpha() # laster inn bakgrunnsbilde som vises på nytt
                 background_image = pygame.transform.scale(background_image, (width, height))
+                renderer.set_background(background_image) # bruker ny bakgrunn
                 for sprite in welcome_screen_group: # looper igjennom alle spriter i welcome_screen_group og initialiserer posisjonen slik at posisjonen blir rett med alignments og ny screen størrelse
                     sprite.init_pos()
                 if left_button not in welcome_screen_group.sprites(): # hvis left_button ikke er i welcome_screen_group 
@@ -370,8 +535,9 @@ def welcome_screen() -> None:
         if continue_button.is_clicked(): # continue_button er klikket, gjenoppta simulering
             run = False # avslutt welcome_screen loop 
             camera_group = init_camera_group() # initialiserer og returnerer camera_group med romobjekter
-            camera_group.init_state() # initialiserer camera_group tilstand basert på lagret data 
-            simulation_screen(camera_group, storage.get()["time"]) # bytter til simulation_screen slik at simulering vises
+            storage_data = save_slots.storage(resume_slot).get() # henter data som er lagret i slotten
+            camera_group.init_state(storage_data) # initialiserer camera_group tilstand basert på lagret data 
+            simulation_screen(camera_group, storage_data["time"]) # bytter til simulation_screen slik at simulering vises
 
         if right_button.is_clicked(): # right_button er klikket, vis neste slide 
             current_slider_page += 1 # legger til 1 til current_slider_page
@@ -382,9 +548,7 @@ def welcome_screen() -> None:
             current_text, current_img = slider_change(current_slider_page, welcome_screen_group, current_text, current_img, right_button, left_button) # oppdaterer slider
         
         ### tegn elementer til skjerm
-        SCREEN.blit(background_image, (0,0)) # tegner bakgrunnsbilde
-        welcome_screen_group.draw(SCREEN) # tegner alle elementer i gruppa til skjermen
-        pygame.display.update() # oppdaterer display 
+        renderer.draw(SCREEN, sprite_items(welcome_screen_group)) # tegner bakgrunnsbilde og alle elementer i gruppa til skjermen, og oppdaterer bare det som er endret
    
 
 def choose_date_screen(prev_screen: str, selected_date: datetime.date) -> None: 
@@ -413,6 +577,9 @@ def choose_date_screen(prev_screen: str, selected_date: datetime.date) -> None:
     
     initdate_btn = Button(choose_date_screen_group, "./assets/initdate_btn.png", (602*0.31, 121*0.31), (0,200), alignments=["centerx", "centery"]) # initialiser dato knapp 
     go_back_btn = Button(choose_date_screen_group, "./assets/arrow-left.png", (25,25), (5,10)) # gå tilbake knapp 
+    preview = Canvas(choose_date_screen_group, (PREVIEW_SIZE, PREVIEW_SIZE), (0,112), alignments=["centerx", "centery"], color=PREVIEW_BACKGROUND) # forhåndsvisning av hvor legemene er på valgt dato
+    preview_date = None # datoen forhåndsvisningen er tegnet for
+    renderer = DirtyRenderer() # tegner bare de delene av skjermen som er endret
 
     while run: # pygame screen loop for choose_date_screen
         CLOCK.tick(FPS) # oppdaterer klokka og gjør at max FPS ikke overstiges
@@ -435,8 +602,9 @@ def choose_date_screen(prev_screen: str, selected_date: datetime.date) -> None:
             run = False # avslutter choose_date_screen loop
             if prev_screen == "game_screen": # hvis prev_screen er lik game_screen
                 camera_group = init_camera_group() # initialiserer og returnerer camera_group med romobjekter
-                camera_group.init_state() # initialiserer camera_group tilstand basert på lagret data 
-                simulation_screen(camera_group, storage.get()["time"]) # bytter til simulation_screen slik at simulering vises
+                storage_data = save_slots.storage(RESUME_SLOT).get() # henter data som ble lagret da man gikk til choose_date_screen
+                camera_group.init_state(storage_data) # initialiserer camera_group tilstand basert på lagret data 
+                simulation_screen(camera_group, storage_data["time"]) # bytter til simulation_screen slik at simulering vises
             else: # hvis ikke prev_screen er lik game_screen
                 welcome_screen() # bytt til welcome_screen
         
@@ -462,11 +630,49 @@ def choose_date_screen(prev_screen: str, selected_date: datetime.date) -> None:
         year_text.update_text(str(selected_date.year))
         month_text.update_text(str(selected_date.month)) 
         day_text.update_text(str(selected_date.day))
+        if selected_date != preview_date: # tegner forhåndsvisningen bare når datoen er endret
+            draw_preview(preview, selected_date)
+            preview_date = selected_date
         
         ### tegner elementer til skjerm
-        SCREEN.fill(0) # tegner en svart bakgrunn til skjermen
-        choose_date_screen_group.draw(SCREEN) # tegner alle elementer i gruppa til skjermen
-        pygame.display.update() # oppdaterer display
+        renderer.draw(SCREEN, sprite_items(choose_date_screen_group)) # tegner svart bakgrunn og alle elementer i gruppa til skjermen, og oppdaterer bare det som er endret
+
+
+def draw_preview(canvas: Canvas, date: datetime.date) -> None: 
+    """
+    funksjon som tegner en forhåndsvisning av hvor legemene er på datoen. Posisjonene regnes ut med Kepler baner fra startverdiene i katalogen, så det går like fort uansett hvor langt unna datoen er.
+    Avstanden fra sola tegnes med kvadratroten av avstanden, slik at både de indre og de ytre planetene synes
+    """
+    state = kepler_preview.state_at(date_to_seconds(date)) # omtrentlig tilstand på datoen
+    surface = canvas.new_image() # ny tom flate
+    rel = state.pos - state.pos[kepler_preview.central] # posisjon relativt til sola
+    r = np.hypot(rel[:, 0], rel[:, 1])
+    scale = (PREVIEW_SIZE/2 - 3) * np.sqrt(r / PREVIEW_RADIUS) / np.maximum(r, 1) # piksler per meter for hvert legeme
+    x = np.floor(PREVIEW_SIZE/2 + rel[:, 0] * scale).astype(np.int64) # pikslene legemene ligger i
+    y = np.floor(PREVIEW_SIZE/2 - rel[:, 1] * scale).astype(np.int64)
+    visible = (x >= 0) & (x < PREVIEW_SIZE) & (y >= 0) & (y < PREVIEW_SIZE) # legemer som er innenfor forhåndsvisningen
+    points = visible & (CATALOG.render != RENDER_IMAGE) # legemer som tegnes som punkter
+    pixels = pygame.surfarray.pixels2d(surface) # pikslene til flaten som et numpy array (x, y)
+    pixels[x[points], y[points]] = surface.map_rgb(POINT_COLOR)
+    del pixels # låser opp flaten igjen
+    for index in np.flatnonzero(visible & (CATALOG.render == RENDER_IMAGE)): # legemene med bilde tegnes som små sirkler
+        pygame.draw.circle(surface, (255, 210, 80) if index == kepler_preview.central else (255, 255, 255), (int(x[index]), int(y[index])), 3 if index == kepler_preview.central else 2)
+
+
+def start_from_horizons(simulator: Simulator, target_time: int) -> bool: 
+    """
+    funksjon som setter tilstanden til simulatoren til tidspunktet i Horizons tabellen nærmest target_time. Legemer uten masse som ikke er i tabellen, f.eks syntetiske belter, blir plassert med Kepler forhåndsvisningen.
+    Returnerer False hvis tabellen ikke har alle legemene med masse, eller hvis et lagret checkpoint er nærmere target_time, slik at checkpoints brukes istedenfor
+    """
+    state = simulator.state
+    tabulated = [name for name in state.names if name in HORIZONS.index] # legemer som er i tabellen
+    epoch = HORIZONS.nearest_epoch(target_time, tabulated) if tabulated else None # nærmeste tidspunkt der alle legemene i tabellen er tabulert
+    if epoch is None:
+        return False
+    epoch = int(round(epoch)) # klokken er et heltall sekunder
+    if abs(epoch - target_time) > abs(get_checkpoints().nearest(target_time) - target_time): # kortere å integrere fra checkpointet
+        return False
+    return HORIZONS.fill_state(state, epoch, fallback=kepler_preview.state_at(epoch))
 
 
 def init_simulation(start_simulation_date: datetime.date): 
@@ -474,31 +680,51 @@ def init_simulation(start_simulation_date: datetime.date):
     funksjon for å initialisere simuleringen til gitt simuleringsdato ut fra data hentet fra 1 januar 2022
     """
     camera_group = init_camera_group() # initialiserer og returnerer camera_group med romobjekter
-    storage.clear() # fjerner all data fra den forrige simuleringen
     
     ### innhold som vises til skjerm mens simulering blir initialiser til rett dato
     init_simulation_group = pygame.sprite.Group()  # sprite gruppe for å vise tekst til skjer
-    Text(init_simulation_group, "Laster inn...", (0,0), alignments=["centerx", "centery"]) # lager teksten "Laster inn..." som vises til skjermen mens simulering initialiseres
-    SCREEN.fill(0) # tegner en svart bakgrunn til skjermen
-    init_simulation_group.draw(SCREEN) # tegner gruppen med teksten "Laster inn..." til skjerm
-    pygame.display.update() # oppdaterer display 
+    loading_text = Text(init_simulation_group, "Laster inn...", (0,0), alignments=["centerx", "centery"]) # lager teksten "Laster inn..." som vises til skjermen mens simulering initialiseres
+    Text(init_simulation_group, "Trykk escape for å avbryte", (0,40), alignments=["centerx", "centery"], font_size=15) # tekst som forteller hvordan man avbryter
+    renderer = DirtyRenderer() # tegner bare de delene av skjermen som er endret
     
-    ### initialiserer simulering 
-    simulation_time = 0 # simuleringstid fra 1 januar 2022
-    current_date = default_date # dato som simulering er på 
+    def draw_loading_screen() -> None: 
+        """
+        funksjon som tegner "Laster inn..." skjermen
+        """
+        renderer.draw(SCREEN, sprite_items(init_simulation_group)) # tegner svart bakgrunn og teksten "Laster inn..." til skjerm
     
-    if start_simulation_date > default_date: # hvis datoen som simuleringen skal starte på er større enn default_date (1 jan. 2020) som er den dagen startverdier for romobjektene  er hentet fra  
-        camera_group.dt = 1000 # sett tidssteg til 1000
-    else: # hvis ikke (da er datoen som simuleringen skal starte på mindre enn default_date (1. jan 2022))
-        camera_group.dt = -1000 # sett tidssteg til -1000
-        
-    while current_date != start_simulation_date: # looper gjennom så lenge at current_date ikke er lik start_simulation_date fordi vi ikke er på den datoen hvor bruker ønsker at simuleringen skal vises  
-        simulation_time += camera_group.dt # legger til tidssteg til simuleringstid 
-        current_date = default_date + datetime.timedelta(seconds=simulation_time) # oppdaterer hvilken dato vi er på i simuleringen
-        camera_group.update_aks() # kaller update_aks for alle sprite i gruppen, kalkulerer akselerasjonen basert på gravitasjonskreaften fra alle legemer 
-        camera_group.update_pos() # kaller update_pos for alle sprite i gruppen, oppdaterer posisjonen basert på kalkulert akselerasjon 
-            
-    simulation_screen(camera_group,simulation_time) # viser simulation_screen slik at simuleringen vises når current_date er lik start_simulation_date slik at simuleringen vises fra den datoen bruker har oppgitt 
+    def progress(fraction: float) -> bool: 
+        """
+        funksjon som blir kalt av simulatoren mens den integrerer. Håndterer eventer slik at vinduet ikke fryser, viser hvor langt integrasjonen har kommet og returnerer False hvis bruker vil avbryte
+        """
+        for event in pygame.event.get(): # looper igjennom pygame eventer
+            if event.type == pygame.QUIT: # hvis event er lik pygame.QUIT, bruker ber om å lukke spillet 
+                quit_game() # avslutter spillet
+            if event.type == pygame.VIDEORESIZE: # window blir resize-et
+                update_display(*event.size) # oppdaterer størrelsen på skjermen 
+                for sprite in init_simulation_group: # initialiserer posisjonen på nytt slik at teksten blir plassert riktig
+                    sprite.init_pos()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: # hvis escape blir presset
+                return False # avbryter integrasjonen
+        loading_text.update_text(f"Laster inn... {int(fraction*100)}%") # viser fremdrift i prosent
+        draw_loading_screen() # tegner skjermen på nytt
+        return True # fortsetter integrasjonen
+    
+    draw_loading_screen() # viser "Laster inn..." skjermen før integrasjonen starter
+    
+    ### initialiserer simulering. Starter fra nærmeste tidspunkt i Horizons tabellen eller nærmeste checkpoint, og integrerer bare den fysiske tilstanden, uten å oppdatere rect eller tegne noe for hvert steg
+    target_time = date_to_seconds(start_simulation_date) # simuleringstiden til valgt dato
+    if HORIZONS and start_from_horizons(camera_group.simulator, target_time): # starttilstanden er hentet fra tabellen
+        finished = camera_group.simulator.fast_forward(target_time, progress=progress, integrator=JUMP_INTEGRATOR) # integrerer resten fram til valgt dato
+    else:
+        finished = get_checkpoints().fast_forward(camera_group.simulator, target_time, progress=progress)
+    if not finished: # hvis bruker avbrøt
+        choose_date_screen("welcome_screen", start_simulation_date) # går tilbake til choose_date_screen
+        return
+    
+    save_slots.archive([RESUME_SLOT, AUTOSAVE_SLOT], PREVIOUS_SLOT) # tar vare på den forrige simuleringen i en egen slot
+    camera_group.update_rects() # plasserer bildene til romobjektene ut fra den nye posisjonen
+    simulation_screen(camera_group, camera_group.simulator.state.time) # viser simulation_screen slik at simuleringen vises fra den datoen bruker har oppgitt 
 
 
 def simulation_screen(camera_group: CameraGroup, simulation_time: int): 
@@ -506,9 +732,27 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
     funksjon for å vise simulering 
     """
     run = True # variabel for å avgjøre om screen loop skal fortsette (hvis den blir satt til False slutter denne skjermen å oppdateres)
+    camera_group.simulator.state.time = simulation_time # setter simuleringstiden i tilstanden
     current_date = default_date + datetime.timedelta(seconds=simulation_time) # dato vi er på i simuleringen. 1 jan. 2022 + simuleringstiden
     simulation_paused = False # boolean for å avgjøre om simulering er pauset
     only_simulation_shown = False # boolean for å avgjøre om bare simuleringen skal vises og ikke noe tekst eller knapper 
+    scheduler = FixedStepScheduler(merge_steps=camera_group.simulator.integrator.individual_timesteps) # bestemmer hvor mange fysiske steg med fast lengde som tas hver frame
+    worker = None # worker som kjører fysikken i en egen prosess hvis USE_PHYSICS_WORKER er True
+    if USE_PHYSICS_WORKER: 
+        worker = PhysicsWorker(camera_group.simulator.state, camera_group.dt_per_s, integrator=INTEGRATOR, satellites=camera_group.simulator.satellite_groups, solver=SOLVER) # lager worker med tilstanden som skal simuleres
+        worker.start() # starter workeren
+    physics = worker if worker else scheduler # objektet som vet om fysikken henger etter og hvor fort simuleringen faktisk går
+    worker_paused = False # om workeren har fått beskjed om å pause
+    worker_dt_per_s = camera_group.dt_per_s # tidsendring per sekund workeren har fått beskjed om
+    renderer = DirtyRenderer() # tegner bare de delene av skjermen som er endret
+    autosaver = Autosaver(save_slots, AUTOSAVE_SLOT) # lagrer simuleringen med jevne mellomrom i en egen tråd
+    recorder = None # tar opp simuleringen til filer mens den er satt
+    replay = None # opptaket som spilles av istedenfor å simulere, hvis det er satt
+    replay_time = 0.0 # simuleringstiden i opptaket som vises
+    live_state = None # kopi av tilstanden fra før avspillingen startet, slik at simuleringen kan fortsette der den var
+    profiler = FrameProfiler(output=PROFILE_PATH) # måler hvor lang tid hver fase i framen tar
+    show_profiler = False # om ytelsesmålingene skal vises
+    profiler_updated = 0.0 # når teksten med ytelsesmålinger sist ble oppdatert
     
     ### knapper
     button_group = pygame.sprite.Group() # lager sprite gruppe for knapper 
@@ -523,6 +767,7 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
     info1_text = Text(info_group, "", (5,5), font_size= 15) # lager tekst for å vise tidssteg per sekund 
     info2_text = Text(info_group, "", (5,30), font_size=15) # lager tekst for å vise zoom
     info3_text = Text(info_group, "", (5,55), font_size=15) # lager tekst for å vise dato i simulering
+    info4_text = Text(info_group, "", (5,80), font_size=15) # lager tekst for å vise om simuleringen blir tatt opp eller spilt av
     
     ### tekst med informasjon om romobjektet kameraet følger
     objectinfo_group = pygame.sprite.Group() # lager sprite gruppe for tekst med informasjon om romobjektet kameraet følger 
@@ -534,6 +779,10 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
     objectinfo6_text = Text(objectinfo_group, "", (5, -30), font_size=15, alignments=["endy"]) # lager tekst for å vise akselerasjonsvektoren til romobjektet kamera følger
     objectinfo7_text = Text(objectinfo_group, "", (5, -5), font_size=15, alignments=["endy"]) # lager tekst for å vise baneakselerasjonen til romobjektet kamera følger
     
+    ### tekst med ytelsesmålinger
+    profiler_group = pygame.sprite.Group() # lager sprite gruppe for tekst med ytelsesmålinger
+    profiler_texts = [Text(profiler_group, "", (-5, 40 + 20*i), font_size=13, alignments=["endx"]) for i in range(10)] # en linje per fase, FPS, hele framen og hva som er tregest
+    
     def seconds_to_days_and_seconds(seconds: float): 
         """
         funksjon som gjør om fra sekunder til string med antall dager og sekunder
@@ -558,15 +807,23 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
         """ 
         funksjon for å oppdatere tekst med informasjon om simuleringen
         """
-        if CLOCK.get_fps() < 30: # hvis FPS er mindre enn 30, vis tekst for kalkulert tidssteg per sekund, da tidssteg ikke kalkulerer ut fra FPS siden den er for lav     
-            info1 = f"Tidsendring per sekund: {seconds_to_days_and_seconds(int(camera_group.dt*CLOCK.get_fps()))}"
-        else: # FPS er større enn 20, hvis tekst med gjennomsnittlig tidssteg per sekund 
+        if physics.falling_behind: # hvis fysikken ikke rekker alle stegene, vis tidsendringen som faktisk blir simulert
+            info1 = f"Tidsendring per sekund: {seconds_to_days_and_seconds(int(physics.achieved_dt_per_s))} (henger etter)"
+        else: # fysikken rekker alle stegene, vis tidsendring per sekund
             info1 = f"Tidsendring per sekund: {seconds_to_days_and_seconds(int(camera_group.dt_per_s))}" 
         info1_text.update_text(info1) # oppdatterer tekst for tidssteg per sekund
         info2_text.update_text(f"Zoom: {int(camera_group.zoom_scale*100)}%") # oppdatterer tekst for zoom 
         info3_text.update_text(f"Dato: {date}") # oppdaterer tekst for dato i simulering
+        if replay: # viser hvor langt i opptaket vi er
+            info4_text.update_text(f"Avspilling: {int((replay_time - replay.start_time) / (replay.end_time - replay.start_time or 1) * 100)}% av opptaket")
+        elif recorder and recorder.paused(camera_group.simulator.state): # tiden går bakover, opptaket fortsetter når simuleringen er forbi siste tilstand igjen
+            info4_text.update_text(f"Opptak pauset (tiden er før siste tilstand): {recorder.n_frames} tilstander")
+        elif recorder: # viser hvor mange tilstander som er tatt opp
+            info4_text.update_text(f"Opptak: {recorder.n_frames} tilstander")
+        else:
+            info4_text.update_text("") # ingen opptak
         
-    def update_object_info_text(space_object: Space_object): 
+    def update_object_info_text(space_object: Body): 
         """
         funksjon for å oppdatere tekst med informasjon om romobjektet kamera følger
         """
@@ -599,8 +856,72 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
         camera_group.target = None # sett kamera target til ingen
         camera_group.update_image_sizes() # oppdater bilde størrelse til romobjektene
         
+    def start_recording() -> None: 
+        """
+        funksjon som starter et nytt opptak i RECORDINGS_DIR. Mappen får tidspunktet som navn
+        """
+        nonlocal recorder
+        path = os.path.join(RECORDINGS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S")) # mappe til opptaket
+        recorder = TrajectoryRecorder(path, camera_group.simulator.state) # skriver første tilstand neste frame
+        
+    def stop_recording() -> None: 
+        """
+        funksjon som avslutter opptaket hvis simuleringen blir tatt opp
+        """
+        nonlocal recorder
+        if recorder: 
+            recorder.close() # lukker filene
+            recorder = None
+            
+    def start_replay() -> None: 
+        """
+        funksjon som starter avspilling av opptaket. Tilstanden blir lest fra opptaket istedenfor å simuleres, og piltastene spoler fram og tilbake
+        """
+        nonlocal replay, replay_time, live_state, worker_paused
+        path = REPLAY_PATH or latest_recording(RECORDINGS_DIR) # opptaket som skal spilles av
+        if path is None or not os.path.exists(path): # ingen opptak
+            return
+        stop_recording() # opptaket som spilles av må være ferdig skrevet
+        reader = TrajectoryReader(path)
+        if len(reader) == 0 or reader.names != camera_group.simulator.state.names: # tomt opptak, eller opptak av andre legemer
+            return
+        if worker: 
+            worker.send("pause") # workeren venter mens opptaket spilles av
+            worker_paused = True
+        replay = reader
+        live_state = camera_group.simulator.state.copy() # tar vare på tilstanden slik at simuleringen kan fortsette etterpå
+        replay_time = min(max(simulation_time, replay.start_time), replay.end_time) # starter på samme tid som simuleringen hvis den er med i opptaket
+        camera_group.trails.clear() # banene fra simuleringen hører ikke til opptaket
+        
+    def stop_replay() -> None: 
+        """
+        funksjon som avslutter avspillingen og setter tilstanden tilbake til der simuleringen var
+        """
+        nonlocal replay, live_state
+        if replay is None: 
+            return
+        state = camera_group.simulator.state
+        state.pos[:], state.vel[:], state.acc[:], state.time = live_state.pos, live_state.vel, live_state.acc, live_state.time # tilstanden fra før avspillingen
+        replay, live_state = None, None
+        scheduler.reset() # samler ikke opp simuleringstid fra avspillingen
+        camera_group.trails.clear() # banene fra opptaket hører ikke til simuleringen
+        camera_group.update_rects() # plasserer romobjektene der de var i simuleringen
+        
+    def update_profiler_text() -> None: 
+        """
+        funksjon for å oppdatere tekst med ytelsesmålinger. Oppdateres bare hvert PROFILER_HUD_INTERVAL sekund slik at teksten ikke koster mye selv
+        """
+        nonlocal profiler_updated
+        if time.perf_counter() - profiler_updated < PROFILER_HUD_INTERVAL: 
+            return
+        profiler_updated = time.perf_counter()
+        lines = profiler.summary() # linjer med persentiler for hver fase
+        for i, text in enumerate(profiler_texts): 
+            text.update_text(lines[i] if i < len(lines) else "") # tomme linjer hvis det er færre linjer enn tekster
+            
     def reset_simulation() -> None: # funksjon for å nullstille simulering
-        storage.clear() # sletter all lagret data om simulering
+        save_simulation() # lagrer tilstanden akkurat nå, slik at simuleringen som arkiveres ikke er eldre enn siste autolagring
+        save_slots.archive([RESUME_SLOT, AUTOSAVE_SLOT], PREVIOUS_SLOT) # tar vare på simuleringen i en egen slot istedenfor å slette den
         init_simulation(datetime.date.today()) # restart simulering til datoen når programmet kjøres
         
     def go_to_welcome_screen() -> None: 
@@ -611,16 +932,29 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
         save_simulation() # lagre simuleringstilstand slik at simulering kan gjenopptas 
         choose_date_screen("game_screen", date)
             
+    def stop_worker() -> None: 
+        """
+        funksjon som stopper workeren hvis den kjører, og oppdaterer tilstanden til den siste tilstanden workeren publiserte
+        """
+        nonlocal simulation_time
+        if worker: 
+            worker.stop() # stopper workeren
+            simulation_time = camera_group.simulator.state.time # simuleringstiden workeren kom til
+            
     def save_simulation() -> None: # funksjon for å lagre simuleringsstatus til json fil 
-        storage.update(camera_group.sprites(), simulation_time, camera_group.dt_per_s, camera_group.zoom_scale, camera_group.offset) # lagrer data til storage før simulering avsluttes slik at simulering kan gjenopptas på nytt
+        profiler.close() # lukker filen med ytelsesmålinger
+        stop_replay() # lagrer tilstanden fra simuleringen, ikke fra opptaket
+        stop_recording() # avslutter opptaket
+        stop_worker() # stopper workeren slik at tilstanden som lagres er den siste
+        autosaver.close() # stopper autolagringen, slik at den ikke skriver etter at simuleringen er lagret
+        save_slots.save(RESUME_SLOT, camera_group.simulator.state, simulation_time, camera_group.dt_per_s, camera_group.zoom_scale, camera_group.offset) # lagrer data til storage før simulering avsluttes slik at simulering kan gjenopptas på nytt
+            
+    if RECORD_ON_START: # programmet ble startet med --record
+        start_recording() # tar opp simuleringen fra den starter
             
     while run: # pygame screen loop for simulation_screen
-        CLOCK.tick(FPS) # oppdaterer klokka og gjør at max FPS ikke overstiges
-        
-        if CLOCK.get_fps() < 30: # hvis FPS er under 30, bruk tidssteg som er tilsvarer en konstant FPS på 30, siden en FPS på under 30 vil gjøre at tidssteg blir så stort for å gi likt tidsendring per sekund sammenlignet med f.eks 60 FPS 
-            camera_group.dt = camera_group.dt_per_s/30 # kalkulerer konstant tidssteg
-        else: # FPS er over 30, og kalkuler tidssteg for frame som vanlig
-            camera_group.dt = camera_group.dt_per_s/CLOCK.get_fps() # kalkulerer tidssteg for frame ut fra gitt tidsendring per sekund
+        frame_time = CLOCK.tick(FPS)/1000 # oppdaterer klokka og gjør at max FPS ikke overstiges. Returnerer antall sekunder siden forrige frame
+        profiler.start() # starter målingen av framen
 
         for event in pygame.event.get(): # looper igjennom pygame eventer
             if event.type == pygame.QUIT: # hvis event er lik pygame.QUIT, bruker ber om å lukke spillet 
@@ -634,12 +968,20 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
                 camera_group.update_display_suface() # oppdater disply for camera_group 
                 for button in button_group.sprites(): # looper gjennom buttons i buttons group for å finne ny riktig posisjon med alignments 
                     button.init_pos() # initialsierer posisjon på nytt 
+                for text in profiler_texts: # teksten med ytelsesmålinger er justert etter høyre kant av skjermen
+                    text.init_pos() # initialsierer posisjon på nytt
+                for text in info_group.sprites() + objectinfo_group.sprites(): # update_text flytter ikke tekst som er uendret, så teksten må få ny posisjon her
+                    text.init_pos() # initialsierer posisjon på nytt
                 
                     
             if event.type == pygame.KEYDOWN: # hvis en tast på tastaturet blir presset
                 if event.key == pygame.K_SPACE: # hvis mellomrom blir presset
                     simulation_paused = update_play_pause_button(simulation_paused) # oppdater om simulering er pauset eller ikke
                     
+                if event.key == pygame.K_f: # hvis f knapp er presset
+                    show_profiler = not show_profiler # toggle om ytelsesmålingene skal vises
+                    profiler_updated = 0.0 # oppdaterer teksten med en gang
+                    
                 if event.key == pygame.K_h: # hvis h knapp er presset
                     only_simulation_shown = not only_simulation_shown # toggle om tekst og knapper skal vises eller ikke
                     
@@ -654,6 +996,21 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
                 if event.key == pygame.K_c: # hvis c knapp er presset 
                     reset_camera() # nullstiller kamera
                     
+                if event.key == pygame.K_t: # hvis t knapp er presset
+                    camera_group.show_trails = not camera_group.show_trails # toggle om banene skal vises
+                    
+                if event.key == pygame.K_o: # hvis o knapp er presset
+                    if recorder: 
+                        stop_recording() # avslutter opptaket
+                    elif replay is None: # tar ikke opp mens et opptak spilles av
+                        start_recording() # starter et nytt opptak
+                    
+                if event.key == pygame.K_p: # hvis p knapp er presset
+                    if replay: 
+                        stop_replay() # går tilbake til simuleringen
+                    else: 
+                        start_replay() # spiller av opptaket
+                        
                 if event.key == pygame.K_k: # hvis k knapp er presset 
                     run = False # avslutter simulation_screen loop
                     go_to_choose_date_screen(current_date) # bytter til choose_date_screen
@@ -662,6 +1019,7 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
                 if event.button == 1: # left click
                     mx, my = pygame.mouse.get_pos() # posisjonen til musa 
                     camera_group.check_mouse_click(mx,my) # sjekker om et romobjekt er trykket, og hvis et romobjekt er trykket blir det satt som target 
+        profiler.mark("events") # tid brukt på hendelser
             
         ### sjekker om knappper er klikket
         if play_pause_button.is_clicked(): # play_pause_button er klikket
@@ -681,28 +1039,65 @@ def simulation_screen(camera_group: CameraGroup, simulation_time: int):
         if home_button.is_clicked(): # viser welcome screen 
             run = False # avslutter simulation_screen loop
             go_to_welcome_screen() # bytter til welcome_screen
+        profiler.mark("buttons") # tid brukt på å sjekke knappene
         
-        ### tegner elementer til skjerm
-        SCREEN.fill(0)# tegner en svart bakgrunn til skjermen
-        
-        if simulation_paused == False: # hvis spillet ikke er pauset
-            simulation_time += camera_group.dt # legg til tidssteg til simuleringstiden 
+        ### oppdaterer fysikken
+        if replay: # tilstanden leses fra opptaket istedenfor å simuleres
+            if simulation_paused == False: 
+                replay_time = min(max(replay_time + camera_group.dt_per_s * frame_time, replay.start_time), replay.end_time) # spoler fram eller tilbake (negativ tidsendring) og stopper i endene av opptaket
+            replay.sample(replay_time, camera_group.simulator.state) # slår opp og interpolerer tilstanden ved replay_time
+            camera_group.update_rects() # oppdaterer rect ut fra ny posisjon
+            current_date = default_date + datetime.timedelta(seconds=replay_time) # datoen i opptaket
+        elif worker: # fysikken kjører i workeren
+            if simulation_paused != worker_paused: # sender pause eller fortsett til workeren
+                worker.send("pause" if simulation_paused else "resume")
+                worker_paused = simulation_paused
+            if camera_group.dt_per_s != worker_dt_per_s: # sender ny tidsendring per sekund til workeren
+                worker.send("speed", camera_group.dt_per_s)
+                worker_dt_per_s = camera_group.dt_per_s
+            worker.update_state() # leser nyeste tilstand fra workeren og interpolerer posisjonene
+            camera_group.update_rects() # oppdaterer rect ut fra ny posisjon
+            simulation_time = camera_group.simulator.state.time # simuleringstiden blir oppdatert av workeren
+            current_date = default_date + datetime.timedelta(seconds=simulation_time) # oppdater datoen i simuleringen
+        elif simulation_paused == True: # hvis spillet er pauset
+            scheduler.reset() # samler ikke opp simuleringstid mens simuleringen er pauset
+        else: # hvis spillet ikke er pauset
+            scheduler.advance(frame_time, camera_group.dt_per_s, camera_group.simulator.step, camera_group.simulator.state.time) # tar så mange fysiske steg med fast lengde som framen skal ha og som rekkes innenfor budsjettet
+            camera_group.update_rects() # oppdaterer rect ut fra ny posisjon
+            simulation_time = camera_group.simulator.state.time # simuleringstiden blir oppdatert av simulatoren
             current_date = default_date + datetime.timedelta(seconds=simulation_time) # oppdater datoen i simuleringen
-            camera_group.update_aks() # kaller update_aks for alle sprite i gruppen, kalkulerer akselerasjonen basert på gravitasjonskreaften fra alle legemer 
-            camera_group.update_pos() # kaller update_pos for alle sprite i gruppen, oppdaterer posisjonen basert på kalkulert akselerasjon 
     
-        camera_target = camera_group.custom_draw() # tegner alle romobjekter til skjermen og returnerer kamera target
+        if replay is None: # lagrer og tar bare opp tilstanden fra simuleringen
+            saved_state = worker.latest_state if worker else camera_group.simulator.state # med worker er tilstanden som vises interpolert, så det er den nyeste tilstanden fra workeren som lagres og tas opp
+            autosaver.maybe_save(saved_state, saved_state.time, camera_group.dt_per_s, camera_group.zoom_scale, camera_group.offset) # gir en kopi av tilstanden til autolagringen hvis det er lenge siden forrige gang
+            if recorder: 
+                recorder.record(saved_state) # skriver tilstanden til opptaket hvis det har gått lang nok simuleringstid
+        camera_group.record_trails() # legger til et punkt i banene hvis det har gått lang nok simuleringstid
+        profiler.mark("physics") # tid brukt på fysikk, autolagring, opptak og baner
+        
+        ### tegner elementer til skjerm
+        camera_target = camera_group.update_camera() # flytter kameraet og returnerer kamera target
+        items = camera_group.visible_items() # romobjektene som er innenfor skjermen
+        camera_group.update_pick_grid(items) # museklikk i neste frame slås opp blant det som tegnes nå
+        profiler.mark("camera") # tid brukt på kamera og romobjektene som skal tegnes
         if camera_target: # hvis kamera target er gitt
             if only_simulation_shown == False: # bare hvis tekst og knapper skal vises
                 update_object_info_text(camera_target) # oppdater informasjon om romobjektet
-                objectinfo_group.draw(SCREEN) # viser info tekst om objektet til skjermen
+                items += sprite_items(objectinfo_group) # viser info tekst om objektet til skjermen
 
         if only_simulation_shown == False: # viser bare hvis tekst og knapper skal vises
             update_info_text(simulation_time, current_date.strftime("%d.%m.%Y")) # oppdaterer tekst med informasjom om simuleringen
-            info_group.draw(SCREEN) # viser all informasjon om simuleringen til skjerm 
-            button_group.draw(SCREEN) # viser alle knapper til skjerm
+            items += sprite_items(info_group) # viser all informasjon om simuleringen til skjerm 
+            items += sprite_items(button_group) # viser alle knapper til skjerm
+            
+        if show_profiler: # viser ytelsesmålingene
+            update_profiler_text() # oppdaterer teksten med ytelsesmålinger
+            items += sprite_items(profiler_group) # viser ytelsesmålingene til skjermen
+        profiler.mark("hud") # tid brukt på tekst
         
-        pygame.display.update() # oppdaterer display  
+        renderer.draw(SCREEN, items, camera_group.view_key(), underlay=camera_group.draw_underlay if camera_group.has_underlay() else None) # tegner elementene og oppdaterer bare de delene av displayet som er endret. Banene og punktene tegnes under romobjektene
+        profiler.mark("present") # tid brukt på å tegne til skjermen
+        profiler.end_frame(frame_time) # lagrer målingene for framen
      
 def quit_game() -> None: 
     """
@@ -711,8 +1106,17 @@ def quit_game() -> None:
     pygame.quit() # avslutter pygame
     sys.exit() # exits program 
 
-if __name__ == '__main__': # hvis scriptet ikke er importert 
+def main() -> None: 
+    """
+    funksjon som åpner lagringsplassene og viser welcome_screen
+    """
+    global save_slots
+    save_slots = SaveSlots(os.path.join(DATA_DIR, "saves")) # lager mappen hvis den ikke finnes
+    save_slots.storage(RESUME_SLOT, legacy_json_path=os.path.join(DATA_DIR, "storage_data.json")) # importerer lagring fra eldre versjoner
     welcome_screen() # vis welcome_screen
 
+if __name__ == '__main__': # hvis scriptet ikke er importert 
+    main() # starter programmet
+
 else: # hvis scriptet er importert, ikke start simulering 
     print("File " + __file__ + " cannot be imported") 
\ No newline at end of file
@@ -0,0 +1,188 @@
+import numpy as np # importerer numpy for å bygge treet og regne ut akselerasjonene med arrays
+from src.physics import GRAV_CONST # importerer gravitasjonskonstanten
+
+BARNES_HUT_THETA = 0.5 # åpningsvinkel. En node blir brukt som ett punkt når bredden delt på avstanden er mindre enn denne. Mindre verdi gir mer nøyaktige, men tregere beregninger
+MAX_DEPTH = 16 # maks antall nivåer i treet. Posisjonene blir gjort om til heltall med 16 bit i hver retning
+LEAF_SIZE = 16 # maks antall legemer i en løvnode. Legemene i en løvnode regnes ut direkte
+TARGET_CHUNK = 4096 # antall legemer det regnes ut akselerasjon for om gangen. Begrenser hvor mye minne listen med (legeme, node) par bruker
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """
+    funksjon som sprer de 16 laveste bitene i v slik at det blir en null-bit mellom hver bit. Brukes for å lage Morton kode
+    """
+    v = v.astype(np.int64) & 0xFFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+class QuadTree:
+    """
+    klasse for et quadtree der alle noder er lagret i numpy arrays istedenfor som egne python objekter. Legemene blir sortert etter Morton kode slik at legemene i hver node ligger etter hverandre, og hver node er gitt av start og slutt i den sorterte listen.
+    Bare legemer med masse blir lagt inn i treet. Treet bygges på nytt for hvert steg
+    """
+    def __init__(self, pos: np.ndarray, mass: np.ndarray, bounds_pos: np.ndarray|None=None) -> None: # constructor
+        self.source_index = np.flatnonzero(mass > 0) # indeksen til legemene som er med i treet
+        src_pos = pos[self.source_index] # posisjonene til legemene i treet
+        all_pos = src_pos if bounds_pos is None else np.vstack((src_pos, bounds_pos)) # posisjoner som må være innenfor rotnoden
+
+        ### kvadratisk rotnode som dekker alle posisjoner
+        lo = all_pos.min(axis=0) # minste x og y
+        hi = all_pos.max(axis=0) # største x og y
+        self.width = max(float((hi - lo).max()), 1.0) * (1 + 1e-9) # bredden til rotnoden
+        self.origin = lo # hjørnet til rotnoden
+        self.scale = (1 << MAX_DEPTH) / self.width # gjør om fra meter til heltallskoordinater
+
+        ### sorterer legemene etter Morton kode
+        q = self.quantize(src_pos) # heltallskoordinater
+        code = _spread_bits(q[:, 0]) | (_spread_bits(q[:, 1]) << 1) # Morton kode
+        order = np.argsort(code, kind="stable") # sorterer etter kode
+        self.source_index = self.source_index[order]
+        self.code = code[order]
+        self.q = q[order]
+        self.pos = src_pos[order]
+        self.mass = mass[self.source_index]
+
+        self.build()
+
+    def quantize(self, pos: np.ndarray) -> np.ndarray:
+        """
+        metode som gjør om posisjoner til heltallskoordinater i rotnoden
+        """
+        q = ((pos - self.origin) * self.scale).astype(np.int64) # heltallskoordinater
+        return np.clip(q, 0, (1 << MAX_DEPTH) - 1) # posisjoner utenfor rotnoden havner i kanten
+
+    def build(self) -> None:
+        """
+        metode som bygger nodene nivå for nivå. En node blir delt opp i barn så lenge den har flere enn LEAF_SIZE legemer og ikke er på nederste nivå
+        """
+        n = len(self.mass) # antall legemer i treet
+        starts = [np.array([0])] # start for nodene på hvert nivå
+        ends = [np.array([n])] # slutt for nodene på hvert nivå
+        levels = [np.zeros(1, dtype=np.int64)] # nivået til nodene
+        parents = [np.array([-1])] # foreldre node (indeks innenfor nivået over)
+        level_starts = np.array([0]) # start for nodene på nivået over
+        level_ends = np.array([n]) # slutt for nodene på nivået over
+        split = np.array([n > LEAF_SIZE]) # hvilke noder på nivået over som skal deles
+
+        for level in range(1, MAX_DEPTH + 1): # looper nedover i treet
+            if not split.any(): # ingen noder skal deles
+                break
+            key = self.code >> (2 * (MAX_DEPTH - level)) # kode til cellen legemene er i på dette nivået
+            group_start = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1]))) # start for hver celle med legemer
+            group_end = np.append(group_start[1:], n) # slutt for hver celle
+            parent = np.searchsorted(level_starts, group_start, side="right") - 1 # noden på nivået over som cellen kan ligge i
+            keep = (parent >= 0) & (group_start < level_ends[parent]) & split[parent] # bare celler som ligger i noder som skal deles blir noder
+            group_start, group_end, parent = group_start[keep], group_end[keep], parent[keep]
+            starts.append(group_start)
+            ends.append(group_end)
+            levels.append(np.full(len(group_start), level))
+            parents.append(parent)
+            level_starts = group_start
+            level_ends = group_end
+            split = (group_end - group_start > LEAF_SIZE) & (level < MAX_DEPTH) # noder med for mange legemer deles videre
+
+        ### samler nodene fra alle nivåer i ett sett med arrays
+        offsets = np.cumsum([0] + [len(s) for s in starts]) # indeksen til første node på hvert nivå
+        self.start = np.concatenate(starts) # start i den sorterte listen med legemer
+        self.end = np.concatenate(ends) # slutt i den sorterte listen med legemer
+        self.level = np.concatenate(levels) # nivået til noden
+        n_nodes = len(self.start) # antall noder
+        self.child_first = np.full(n_nodes, -1) # indeksen til første barn, -1 for løvnoder
+        self.child_count = np.zeros(n_nodes, dtype=np.int64) # antall barn
+        for level in range(1, len(starts)): # kobler barn til foreldre
+            parent_global = parents[level] + offsets[level - 1] # indeksen til foreldrenoden
+            child_global = np.arange(offsets[level], offsets[level + 1]) # indeksen til barna
+            first = np.concatenate(([True], parent_global[1:] != parent_global[:-1])) # første barn til hver forelder
+            self.child_first[parent_global[first]] = child_global[first]
+            self.child_count += np.bincount(parent_global, minlength=n_nodes)
+
+        ### masse og massesenter fra kumulative summer
+        cum_mass = np.concatenate(([0.0], np.cumsum(self.mass)))
+        cum_x = np.concatenate(([0.0], np.cumsum(self.mass * self.pos[:, 0])))
+        cum_y = np.concatenate(([0.0], np.cumsum(self.mass * self.pos[:, 1])))
+        self.node_mass = cum_mass[self.end] - cum_mass[self.start] # massen til noden
+        self.com = np.column_stack((cum_x[self.end] - cum_x[self.start], cum_y[self.end] - cum_y[self.start])) / self.node_mass[:, None] # massesenteret til noden
+        self.node_width = self.width / (1 << self.level) # bredden til noden
+        self.cell = self.q[self.start] >> (MAX_DEPTH - self.level)[:, None] # heltallskoordinatene til cellen noden dekker
+
+    def accelerations(self, pos: np.ndarray, theta: float=BARNES_HUT_THETA, softening: float=0.0, out: np.ndarray|None=None, self_index: np.ndarray|None=None) -> np.ndarray:
+        """
+        metode som regner ut akselerasjonen i posisjonene pos fra alle legemer i treet. self_index er indeksen til legemet på hver posisjon (eller -1), slik at et legeme ikke trekker på seg selv
+        """
+        n = len(pos) # antall posisjoner
+        if out is None:
+            out = np.empty((n, 2))
+        out[:] = 0 # nullstiller akselerasjonen
+        if len(self.mass) == 0: # ingen legemer med masse
+            return out
+        if self_index is None:
+            self_index = np.full(n, -1)
+        for c0 in range(0, n, TARGET_CHUNK): # deler opp i biter for å begrense minnebruk
+            c1 = min(c0 + TARGET_CHUNK, n)
+            out[c0:c1] = self._walk(pos[c0:c1], self_index[c0:c1], theta, softening)
+        return out
+
+    def _walk(self, pos: np.ndarray, self_index: np.ndarray, theta: float, softening: float) -> np.ndarray:
+        """
+        metode som går gjennom treet for alle posisjonene samtidig. Holder en liste med (posisjon, node) par, og for hvert nivå blir hvert par enten brukt som ett punkt, regnet ut direkte (løvnode) eller erstattet med parene til barna
+        """
+        n = len(pos)
+        acc = np.zeros((n, 2))
+        eps2 = softening**2
+        q = self.quantize(pos) # heltallskoordinatene til posisjonene
+        target = np.arange(n) # posisjon i paret
+        node = np.zeros(n, dtype=np.int64) # node i paret, starter med rotnoden
+
+        while len(target): # looper til alle par er ferdige
+            d = self.com[node] - pos[target] # avstand fra posisjon til massesenteret til noden
+            r2 = np.einsum("ij,ij->i", d, d) # avstanden i andre
+            inside = np.all((q[target] >> (MAX_DEPTH - self.level[node])[:, None]) == self.cell[node], axis=1) # posisjonen ligger inne i noden
+            accept = ~inside & (self.node_width[node]**2 < theta**2 * r2) # noden er langt nok unna til å brukes som ett punkt
+
+            ### noder som er langt nok unna
+            if accept.any():
+                d_a = d[accept]
+                r2_a = r2[accept] + eps2
+                w = GRAV_CONST * self.node_mass[node[accept]] / (r2_a * np.sqrt(r2_a)) # G*m/r^3
+                acc[:, 0] += np.bincount(target[accept], weights=w*d_a[:, 0], minlength=n)
+                acc[:, 1] += np.bincount(target[accept], weights=w*d_a[:, 1], minlength=n)
+
+            opened = ~accept
+            leaf = opened & (self.child_count[node] == 0) # løvnoder som må regnes ut direkte
+            if leaf.any():
+                t_leaf, p_leaf = self._expand(target[leaf], self.start[node[leaf]], self.end[node[leaf]]) # par (posisjon, legeme) for alle legemer i løvnodene
+                not_self = self.source_index[p_leaf] != self_index[t_leaf] # et legeme trekker ikke på seg selv
+                t_leaf, p_leaf = t_leaf[not_self], p_leaf[not_self]
+                d_l = self.pos[p_leaf] - pos[t_leaf]
+                r2_l = np.einsum("ij,ij->i", d_l, d_l) + eps2
+                w = GRAV_CONST * self.mass[p_leaf] / (r2_l * np.sqrt(r2_l))
+                acc[:, 0] += np.bincount(t_leaf, weights=w*d_l[:, 0], minlength=n)
+                acc[:, 1] += np.bincount(t_leaf, weights=w*d_l[:, 1], minlength=n)
+
+            internal = opened & ~leaf # noder som må åpnes
+            first = self.child_first[node[internal]]
+            target, node = self._expand(target[internal], first, first + self.child_count[node[internal]]) # erstatter parene med par for barna
+        return acc
+
+    @staticmethod
+    def _expand(target: np.ndarray, start: np.ndarray, end: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        metode som lager et par (target[i], k) for hver k i start[i]..end[i]-1
+        """
+        counts = end - start # antall for hvert par
+        total = int(counts.sum())
+        rep_target = np.repeat(target, counts) # gjentar target for hver k
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) # 0, 1, 2, ... innenfor hvert område
+        return rep_target, np.repeat(start, counts) + offsets
+
+
+def barnes_hut_accelerations(pos: np.ndarray, mass: np.ndarray, theta: float=BARNES_HUT_THETA, softening: float=0.0, out: np.ndarray|None=None) -> np.ndarray:
+    """
+    funksjon som regner ut akselerasjonen til alle legemer med Barnes-Hut algoritmen. Treet bygges på nytt hver gang, og kostnaden er omtrent O(N log N) istedenfor O(N^2)
+    """
+    tree = QuadTree(pos, mass, bounds_pos=pos) # bygger treet
+    return tree.accelerations(pos, theta, softening, out, self_index=np.arange(len(mass))) # regner ut akselerasjonene
@@ -0,0 +1,192 @@
+"""
+kommandolinjeverktøy som simulerer solsystemet uten skjerm. Integrerer startverdiene fra init_system_state fram (eller tilbake) til en liste med datoer og skriver tilstanden ved hver dato til en csv fil eller en binær numpy fil (.npz).
+Kan kjøre ensembler der massene eller fartsvektorene blir forstyrret litt tilfeldig, og sammenligne integratorer og nøyaktigheter. Alle kjøringene fordeles på en prosess pool med en prosess per kjerne, og resultatene samles i en fil.
+Kjøres fra mappen til prosjektet med f.eks:
+    python3 -m src.batch --dates 2030-01-01 2050-01-01 --members 64 --velocity-sigma 1e-6 --output ensemble.npz
+    python3 -m src.batch --range 2022-01-01 2032-01-01 365 --integrator leapfrog yoshida4 --output sammenligning.csv
+"""
+from __future__ import annotations
+import argparse # importerer bibliotek for å lese argumenter fra kommandolinjen
+import csv # importerer bibliotek for å skrive csv filer
+import datetime # importerer bibliotek for å bruke datoer i python
+import multiprocessing # importerer bibliotek for å kjøre flere simuleringer samtidig i egne prosesser
+import os # importerer bibliotek for å finne antall kjerner
+import sys # importerer bibliotek for å skrive fremdrift til stderr
+import time # importerer bibliotek for å måle tid
+import numpy as np # importerer numpy for å forstyrre startverdiene og lagre resultatene
+from src.catalog import load_catalog, CATALOG_PATH # importerer funksjon som leser startverdiene fra en katalog
+from src.integrators import get_integrator # importerer funksjon som lager en integrator ut fra navnet
+from src.simulation import Simulator, SystemState, init_system_state, date_to_seconds, DEFAULT_DATE, FAST_FORWARD_ACCURACY, FAST_FORWARD_INTEGRATOR # importerer simuleringskjernen
+
+
+def parse_date(text: str) -> datetime.date:
+    """
+    funksjon som gjør om en dato på formatet ÅÅÅÅ-MM-DD til datetime.date
+    """
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ugyldig dato: {text} (bruk ÅÅÅÅ-MM-DD)")
+
+
+def make_dates(dates: list[datetime.date]|None, date_range: list[str]|None) -> list[datetime.date]:
+    """
+    funksjon som lager den sorterte listen med datoer tilstanden skal skrives ved, fra --dates og --range START SLUTT DAGER
+    """
+    result = set(dates or []) # datoer som er gitt direkte
+    if date_range:
+        start, end, step = parse_date(date_range[0]), parse_date(date_range[1]), int(date_range[2]) # start, slutt og antall dager mellom hver dato
+        if step <= 0:
+            raise ValueError("antall dager mellom datoene må være større enn 0")
+        result.update(start + datetime.timedelta(days=day) for day in range(0, (end - start).days + 1, step))
+    return sorted(result)
+
+
+def make_runs(members: int, integrators: list[str], accuracies: list[float], mass_sigma: float, velocity_sigma: float, seed: int, catalog: str|None=None) -> list[dict]:
+    """
+    funksjon som lager en beskrivelse av hver kjøring: alle kombinasjoner av integrator, nøyaktighet og ensemble medlem. Medlem 0 har alltid de uforstyrrede startverdiene, slik at det kan brukes som referanse
+    """
+    runs = []
+    for integrator in integrators:
+        for accuracy in accuracies:
+            for member in range(members):
+                runs.append({"run": len(runs), "integrator": integrator, "accuracy": accuracy, "member": member, "mass_sigma": mass_sigma, "velocity_sigma": velocity_sigma, "seed": seed, "catalog": catalog})
+    return runs
+
+
+def initial_state(catalog: str|None) -> SystemState:
+    """
+    funksjon som returnerer startverdiene fra katalogen, eller solsystemet 1 januar 2022 hvis det ikke er gitt en katalog
+    """
+    return load_catalog(catalog).state if catalog else init_system_state()
+
+
+def perturbed_state(member: int, mass_sigma: float, velocity_sigma: float, seed: int, catalog: str|None=None) -> SystemState:
+    """
+    funksjon som lager starttilstanden til et ensemble medlem. Hver masse og hver fartsvektor blir ganget med 1 + sigma ganger et normalfordelt tall. Samme seed og medlem gir alltid samme forstyrrelse, uansett hvilken prosess som kjører medlemmet
+    """
+    state = initial_state(catalog)
+    if member == 0: # referansen er uforstyrret
+        return state
+    rng = np.random.default_rng([seed, member]) # egen tilfeldighetsgenerator for hvert medlem
+    state.mass *= 1 + mass_sigma * rng.standard_normal(len(state)) # forstyrrer massene
+    state.vel *= 1 + velocity_sigma * rng.standard_normal((len(state), 1)) # forstyrrer banefarten, men ikke retningen
+    return state
+
+
+def run(spec: dict, times: list[int]) -> tuple[dict, np.ndarray]:
+    """
+    funksjon som kjører en simulering og returnerer spec og tilstanden ved hver tid som et (tider, legemer, 4) array med x, y, v_x og v_y. Kjøres i en egen prosess
+    """
+    start_state = perturbed_state(spec["member"], spec["mass_sigma"], spec["velocity_sigma"], spec["seed"], spec["catalog"])
+    satellites = load_catalog(spec["catalog"]).satellite_groups() if spec["catalog"] else None # måner i katalogen blir integrert rundt planetene sine
+    states = np.empty((len(times), len(start_state), 4)) # tilstanden ved hver tid
+    by_time = sorted(range(len(times)), key=lambda i: times[i]) # indeksene sortert etter tid
+    backward = [i for i in by_time if times[i] < 0][::-1] # tider før DEFAULT_DATE, nærmest først
+    forward = [i for i in by_time if times[i] >= 0] # tider etter DEFAULT_DATE, nærmest først
+    for order in (backward, forward): # integrerer bakover og framover hver for seg fra starttilstanden
+        simulator = Simulator(start_state.copy(), satellites=satellites)
+        for i in order: # hver integrasjon fortsetter fra forrige tid
+            simulator.fast_forward(times[i], spec["accuracy"], integrator=spec["integrator"])
+            states[i, :, 0:2] = simulator.state.pos
+            states[i, :, 2:4] = simulator.state.vel
+    return spec, states
+
+
+def run_star(args: tuple[dict, list[int]]) -> tuple[dict, np.ndarray]:
+    return run(*args) # Pool.imap_unordered gir bare ett argument
+
+
+def run_all(runs: list[dict], times: list[int], processes: int) -> np.ndarray:
+    """
+    funksjon som fordeler kjøringene på en prosess pool og returnerer alle tilstandene som et (kjøringer, tider, legemer, 4) array. Fremdrift skrives til stderr etter hvert som kjøringer blir ferdige
+    """
+    results = None
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        for done, (spec, states) in enumerate(pool.imap_unordered(run_star, [(spec, times) for spec in runs]), start=1): # kjøringene blir ferdige i vilkårlig rekkefølge
+            if results is None:
+                results = np.empty((len(runs), *states.shape))
+            results[spec["run"]] = states # samler resultatene i samme rekkefølge som runs
+            elapsed = time.perf_counter() - start
+            print(f"\r{done}/{len(runs)} kjøringer ferdig, {elapsed:.1f} s, ca {elapsed / done * (len(runs) - done):.0f} s igjen", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    return results
+
+
+def write_csv(path: str, runs: list[dict], dates: list[datetime.date], names: list[str], results: np.ndarray) -> None:
+    """
+    funksjon som skriver resultatene til en csv fil med en rad per kjøring, dato og legeme
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["run", "integrator", "accuracy", "member", "date", "time", "name", "x", "y", "v_x", "v_y"])
+        for spec, states in zip(runs, results):
+            for date, state in zip(dates, states):
+                for name, (x, y, v_x, v_y) in zip(names, state.tolist()):
+                    writer.writerow([spec["run"], spec["integrator"], spec["accuracy"], spec["member"], date.isoformat(), date_to_seconds(date), name, x, y, v_x, v_y])
+
+
+def write_binary(path: str, runs: list[dict], dates: list[datetime.date], names: list[str], results: np.ndarray) -> None:
+    """
+    funksjon som skriver resultatene til en .npz fil. states er et (kjøringer, datoer, legemer, 4) array med x, y, v_x og v_y, og de andre arrayene beskriver aksene
+    """
+    np.savez(
+        path,
+        states=results, # tilstandene
+        dates=np.array([date.isoformat() for date in dates]), # datoene
+        times=np.array([date_to_seconds(date) for date in dates]), # simuleringstid ved datoene
+        names=np.array(names), # navn til legemene
+        integrator=np.array([spec["integrator"] for spec in runs]), # integrator for hver kjøring
+        accuracy=np.array([spec["accuracy"] for spec in runs]), # nøyaktighet for hver kjøring
+        member=np.array([spec["member"] for spec in runs]), # ensemble medlem for hver kjøring
+    )
+
+
+def main() -> None:
+    """
+    funksjon som leser argumentene, kjører alle simuleringene og skriver resultatet
+    """
+    parser = argparse.ArgumentParser(description="simulerer solsystemet uten skjerm og skriver tilstanden ved gitte datoer til fil")
+    parser.add_argument("--dates", nargs="+", type=parse_date, help="datoer tilstanden skrives ved (ÅÅÅÅ-MM-DD)")
+    parser.add_argument("--range", nargs=3, metavar=("START", "SLUTT", "DAGER"), help="datoer fra START til SLUTT med DAGER mellom hver")
+    parser.add_argument("--integrator", nargs="+", default=[FAST_FORWARD_INTEGRATOR], help=f"en eller flere integratorer (standard {FAST_FORWARD_INTEGRATOR})")
+    parser.add_argument("--accuracy", nargs="+", type=float, default=[FAST_FORWARD_ACCURACY], help=f"en eller flere nøyaktighetsmål (standard {FAST_FORWARD_ACCURACY})")
+    parser.add_argument("--members", type=int, default=1, help="antall ensemble medlemmer per integrator og nøyaktighet. Medlem 0 er uforstyrret (standard 1)")
+    parser.add_argument("--mass-sigma", type=float, default=0.0, help="relativt standardavvik for forstyrrelse av massene")
+    parser.add_argument("--velocity-sigma", type=float, default=0.0, help="relativt standardavvik for forstyrrelse av banefarten")
+    parser.add_argument("--seed", type=int, default=0, help="seed for forstyrrelsene")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="antall prosesser (standard antall kjerner)")
+    parser.add_argument("--catalog", help=f"katalog med startverdiene (standard {CATALOG_PATH}, solsystemet 1 januar 2022)")
+    parser.add_argument("--output", required=True, help="fil resultatene skrives til. .csv gir csv, alt annet gir binær .npz")
+    args = parser.parse_args()
+
+    try:
+        dates = make_dates(args.dates, args.range)
+    except ValueError as error:
+        parser.error(str(error))
+    if not dates:
+        parser.error("gi minst en dato med --dates eller --range")
+    if args.members < 1:
+        parser.error("--members må være minst 1")
+    for integrator in args.integrator: # sjekker integratorene før noe startes
+        try:
+            get_integrator(integrator)
+        except ValueError as error:
+            parser.error(str(error))
+
+    runs = make_runs(args.members, args.integrator, args.accuracy, args.mass_sigma, args.velocity_sigma, args.seed, args.catalog)
+    times = [date_to_seconds(date) for date in dates] # simuleringstid fra DEFAULT_DATE
+    print(f"{len(runs)} kjøringer fra {DEFAULT_DATE} til {len(dates)} datoer med {args.processes} prosesser", file=sys.stderr)
+    results = run_all(runs, times, max(1, min(args.processes, len(runs))))
+
+    names = initial_state(args.catalog).names # navn til legemene
+    if args.output.endswith(".csv"):
+        write_csv(args.output, runs, dates, names, results)
+    else:
+        write_binary(args.output, runs, dates, names, results)
+    print(f"skrev {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
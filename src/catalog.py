@@ -0,0 +1,201 @@
+"""
+katalog med startverdiene til legemene. Katalogen er en csv fil med en rad per legeme: navn, masse, posisjon, fartsvektor, bilde, bildestørrelse og hvordan legemet skal tegnes.
+Legemer med masse 0 er testpartikler som blir trukket på av gravitasjonen, men ikke trekker på andre legemer. Legemer uten bilde blir tegnet som punkter. Måner har navnet på planeten sin i kolonnen parent, og blir integrert rundt planeten (se src/satellites.py).
+Kan også brukes fra kommandolinjen for å lage en katalog med syntetiske asteroidebelter, Kuiperbelter og de store månene:
+    python3 -m src.catalog --asteroids 5000 --kuiper 5000 --moons --output data/catalog_belter.csv
+"""
+from __future__ import annotations
+import argparse # importerer bibliotek for å lese argumenter fra kommandolinjen
+import csv # importerer bibliotek for å lese og skrive csv filer
+import numpy as np # importerer numpy for å holde katalogen i arrays og lage tilfeldige baner
+from src.physics import GRAV_CONST # importerer gravitasjonskonstanten
+from src.simulation import SystemState # importerer tilstanden katalogen blir gjort om til
+
+### standardkatalogen har sola og planetene 1 januar 2022, fra https://ssd.jpl.nasa.gov/horizons/app.html#/ (tallene står i km, så er endret til m)
+### posisjonene og fartsvektorene er gitt fra solsystemets barycenter, og alle tall er i SI-enheter
+CATALOG_PATH = "./data/catalog.csv" # standard katalog med sola og planetene
+COLUMNS = ["name", "mass", "x", "y", "v_x", "v_y", "texture", "size", "render", "parent"] # kolonnene i katalogen
+RENDER_IMAGE = "image" # legemet blir tegnet med et bilde
+RENDER_POINT = "point" # legemet blir tegnet som et punkt
+AU = 1.495978707e11 # astronomisk enhet i meter
+
+### belter som kan genereres: indre og ytre radius i AU, og prefiks til navnene
+BELTS = {
+    "asteroids": (2.1, 3.3, "Asteroide"),
+    "kuiper": (30.0, 50.0, "KBO"),
+}
+
+### de store månene som kan genereres: planet, navn, masse, store halvakse i km og omløpsretning (-1 for retrograd bane)
+MOONS = [
+    ("Jorda", "Månen", 7.342e22, 384400, 1),
+    ("Jupiter", "Io", 8.9319e22, 421700, 1),
+    ("Jupiter", "Europa", 4.7998e22, 671034, 1),
+    ("Jupiter", "Ganymedes", 1.4819e23, 1070412, 1),
+    ("Jupiter", "Callisto", 1.0759e23, 1882709, 1),
+    ("Saturn", "Rhea", 2.306e21, 527108, 1),
+    ("Saturn", "Titan", 1.3452e23, 1221870, 1),
+    ("Saturn", "Iapetus", 1.806e21, 3560820, 1),
+    ("Uranus", "Titania", 3.4e21, 435910, 1),
+    ("Uranus", "Oberon", 3.076e21, 583520, 1),
+    ("Neptun", "Triton", 2.14e22, 354759, -1),
+]
+
+
+class Catalog:
+    """
+    klasse som holder en katalog i arrays: tilstanden til alle legemer, og bilde, bildestørrelse og tegnemåte for hvert legeme. Legemer som tegnes som punkter har ingen egne bilder eller objekter, slik at minnebruken per legeme bare er noen tall
+    """
+    def __init__(self, state: SystemState, textures: list[str], sizes: np.ndarray, render: np.ndarray, parents: list[str]|None=None) -> None: # constructor
+        self.state = state # startverdiene
+        self.textures = textures # path til bildet til hvert legeme, eller "" hvis legemet ikke har bilde
+        self.sizes = sizes # bildestørrelse i piksler ved zoom 1
+        self.render = render # RENDER_IMAGE eller RENDER_POINT for hvert legeme
+        self.parents = parents if parents is not None else [""] * len(state) # navnet på planeten til hver måne, eller "" for legemer som ikke er måner
+
+    def __len__(self) -> int:
+        return len(self.state) # antall legemer
+
+    def image_indices(self) -> np.ndarray:
+        """
+        metode som returnerer indeksene til legemene som tegnes med bilde
+        """
+        return np.flatnonzero(self.render == RENDER_IMAGE)
+
+    def point_indices(self) -> np.ndarray:
+        """
+        metode som returnerer indeksene til legemene som tegnes som punkter
+        """
+        return np.flatnonzero(self.render == RENDER_POINT)
+
+    def extend(self, other: Catalog) -> None:
+        """
+        metode som legger legemene i other til på slutten av katalogen
+        """
+        self.state = SystemState(self.state.names + other.state.names, np.concatenate((self.state.mass, other.state.mass)), np.vstack((self.state.pos, other.state.pos)), np.vstack((self.state.vel, other.state.vel)))
+        self.textures = self.textures + other.textures
+        self.sizes = np.concatenate((self.sizes, other.sizes))
+        self.render = np.concatenate((self.render, other.render))
+        self.parents = self.parents + other.parents
+
+    def satellite_groups(self) -> list[np.ndarray]:
+        """
+        metode som returnerer satellittsystemene i katalogen som en liste med indeksarrays: først indeksen til planeten og så indeksene til månene. Måner kan ikke ha egne måner
+        """
+        index = {name: i for i, name in enumerate(self.state.names)} # navn -> indeks
+        groups = {} # planet -> måner
+        for i, parent in enumerate(self.parents):
+            if not parent:
+                continue
+            if parent not in index:
+                raise ValueError(f"{self.state.names[i]} går rundt {parent}, som ikke er i katalogen")
+            if self.parents[index[parent]]:
+                raise ValueError(f"{self.state.names[i]} går rundt {parent}, som selv er en måne")
+            if self.state.mass[index[parent]] <= 0:
+                raise ValueError(f"{self.state.names[i]} går rundt {parent}, som ikke har masse")
+            groups.setdefault(index[parent], []).append(i)
+        return [np.array([planet, *moons]) for planet, moons in groups.items()]
+
+
+def load_catalog(path: str=CATALOG_PATH) -> Catalog:
+    """
+    funksjon som leser en katalog fra en csv fil. Tallene blir lest kolonne for kolonne til numpy arrays, slik at store kataloger leses raskt
+    """
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f)) # alle radene
+    header, rows = rows[0], [row for row in rows[1:] if row] # kolonnenavn og rader uten tomme linjer
+    column = {name: header.index(name) for name in COLUMNS if name in header} # kolonnenavn -> indeks
+    for name in COLUMNS[:6]: # kolonnene som må være med
+        if name not in column:
+            raise ValueError(f"katalogen {path} mangler kolonnen {name}")
+    values = lambda name: [row[column[name]] if name in column and column[name] < len(row) else "" for row in rows] # verdiene i en kolonne
+    numbers = np.array([values(name) for name in COLUMNS[1:6]], dtype=np.float64) # masse, x, y, v_x og v_y
+    textures = values("texture")
+    sizes = np.array([float(size) if size else 0.0 for size in values("size")])
+    render = np.array([render or (RENDER_IMAGE if texture else RENDER_POINT) for render, texture in zip(values("render"), textures)]) # legemer uten bilde blir punkter
+    if np.any((render == RENDER_IMAGE) & (np.array(textures) == "")):
+        raise ValueError(f"legemer i {path} som skal tegnes med bilde mangler bilde")
+    state = SystemState(values("name"), numbers[0], numbers[1:3].T, numbers[3:5].T)
+    return Catalog(state, textures, sizes, render, values("parent"))
+
+
+def write_catalog(path: str, catalog: Catalog) -> None:
+    """
+    funksjon som skriver katalogen til en csv fil
+    """
+    state = catalog.state
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(len(catalog)):
+            writer.writerow([state.names[i], repr(float(state.mass[i])), *map(repr, state.pos[i].tolist()), *map(repr, state.vel[i].tolist()), catalog.textures[i], f"{catalog.sizes[i]:g}" if catalog.sizes[i] else "", catalog.render[i], catalog.parents[i]])
+
+
+def generate_belt(n: int, r_min: float, r_max: float, prefix: str, central_mass: float, central_pos: np.ndarray, central_vel: np.ndarray, eccentricity: float=0.05, seed: int=0) -> Catalog:
+    """
+    funksjon som lager n testpartikler i et belte rundt en sentralmasse, mellom r_min og r_max AU. Banene har tilfeldig retning på store halvakse og eksentrisitet opp til eccentricity, og alle går samme vei rundt som planetene.
+    Partiklene har ingen masse og blir tegnet som punkter
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(r_min, r_max, n) * AU # store halvakse
+    e = rng.uniform(0, eccentricity, n) # eksentrisitet
+    omega = rng.uniform(0, 2*np.pi, n) # retningen til perihel
+    anomaly = rng.uniform(0, 2*np.pi, n) # sann anomali, hvor i banen partikkelen er
+    mu = GRAV_CONST * central_mass
+    p = a * (1 - e**2) # semi-latus rectum
+    r = p / (1 + e*np.cos(anomaly)) # avstand fra sentralmassen
+    angle = omega + anomaly # vinkel fra x aksen
+    v_r = np.sqrt(mu / p) * e * np.sin(anomaly) # radiell fart
+    v_t = np.sqrt(mu / p) * (1 + e*np.cos(anomaly)) # tangentiell fart
+    pos = central_pos + np.column_stack((r*np.cos(angle), r*np.sin(angle)))
+    vel = central_vel + np.column_stack((v_r*np.cos(angle) - v_t*np.sin(angle), v_r*np.sin(angle) + v_t*np.cos(angle)))
+    state = SystemState([f"{prefix} {i + 1}" for i in range(n)], np.zeros(n), pos, vel)
+    return Catalog(state, [""] * n, np.zeros(n), np.full(n, RENDER_POINT))
+
+
+def generate_moons(catalog: Catalog, seed: int=0) -> Catalog:
+    """
+    funksjon som lager de store månene i MOONS for planetene som er i katalogen. Månene får sirkulære baner rundt planeten med tilfeldig startvinkel, og blir tegnet som punkter
+    """
+    rng = np.random.default_rng(seed)
+    index = {name: i for i, name in enumerate(catalog.state.names)} # navn -> indeks
+    moons = [moon for moon in MOONS if moon[0] in index] # måner til planeter som er i katalogen
+    n = len(moons)
+    planet = np.array([index[moon[0]] for moon in moons], dtype=np.int64)
+    mass = np.array([moon[2] for moon in moons])
+    a = np.array([moon[3] for moon in moons]) * 1000 # store halvakse i meter
+    direction = np.array([moon[4] for moon in moons]) # omløpsretning
+    angle = rng.uniform(0, 2*np.pi, n) # vinkel fra x aksen
+    v = direction * np.sqrt(GRAV_CONST * (catalog.state.mass[planet] + mass) / a) # banefart i sirkelbane
+    pos = catalog.state.pos[planet] + np.column_stack((a*np.cos(angle), a*np.sin(angle)))
+    vel = catalog.state.vel[planet] + np.column_stack((-v*np.sin(angle), v*np.cos(angle)))
+    state = SystemState([moon[1] for moon in moons], mass, pos, vel)
+    return Catalog(state, [""] * n, np.zeros(n), np.full(n, RENDER_POINT), [moon[0] for moon in moons])
+
+
+def main() -> None:
+    """
+    funksjon som leser en katalog, legger til belter og skriver den nye katalogen
+    """
+    parser = argparse.ArgumentParser(description="lager en katalog med syntetiske belter av testpartikler og de store månene")
+    parser.add_argument("--base", default=CATALOG_PATH, help=f"katalogen beltene legges til (standard {CATALOG_PATH})")
+    parser.add_argument("--asteroids", type=int, default=0, help="antall partikler i asteroidebeltet")
+    parser.add_argument("--kuiper", type=int, default=0, help="antall partikler i Kuiperbeltet")
+    parser.add_argument("--moons", action="store_true", help="legger til de store månene til planetene")
+    parser.add_argument("--seed", type=int, default=0, help="seed for de tilfeldige banene")
+    parser.add_argument("--output", required=True, help="fil den nye katalogen skrives til")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.base)
+    if args.moons:
+        catalog.extend(generate_moons(catalog, seed=args.seed))
+    sun = int(np.argmax(catalog.state.mass)) # beltene går rundt det tyngste legemet
+    for belt, count in (("asteroids", args.asteroids), ("kuiper", args.kuiper)):
+        if count > 0:
+            r_min, r_max, prefix = BELTS[belt]
+            catalog.extend(generate_belt(count, r_min, r_max, prefix, catalog.state.mass[sun], catalog.state.pos[sun], catalog.state.vel[sun], seed=args.seed + len(catalog)))
+    write_catalog(args.output, catalog)
+    print(f"skrev {len(catalog)} legemer til {args.output}")
+
+
+if __name__ == "__main__":
+    main()
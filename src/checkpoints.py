@@ -0,0 +1,162 @@
+from __future__ import annotations
+import hashlib # importerer bibliotek for å lage en nøkkel som identifiserer katalog og integrator
+import json # importerer bibliotek for å lagre indeksen som json
+import os # importerer bibliotek for å jobbe med filer
+import time # importerer bibliotek for å måle hvor lang tid som har gått
+from typing import Callable
+import numpy as np # importerer numpy for å lese og skrive tilstander som binære arrays
+from src.integrators import get_integrator # importerer funksjon som lager en integrator ut fra navnet
+from src.simulation import Simulator, SystemState, FAST_FORWARD_ACCURACY, FAST_FORWARD_INTEGRATOR, SECONDS_PER_DAY, PROGRESS_INTERVAL # importerer simuleringskjernen
+
+CHECKPOINT_INTERVAL_DAYS = 30 # antall dager mellom hvert checkpoint
+CHECKPOINT_SPAN_YEARS = 200 # hvor mange år fram og tilbake fra DEFAULT_DATE det lagres checkpoints
+
+INDEX_VERSION = 3 # versjon av indeksfilen. Endres hvis formatet endres eller hvis en integrator regner annerledes enn før
+
+
+class CheckpointStore:
+    """
+    klasse som lagrer tilstanden til alle legemer med jevne mellomrom (hver CHECKPOINT_INTERVAL_DAYS dag) i en binær fil som leses med numpy.memmap, og en liten json indeks med tidspunktene som er lagret.
+    Checkpoint k er tilstanden etter å ha integrert checkpoint for checkpoint ut fra starttilstanden, slik at samme checkpoint alltid får samme verdi uansett hvilken dato som ble valgt først. Nye checkpoints blir lagt til etter hvert som de blir regnet ut.
+    Hvis katalogen med legemer, integratoren eller nøyaktigheten endres, får lagret data en annen nøkkel og blir slettet automatisk
+    """
+    def __init__(self, path: str, initial_state: SystemState, accuracy: float=FAST_FORWARD_ACCURACY, integrator: str=FAST_FORWARD_INTEGRATOR, interval_days: int=CHECKPOINT_INTERVAL_DAYS, span_years: int=CHECKPOINT_SPAN_YEARS) -> None: # constructor
+        self.data_path = path + ".bin" # binær fil med tilstandene
+        self.index_path = path + ".json" # indeks med tidspunkter
+        self.initial_state = initial_state.copy() # tilstanden ved tid 0 som alle checkpoints er regnet ut fra
+        self.accuracy = accuracy # nøyaktighetsmål som brukes når det integreres mellom checkpoints
+        self.integrator = get_integrator(integrator) # integratoren som brukes mellom checkpoints
+        self.interval = interval_days * SECONDS_PER_DAY # sekunder mellom hvert checkpoint
+        self.max_slot = int(span_years * 365.25 * SECONDS_PER_DAY) // self.interval # største checkpoint nummer som lagres
+        self.n_bodies = len(initial_state) # antall legemer
+        self.key = self.make_key() # nøkkel som identifiserer katalog og integrator
+        self.records: dict[int, int] = {} # checkpoint tidspunkt -> rad i den binære filen
+        self.memmap = None # memmap over den binære filen
+        self.load_index() # leser indeksen
+
+    def make_key(self) -> str:
+        """
+        metode som lager en nøkkel ut fra starttilstanden, integratoren, nøyaktigheten og intervallet. Hvis noe av dette endres blir nøkkelen en annen
+        """
+        h = hashlib.sha1() # sha1 hash
+        h.update(json.dumps([self.initial_state.names, self.integrator.name, self.accuracy, self.interval]).encode()) # navn, integrator, nøyaktighet og intervall
+        for arr in (self.initial_state.mass, self.initial_state.pos, self.initial_state.vel): # masser, posisjoner og fartsvektorer
+            h.update(np.ascontiguousarray(arr, dtype=np.float64).tobytes())
+        h.update(str(self.initial_state.time).encode()) # tiden starttilstanden gjelder for
+        return h.hexdigest() # returnerer nøkkelen som hex string
+
+    def load_index(self) -> None:
+        """
+        metode som leser indeksen. Hvis indeksen mangler, er ødelagt eller har en annen nøkkel blir lagret data slettet
+        """
+        try:
+            with open(self.index_path) as f: # åpner indeksen
+                index = json.load(f) # parser json
+        except (FileNotFoundError, json.JSONDecodeError): # indeksen finnes ikke eller er ødelagt
+            index = None
+
+        record_size = self.n_bodies * 4 * 8 # antall bytes per checkpoint (x, y, v_x, v_y som float64 for hvert legeme)
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0 # størrelsen på den binære filen
+        if index is None or index.get("version") != INDEX_VERSION or index.get("key") != self.key or data_size < len(index["times"]) * record_size: # indeksen passer ikke med katalogen eller integratoren
+            self.clear() # sletter lagret data
+            return
+        self.records = {t: i for i, t in enumerate(index["times"])} # tidspunkt -> rad
+        if data_size > len(self.records) * record_size: # hvis programmet stoppet etter at et checkpoint ble skrevet men før indeksen ble oppdatert
+            os.truncate(self.data_path, len(self.records) * record_size) # fjerner checkpoints som ikke er med i indeksen
+
+    def clear(self) -> None:
+        """
+        metode som sletter alle checkpoints. Skriver ikke noe hvis det ikke finnes noen filer fra før
+        """
+        self.records = {} # ingen checkpoints
+        self.memmap = None # lukker memmap
+        if os.path.exists(self.data_path): # sletter binær fil
+            os.remove(self.data_path)
+        if os.path.exists(self.index_path): # gammel indeks som ikke passer lenger
+            self.write_index() # skriver tom indeks
+
+    def write_index(self) -> None:
+        """
+        metode som skriver indeksen til fil. Skriver først til en midlertidig fil og bytter navn, slik at indeksen aldri blir halvveis skrevet
+        """
+        times = sorted(self.records, key=self.records.get) # tidspunktene i samme rekkefølge som radene i den binære filen
+        index = {"version": INDEX_VERSION, "key": self.key, "interval": self.interval, "n_bodies": self.n_bodies, "times": times} # innhold i indeksen
+        tmp_path = self.index_path + ".tmp" # midlertidig fil
+        with open(tmp_path, "w") as f: # åpner midlertidig fil i write modus
+            json.dump(index, f) # lagrer indeksen
+        os.replace(tmp_path, self.index_path) # bytter ut gammel indeks med ny
+
+    def get(self, checkpoint_time: int) -> np.ndarray:
+        """
+        metode som returnerer tilstanden ved checkpoint_time som et (N, 4) array med x, y, v_x, v_y for hvert legeme
+        """
+        row = self.records[checkpoint_time] # rad i den binære filen
+        if self.memmap is None or len(self.memmap) <= row: # hvis filen har vokst siden memmap ble laget
+            self.memmap = np.memmap(self.data_path, dtype=np.float64, mode="r", shape=(len(self.records), self.n_bodies, 4)) # memmap over hele filen
+        return np.array(self.memmap[row]) # kopierer ut tilstanden
+
+    def append(self, state: SystemState) -> None:
+        """
+        metode som legger til tilstanden som et nytt checkpoint på slutten av den binære filen. Indeksen må skrives med write_index etterpå
+        """
+        record = np.hstack((state.pos, state.vel)) # (N, 4) array med x, y, v_x, v_y
+        with open(self.data_path, "ab") as f: # åpner binær fil i append modus
+            f.write(np.ascontiguousarray(record, dtype=np.float64).tobytes()) # skriver tilstanden
+        self.records[int(state.time)] = len(self.records) # legger til i indeksen
+
+    def nearest(self, target_time: int) -> int:
+        """
+        metode som returnerer tidspunktet til checkpointet som er nærmest target_time. Tid 0 (starttilstanden) regnes alltid som et checkpoint
+        """
+        return min([0, *self.records], key=lambda t: abs(t - target_time))
+
+    def load(self, simulator: Simulator, checkpoint_time: int) -> None:
+        """
+        metode som setter tilstanden til simulatoren til checkpointet ved checkpoint_time
+        """
+        state = simulator.state
+        if checkpoint_time == 0: # starttilstanden
+            state.pos[:] = self.initial_state.pos
+            state.vel[:] = self.initial_state.vel
+        else:
+            record = self.get(checkpoint_time) # henter lagret tilstand
+            state.pos[:] = record[:, 0:2] # posisjoner
+            state.vel[:] = record[:, 2:4] # fartsvektorer
+        state.time = checkpoint_time # setter simuleringstiden
+
+    def fast_forward(self, simulator: Simulator, target_time: int, progress: Callable[[float], bool]|None=None) -> bool:
+        """
+        metode som flytter simulatoren til target_time. Starter fra checkpointet nærmest target_time og integrerer bare resten. Checkpoints som passeres på veien og som ikke er lagret fra før blir lagt til.
+        Returnerer False hvis progress ber om å avbryte, ellers True
+        """
+        start_time = self.nearest(target_time) # checkpoint som integrasjonen starter fra
+        self.load(simulator, start_time) # setter tilstanden til checkpointet
+        total = abs(target_time - start_time) # hvor langt det skal integreres
+        direction = 1 if target_time >= start_time else -1 # integrerer fram eller tilbake i tid
+        n_records = len(self.records) # antall checkpoints før integrasjonen
+        try:
+            return self.integrate_segments(simulator, target_time, start_time, total, direction, progress) # integrerer checkpoint for checkpoint
+        finally:
+            if len(self.records) != n_records: # hvis nye checkpoints ble lagt til, også når bruker avbrøt
+                self.write_index() # lagrer indeksen en gang til slutt
+
+    def integrate_segments(self, simulator: Simulator, target_time: int, start_time: int, total: int, direction: int, progress: Callable[[float], bool]|None) -> bool:
+        """
+        metode som integrerer fra start_time til target_time ett checkpoint intervall om gangen og legger til nye checkpoints
+        """
+        last_report = time.perf_counter() # tidspunkt fremdrift sist ble rapportert
+        while simulator.state.time != target_time: # looper checkpoint for checkpoint
+            current = simulator.state.time # tiden vi er på
+            next_checkpoint = (current // self.interval + 1) * self.interval if direction == 1 else -((-current) // self.interval + 1) * self.interval # neste checkpoint i retningen vi integrerer
+            segment_end = next_checkpoint if direction*(target_time - next_checkpoint) >= 0 else target_time # integrerer til neste checkpoint eller til target_time hvis det kommer først
+            simulator.fast_forward(segment_end, self.accuracy, integrator=self.integrator) # integrerer segmentet. Hvert segment er så kort at fremdrift bare sjekkes mellom segmentene
+
+            slot = segment_end // self.interval # checkpoint nummer
+            if segment_end % self.interval == 0 and segment_end not in self.records and abs(slot) <= self.max_slot and direction*segment_end > 0: # nytt checkpoint lenger ut fra starttilstanden enn før
+                self.append(simulator.state) # lagrer checkpointet
+
+            if progress and time.perf_counter() - last_report > PROGRESS_INTERVAL: # rapporterer fremdrift med jevne mellomrom
+                last_report = time.perf_counter()
+                if progress(abs(simulator.state.time - start_time)/total) == False: # hvis progress ber om å avbryte
+                    return False
+        return True
@@ -1,4 +1,37 @@
 import pygame # importerer pygame for å kunne lage sprite 
+from collections import OrderedDict # importerer ordnet dict som brukes som LRU cache
+
+TEXT_CACHE_SIZE = 256 # maks antall ferdig rendrede tekster som holdes i cachen
+
+_fonts: dict[tuple, pygame.font.Font] = {} # felles font objekter etter (font_family, font_size, bold, italic)
+_rendered_text: OrderedDict[tuple, pygame.Surface] = OrderedDict() # cache med rendrede tekster etter (font, tekst, farge). Sist brukte ligger sist
+
+
+def get_font(font_family: str, font_size: int, bold: bool=False, italic: bool=False) -> pygame.font.Font:
+    """
+    funksjon som returnerer et font objekt. pygame.font.SysFont leter gjennom systemfontene hver gang, så hver kombinasjon av font, størrelse og stil lages bare en gang og deles av alle tekster
+    """
+    key = (font_family, font_size, bold, italic)
+    if key not in _fonts: # fonten er ikke laget enda
+        _fonts[key] = pygame.font.SysFont(font_family, font_size, bold=bold, italic=italic) # lager et font objekt fra system fontene
+    return _fonts[key]
+
+
+def render_text(font: pygame.font.Font, text: str, color: tuple[float]) -> pygame.Surface:
+    """
+    funksjon som returnerer en surface med teksten. Tekster som vises ofte, f.eks verdier som går fram og tilbake, hentes fra en liten LRU cache istedenfor å rendres på nytt
+    """
+    key = (font, text, tuple(color))
+    surface = _rendered_text.get(key)
+    if surface is None: # ikke rendret før
+        surface = font.render(text, False, color) # lager ny surface med text
+        _rendered_text[key] = surface
+        if len(_rendered_text) > TEXT_CACHE_SIZE: # fjerner teksten som er brukt minst nylig
+            _rendered_text.popitem(last=False)
+    else:
+        _rendered_text.move_to_end(key) # sist brukt
+    return surface
+
 
 class Image(pygame.sprite.Sprite): 
     """ 
@@ -82,8 +115,8 @@ class Text(pygame.sprite.Sprite):
         self.color = color # tekst farge
         self.pos = pos # posisjon 
         self.alignments = alignments # justeringer 
-        self.font = pygame.font.SysFont(font_family, font_size, bold=bold, italic=italic) # lager et font objekt fra system fontene 
-        self.image = self.font.render(text, False, self.color) # lager ny surface med text og setter til self.image slik at det blir tegnet når draw() blir kalt for gruppen  
+        self.font = get_font(font_family, font_size, bold, italic) # henter felles font objekt
+        self.image = render_text(self.font, text, self.color) # lager ny surface med text og setter til self.image slik at det blir tegnet når draw() blir kalt for gruppen  
         self.init_pos() # initialiserer posisjon
         
     def init_pos(self) -> None: 
@@ -110,7 +143,32 @@ class Text(pygame.sprite.Sprite):
         
     def update_text(self, text: str) -> None: 
         """
-        metode for å oppdaterer teksten som vises 
+        metode for å oppdaterer teksten som vises. Gjør ingenting hvis teksten er den samme som før
+        """
+        if text == self.text: # teksten er ikke endret, så bildet og posisjonen er de samme
+            return
+        self.text = text # ny tekst
+        self.image = render_text(self.font, text, self.color) # henter surface med text og setter til self.image slik at det blir tegnet når draw() blir kalt for gruppen  
+        self.init_pos() # oppdaterer posisjonen fordi bredde og høyde endres.
+
+class Canvas(Image):
+    """
+    klasse for en flate som man kan tegne på selv, f.eks en forhåndsvisning. Arver posisjon og justeringer fra Image klasse
+    """
+    def __init__(self, sprite_group: pygame.sprite.Group, size: tuple[int, int], pos: list[float], alignments: list[str]|None=None, color: tuple[int, int, int]=(0, 0, 0)) -> None: # constructor
+        pygame.sprite.Sprite.__init__(self, sprite_group) # initialiserer sprite klasse og legger til sprite til sprite gruppen, uten å laste inn et bilde
+        self.alignments = alignments # liste med justeringer for posisjon
+        self.pos = pos # posisjon
+        self.size = size # størrelse på flaten
+        self.color = color # bakgrunnsfarge
+        self.image = pygame.Surface(self.size) # flaten som tegnes til skjermen
+        self.image.fill(self.color)
+        self.init_pos() # initialisere posisjon
+
+    def new_image(self) -> pygame.Surface:
+        """
+        metode som lager en ny tom flate og returnerer den slik at man kan tegne på den. Det lages en ny flate istedenfor å tegne på den gamle, slik at DirtyRenderer ser at bildet er endret
         """
-        self.image = self.font.render(text, False, self.color) # lager ny surface med text og setter til self.image slik at det blir tegnet når draw() blir kalt for gruppen  
-        self.init_pos() # oppdaterer posisjonen fordi bredde og høyde endres.
\ No newline at end of file
+        self.image = pygame.Surface(self.size)
+        self.image.fill(self.color)
+        return self.image
@@ -0,0 +1,93 @@
+from typing import Callable
+import pygame # importerer pygame for å tegne til skjermen
+
+MAX_DIRTY_RECTS = 64 # maks antall endrede områder før hele skjermen tegnes på nytt istedenfor
+
+
+def sprite_items(sprite_group: pygame.sprite.Group) -> list[tuple[pygame.sprite.Sprite, pygame.Surface, pygame.Rect]]:
+    """
+    funksjon som gjør om alle spriter i gruppen til elementer (sprite, bilde, rect) som kan tegnes med DirtyRenderer
+    """
+    return [(sprite, sprite.image, sprite.rect) for sprite in sprite_group.sprites()]
+
+
+class DirtyRenderer:
+    """
+    klasse som tegner elementer til skjermen og bare oppdaterer de delene av skjermen som er endret. Husker bildet og rect til hvert element fra forrige frame, og et område blir tegnet på nytt bare hvis et element har flyttet seg, fått nytt bilde, kommet til eller blitt fjernet.
+    Hvis kameraet har flyttet seg (view_key er endret), skjermen har endret størrelse eller det er veldig mange endringer, tegnes hele skjermen på nytt
+    """
+    def __init__(self, background: pygame.Surface|tuple[int, int, int]=(0, 0, 0)) -> None: # constructor
+        self.background = background # bakgrunnsbilde eller bakgrunnsfarge
+        self.drawn: dict[object, tuple[pygame.Surface, pygame.Rect]] = {} # element -> (bilde, rect) som ble tegnet forrige frame
+        self.view_key = None # kameraet forrige frame
+        self.size = None # størrelsen på skjermen forrige frame
+        self.full_redraw = True # om hele skjermen skal tegnes neste frame
+        self.had_underlay = False # om noe ble tegnet under elementene forrige frame. Da må det fjernes fra hele skjermen
+
+    def set_background(self, background: pygame.Surface|tuple[int, int, int]) -> None:
+        """
+        metode som bytter bakgrunn, f.eks når skjermen har endret størrelse
+        """
+        self.background = background
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        metode som gjør at hele skjermen tegnes på nytt neste frame
+        """
+        self.full_redraw = True
+
+    def erase(self, surface: pygame.Surface, rect: pygame.Rect|None=None) -> None:
+        """
+        metode som tegner bakgrunnen i rect, eller på hele skjermen hvis rect er None
+        """
+        if isinstance(self.background, pygame.Surface): # bakgrunnsbilde
+            surface.blit(self.background, rect or (0, 0), rect)
+        else: # bakgrunnsfarge
+            surface.fill(self.background, rect)
+
+    def draw(self, surface: pygame.Surface, items: list[tuple[object, pygame.Surface, pygame.Rect]], view_key=None, underlay: Callable[[pygame.Surface], None]|None=None) -> None:
+        """
+        metode som tegner elementene (nøkkel, bilde, rect på skjermen) i rekkefølge og oppdaterer displayet. view_key beskriver kameraet, f.eks offset og zoom, og hvis det er endret siden forrige frame blir hele skjermen tegnet.
+        underlay er en funksjon som tegner noe mellom bakgrunnen og elementene, f.eks baner. Den kan endre hele skjermen, så da blir alt tegnet på nytt
+        """
+        current = {key: (image, rect.copy()) for key, image, rect in items} # det som skal tegnes denne framen
+        screen_rect = surface.get_rect() # hele skjermen
+        full = self.full_redraw or underlay is not None or self.had_underlay or view_key != self.view_key or screen_rect.size != self.size # tegner hele skjermen på nytt
+
+        if not full:
+            dirty = [] # områder som er endret
+            for key, (image, rect) in current.items():
+                old = self.drawn.get(key)
+                if old is None or old[0] is not image or old[1] != rect: # nytt element, nytt bilde eller flyttet
+                    dirty.append(rect)
+                    if old is not None:
+                        dirty.append(old[1])
+            for key in self.drawn.keys() - current.keys(): # elementer som er fjernet
+                dirty.append(self.drawn[key][1])
+            dirty = [rect.clip(screen_rect) for rect in dirty] # bare det som er på skjermen
+            dirty = [rect for rect in dirty if rect.width and rect.height]
+            if len(dirty) > MAX_DIRTY_RECTS: # for mange endringer, da er det raskere å tegne alt
+                full = True
+
+        if full:
+            self.erase(surface) # tegner bakgrunnen
+            if underlay is not None:
+                underlay(surface) # tegner det som skal ligge under elementene
+            surface.blits([(image, rect) for _, image, rect in items], doreturn=False) # tegner alle elementer
+            pygame.display.update() # oppdaterer hele displayet
+        elif dirty:
+            rects = [rect for _, _, rect in items] # rect til alle elementer
+            for area in dirty: # tegner hvert område på nytt
+                surface.set_clip(area) # tegner bare innenfor området
+                self.erase(surface, area)
+                for i in area.collidelistall(rects): # elementene som overlapper området, i samme rekkefølge som før
+                    surface.blit(items[i][1], rects[i])
+            surface.set_clip(None)
+            pygame.display.update(dirty) # oppdaterer bare områdene som er endret
+
+        self.drawn = current
+        self.view_key = view_key
+        self.size = screen_rect.size
+        self.full_redraw = False
+        self.had_underlay = underlay is not None
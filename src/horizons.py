@@ -0,0 +1,228 @@
+"""
+leser tabeller med tilstandsvektorer eksportert fra JPL Horizons (https://ssd.jpl.nasa.gov/horizons/app.html, Table Type = Vector Table, Coordinate Center = Solar System Barycenter), både som vanlig tekst og som csv (CSV format = YES). En fil kan ha mange legemer etter hverandre og mange tidspunkter per legeme.
+Filen leses linje for linje, og første gang en fil leses blir resultatet lagret i en binær cache ved siden av filen, slik at den leses på noen millisekunder neste gang. Tilstanden mellom to tidspunkter i tabellen blir interpolert.
+Kan også brukes fra kommandolinjen for å lage cachen og se hva en fil inneholder:
+    python3 -m src.horizons data/horizons/*.txt
+"""
+from __future__ import annotations
+import argparse # importerer bibliotek for å lese argumenter fra kommandolinjen
+import datetime # importerer bibliotek for å skrive ut datoer
+import os # importerer bibliotek for å jobbe med filer
+import re # importerer bibliotek for regulære uttrykk
+import numpy as np # importerer numpy for å holde tabellen i arrays
+from src.simulation import SystemState, SECONDS_PER_DAY, DEFAULT_DATE # importerer tilstanden tabellen brukes til å fylle
+
+CACHE_VERSION = 1 # versjon av cachen. Endres hvis formatet endres
+CACHE_SUFFIX = ".cache.npz" # cachen blir lagret ved siden av filen med denne endelsen
+JD_DEFAULT_DATE = 2459580.5 # juliansk dato for DEFAULT_DATE (1 januar 2022 kl 00:00)
+
+### Horizons id -> navn i katalogen. Legemer som ikke er her får navnet fra Horizons
+HORIZONS_NAMES = {
+    10: "Sola", 199: "Merkur", 299: "Venus", 399: "Jorda", 499: "Mars", 599: "Jupiter", 699: "Saturn", 799: "Uranus", 899: "Neptun",
+    301: "Månen", 501: "Io", 502: "Europa", 503: "Ganymedes", 504: "Callisto", 605: "Rhea", 606: "Titan", 608: "Iapetus", 703: "Titania", 704: "Oberon", 801: "Triton",
+}
+
+### enhetene Horizons kan skrive ut -> (meter per lengdeenhet, sekunder per tidsenhet)
+UNITS = {
+    "KM-S": (1000.0, 1.0),
+    "KM-D": (1000.0, SECONDS_PER_DAY),
+    "AU-D": (1.495978707e11, SECONDS_PER_DAY),
+}
+
+TARGET_PATTERN = re.compile(r"Target body name:\s*(.*?)\s*\((-?\d+)\)") # navn og id til legemet
+CENTER_PATTERN = re.compile(r"Center body name:\s*(.*?)\s*\((-?\d+)\)") # navn og id til origo
+UNITS_PATTERN = re.compile(r"Output units\s*:\s*([A-Z]+-[A-Z]+)") # enheter
+VALUE_PATTERN = re.compile(r"\b(X|Y|Z|VX|VY|VZ)\s*=\s*(\S+)") # verdier i tekstformatet, f.eks "X =-2.741147560901964E+07"
+
+
+class HorizonsTable:
+    """
+    klasse som holder tilstandsvektorene fra en eller flere Horizons tabeller. Hvert legeme har sine egne tidspunkter (simuleringstid i sekunder fra DEFAULT_DATE) og et (tidspunkter, 4) array med x, y, v_x og v_y i SI-enheter
+    """
+    def __init__(self, names: list[str], times: list[np.ndarray], states: list[np.ndarray]) -> None: # constructor
+        self.names = names # navn til legemene
+        self.times = times # tidspunktene til hvert legeme, sortert
+        self.states = states # x, y, v_x og v_y ved hvert tidspunkt for hvert legeme
+        self.index = {name: i for i, name in enumerate(names)} # navn -> indeks
+
+    def __len__(self) -> int:
+        return len(self.names) # antall legemer
+
+    def extend(self, other: HorizonsTable) -> None:
+        """
+        metode som legger til legemene i other. Et legeme som allerede finnes blir byttet ut
+        """
+        for name, times, states in zip(other.names, other.times, other.states):
+            if name in self.index:
+                self.times[self.index[name]], self.states[self.index[name]] = times, states
+            else:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+                self.times.append(times)
+                self.states.append(states)
+
+    def span(self, names: list[str]|None=None) -> tuple[float, float]:
+        """
+        metode som returnerer første og siste tid som alle legemene i names (standard alle) har tabulert
+        """
+        rows = [self.index[name] for name in names] if names is not None else range(len(self))
+        return max(self.times[i][0] for i in rows), min(self.times[i][-1] for i in rows)
+
+    def nearest_epoch(self, time: float, names: list[str]|None=None) -> float|None:
+        """
+        metode som returnerer tidspunktet i tabellen nærmest time der alle legemene i names (standard alle) er tabulert, eller None hvis det ikke finnes
+        """
+        rows = [self.index[name] for name in names] if names is not None else list(range(len(self)))
+        if not rows:
+            return None
+        epochs = self.times[rows[0]]
+        for i in rows[1:]: # tidspunkter som alle legemene har
+            epochs = np.intersect1d(epochs, self.times[i], assume_unique=True)
+        if len(epochs) == 0:
+            return None
+        return float(epochs[np.argmin(np.abs(epochs - time))])
+
+    def vectors_at(self, name: str, time: float) -> np.ndarray:
+        """
+        metode som returnerer x, y, v_x og v_y for legemet ved time. Mellom to tidspunkter i tabellen brukes kubisk Hermite interpolasjon med posisjonene og fartsvektorene i begge ender, slik at både posisjon og fart blir kontinuerlige.
+        Gir ValueError hvis time er utenfor tabellen
+        """
+        times, states = self.times[self.index[name]], self.states[self.index[name]]
+        if not times[0] <= time <= times[-1]:
+            raise ValueError(f"{name} er ikke tabulert ved tid {time}")
+        k = min(int(np.searchsorted(times, time, side="right")) - 1, len(times) - 2) # tidspunktet før time
+        if k < 0 or times[k] == time: # time er et tidspunkt i tabellen
+            return states[max(k, 0)].copy()
+        h = times[k + 1] - times[k] # avstand mellom tidspunktene
+        s = (time - times[k]) / h # hvor langt mellom tidspunktene
+        p0, v0, p1, v1 = states[k, 0:2], states[k, 2:4], states[k + 1, 0:2], states[k + 1, 2:4]
+        pos = (2*s**3 - 3*s**2 + 1)*p0 + (s**3 - 2*s**2 + s)*h*v0 + (3*s**2 - 2*s**3)*p1 + (s**3 - s**2)*h*v1
+        vel = (6*s**2 - 6*s)/h*p0 + (3*s**2 - 4*s + 1)*v0 + (6*s - 6*s**2)/h*p1 + (3*s**2 - 2*s)*v1 # den deriverte av posisjonen
+        return np.concatenate((pos, vel))
+
+    def fill_state(self, state: SystemState, time: float, fallback: SystemState|None=None) -> bool:
+        """
+        metode som setter posisjonene og fartsvektorene i state til verdiene fra tabellen ved time, og setter state.time til time. Legemer uten masse som ikke er i tabellen får verdiene fra fallback, f.eks en Kepler forhåndsvisning.
+        Returnerer False og endrer ingenting hvis et legeme med masse mangler i tabellen eller ikke er tabulert ved time
+        """
+        found = np.array([name in self.index for name in state.names], dtype=bool) # legemer som er i tabellen
+        if np.any(~found & (state.mass > 0)) or (not found.all() and fallback is None) or not found.any():
+            return False
+        rows = np.flatnonzero(found)
+        start, end = self.span([state.names[i] for i in rows])
+        if not start <= time <= end:
+            return False
+        for i in rows:
+            vectors = self.vectors_at(state.names[i], time)
+            state.pos[i], state.vel[i] = vectors[0:2], vectors[2:4]
+        if fallback is not None: # legemer uten masse som ikke er i tabellen
+            state.pos[~found], state.vel[~found] = fallback.pos[~found], fallback.vel[~found]
+        state.time = time
+        return True
+
+
+def parse_horizons(path: str) -> HorizonsTable:
+    """
+    funksjon som leser en Horizons tabell linje for linje. Filen kan ha flere legemer etter hverandre, hvert med sin egen header og sine data mellom $$SOE og $$EOE.
+    Gir ValueError hvis origo ikke er solsystemets barycenter, slik som startverdiene i katalogen, eller hvis enhetene er ukjente
+    """
+    names, times, states = [], [], []
+    name, meters, seconds, columns = None, 1000.0, 1.0, None # legemet, enhetene og csv kolonnene til blokken som leses
+    in_data = False # om vi er mellom $$SOE og $$EOE
+    rows, row = [], {} # tilstandene i blokken, og verdiene til tidspunktet som leses i tekstformatet
+
+    with open(path) as f:
+        for line in f:
+            if not in_data:
+                if match := TARGET_PATTERN.search(line): # nytt legeme
+                    name = HORIZONS_NAMES.get(int(match.group(2)), match.group(1))
+                elif match := CENTER_PATTERN.search(line):
+                    if int(match.group(2)) != 0:
+                        raise ValueError(f"{path}: origo er {match.group(1)}, men tabellen må være relativ til solsystemets barycenter (@0)")
+                elif match := UNITS_PATTERN.search(line):
+                    if match.group(1) not in UNITS:
+                        raise ValueError(f"{path}: ukjente enheter {match.group(1)}")
+                    meters, seconds = UNITS[match.group(1)]
+                elif "JDTDB" in line and "," in line: # kolonnenavn i csv formatet
+                    columns = [column.strip() for column in line.split(",")]
+                elif line.startswith("$$SOE"): # data starter
+                    if name is None:
+                        raise ValueError(f"{path}: fant data uten navn på legemet")
+                    in_data, rows, row = True, [], {}
+                continue
+
+            if line.startswith("$$EOE"): # data slutter
+                data = np.array(rows, dtype=np.float64).reshape(-1, 5) # tid, x, y, v_x og v_y
+                data = data[np.argsort(data[:, 0], kind="stable")]
+                names.append(name)
+                times.append((data[:, 0] - JD_DEFAULT_DATE) * SECONDS_PER_DAY) # juliansk dato -> simuleringstid
+                states.append(np.column_stack((data[:, 1:3] * meters, data[:, 3:5] * meters / seconds)))
+                in_data, name, columns = False, None, None
+            elif columns: # csv: en linje per tidspunkt
+                fields = line.split(",")
+                if len(fields) >= len(columns) - 1:
+                    rows.append((fields[columns.index("JDTDB")], *(fields[columns.index(c)] for c in ("X", "Y", "VX", "VY"))))
+            elif line.lstrip()[:1].isdigit(): # tekst: linjen med tidspunktet, f.eks "2459580.500000000 = A.D. 2022-Jan-01 ..."
+                row = {"JD": line.split("=", 1)[0]}
+            else: # tekst: linjer med verdier
+                row.update(VALUE_PATTERN.findall(line))
+                if "VY" in row and "JD" in row: # alle verdiene til tidspunktet er lest
+                    rows.append((row["JD"], row["X"], row["Y"], row["VX"], row["VY"]))
+                    row = {}
+    return HorizonsTable(names, times, states)
+
+
+def load_horizons(path: str) -> HorizonsTable:
+    """
+    funksjon som leser en Horizons tabell fra cachen hvis den finnes og er laget fra samme versjon av filen, og ellers leser filen og lager cachen
+    """
+    stat = os.stat(path)
+    signature = np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64) # hvis filen endres blir cachen laget på nytt
+    cache_path = path + CACHE_SUFFIX
+    try:
+        with np.load(cache_path) as cache:
+            if np.array_equal(cache["signature"], signature):
+                offsets = cache["offsets"] # hvor hvert legeme starter i arrayene
+                times, states = cache["times"], cache["states"]
+                return HorizonsTable(cache["names"].tolist(), [times[a:b] for a, b in zip(offsets[:-1], offsets[1:])], [states[a:b] for a, b in zip(offsets[:-1], offsets[1:])])
+    except (FileNotFoundError, KeyError, ValueError, OSError): # cachen finnes ikke eller er ødelagt
+        pass
+    table = parse_horizons(path)
+    offsets = np.cumsum([0, *(len(times) for times in table.times)])
+    tmp_path = cache_path + ".tmp.npz" # skriver til en midlertidig fil og bytter navn, slik at cachen aldri blir halvveis skrevet
+    np.savez(tmp_path, signature=signature, names=np.array(table.names), offsets=offsets, times=np.concatenate(table.times) if table.names else np.zeros(0), states=np.concatenate(table.states) if table.names else np.zeros((0, 4)))
+    os.replace(tmp_path, cache_path)
+    return table
+
+
+def load_horizons_files(paths: list[str]) -> HorizonsTable:
+    """
+    funksjon som leser flere Horizons tabeller og slår dem sammen. En mappe blir gjort om til alle .txt og .csv filene i mappen
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith((".txt", ".csv")))
+        else:
+            files.append(path)
+    table = HorizonsTable([], [], [])
+    for path in files:
+        table.extend(load_horizons(path))
+    return table
+
+
+def main() -> None:
+    """
+    funksjon som leser Horizons tabeller, lager cachen og skriver ut hvilke legemer og tidspunkter som er med
+    """
+    parser = argparse.ArgumentParser(description="leser Horizons tabeller med tilstandsvektorer og lager binær cache")
+    parser.add_argument("paths", nargs="+", help="filer eller mapper med Horizons tabeller")
+    args = parser.parse_args()
+    table = load_horizons_files(args.paths)
+    date = lambda t: DEFAULT_DATE + datetime.timedelta(seconds=float(t)) # simuleringstid -> dato
+    for name, times in zip(table.names, table.times):
+        print(f"{name:<16}{len(times):>8} tidspunkter  {date(times[0])} til {date(times[-1])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+from abc import ABC, abstractmethod # importerer bibliotek for å lage en abstrakt klasse
+import numpy as np # importerer numpy for å regne med hele arrays av posisjoner og fartsvektorer
+from src.physics import GRAV_CONST, compute_field_jerks # importerer gravitasjonskonstanten og funksjon som regner ut akselerasjon og jerk
+
+BLOCK_ETA_PER_ACCURACY = 0.2 # eta i Aarseth kriteriet per nøyaktighetsmål. Feilen går som eta^2 for block_hermite og som accuracy^2 for leapfrog, så eta = 0.2*accuracy gir omtrent samme feil som leapfrog for alle nøyaktighetsmål
+BLOCK_ETA = 0.004 # standard nøyaktighetsmål for block_hermite, tilsvarer nøyaktighetsmålet 0.02. Mindre verdi gir kortere tidssteg for hvert legeme
+BLOCK_MAX_LEVEL = 24 # største antall halveringer av tidssteget, altså minste delsteg dt/2^24
+
+
+class Integrator(ABC):
+    """
+    abstrakt klasse som alle integratorer arver fra. En integrator flytter tilstanden til simulatoren ett tidssteg dt fram (eller tilbake hvis dt er negativ). Simulatoren oppdaterer klokken, integratoren endrer bare posisjoner, fartsvektorer og akselerasjoner
+    """
+    name = "" # navnet som integratoren velges med
+    force_evaluations = 1 # antall ganger akselerasjonen regnes ut per steg
+    timestep_factor = 1 # hvor mye større tidssteg integratoren tåler enn leapfrog for omtrent samme nøyaktighet. Brukes når tidssteget velges ut fra et nøyaktighetsmål
+    individual_timesteps = False # True hvis integratoren deler opp steget selv for hvert legeme. Da kan dt være så lang som det tregeste legemet tåler
+
+    def set_accuracy(self, accuracy: float) -> None:
+        """
+        metode som tilpasser integratoren til et nøyaktighetsmål. De fleste integratorene får nøyaktigheten bare gjennom tidssteget, og gjør ingenting her
+        """
+
+    @abstractmethod
+    def step(self, simulator, dt: float) -> None:
+        """
+        metode som flytter tilstanden til simulatoren ett steg dt. Må lages i hver integrator
+        """
+
+
+class SemiImplicitEuler(Integrator):
+    """
+    semi-implisitt Euler: først akselerasjon, så fartsvektor og til slutt posisjon. Første ordens nøyaktig og symplektisk. Dette er integratoren simuleringen alltid har brukt
+    """
+    name = "euler"
+
+    def step(self, simulator, dt: float) -> None:
+        state = simulator.state
+        simulator.update_aks() # regner ut akselerasjonene
+        state.vel += state.acc*dt # oppdaterer fartsvektorene ut fra akselerasjon og tidsendring
+        state.pos += state.vel*dt # oppdaterer posisjonene ut fra fartsvektor og tidsendring
+
+
+class Leapfrog(Integrator):
+    """
+    leapfrog (drift-kick-drift), som er samme metode som velocity Verlet. Andre ordens nøyaktig og symplektisk, med bare en utregning av akselerasjonen per steg
+    """
+    name = "leapfrog"
+
+    def step(self, simulator, dt: float) -> None:
+        state = simulator.state
+        state.pos += state.vel*(dt/2) # halv drift
+        simulator.update_aks() # akselerasjon midt i steget
+        state.vel += state.acc*dt # kick
+        state.pos += state.vel*(dt/2) # halv drift
+
+
+class Yoshida4(Integrator):
+    """
+    fjerde ordens symplektisk integrator av Yoshida. Består av tre leapfrog steg med vekter som gjør at feilene opp til tredje orden kansellerer hverandre
+    """
+    name = "yoshida4"
+    force_evaluations = 3
+    timestep_factor = 4
+    W1 = 1 / (2 - 2**(1/3)) # vekt for første og siste leapfrog steg
+    W0 = -2**(1/3) / (2 - 2**(1/3)) # vekt for midterste leapfrog steg (negativ)
+    DRIFT = (W1/2, (W0 + W1)/2, (W0 + W1)/2, W1/2) # koeffisienter for drift
+    KICK = (W1, W0, W1) # koeffisienter for kick
+
+    def step(self, simulator, dt: float) -> None:
+        state = simulator.state
+        for i in range(3): # tre drift-kick par
+            state.pos += state.vel*(self.DRIFT[i]*dt) # drift
+            simulator.update_aks() # akselerasjon
+            state.vel += state.acc*(self.KICK[i]*dt) # kick
+        state.pos += state.vel*(self.DRIFT[3]*dt) # siste drift
+
+
+def _stumpff(z: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    funksjon som regner ut Stumpff funksjonene C(z) og S(z) som brukes i Kepler løsningen med universelle variabler. Bruker rekkeutvikling når z er nær 0
+    """
+    c = np.empty_like(z)
+    s = np.empty_like(z)
+    small = np.abs(z) < 1e-6 # nær 0 gir kansellering, bruk rekke
+    pos = (z > 0) & ~small # elliptisk
+    neg = (z < 0) & ~small # hyperbolsk
+    sz = np.sqrt(z[pos])
+    c[pos] = (1 - np.cos(sz)) / z[pos]
+    s[pos] = (sz - np.sin(sz)) / sz**3
+    sz = np.sqrt(-z[neg])
+    c[neg] = (np.cosh(sz) - 1) / -z[neg]
+    s[neg] = (np.sinh(sz) - sz) / sz**3
+    zs = z[small]
+    c[small] = 1/2 - zs/24 + zs**2/720
+    s[small] = 1/6 - zs/120 + zs**2/5040
+    return c, s
+
+
+def kepler_drift(pos: np.ndarray, vel: np.ndarray, mu: float|np.ndarray, dt: float|np.ndarray) -> None:
+    """
+    funksjon som flytter alle legemene langs sin egen Kepler bane rundt et punkt med gravitasjonsparameter mu (G*M) i tiden dt. pos og vel er relative til sentralmassen og blir endret direkte. dt kan også være et array med en egen tid for hvert legeme.
+    Løser Keplers ligning med universelle variabler og Newton iterasjon for alle legemene samtidig, og fungerer både for elliptiske og hyperbolske baner
+    """
+    mu = np.broadcast_to(np.asarray(mu, dtype=np.float64), (len(pos),))
+    r0 = np.hypot(pos[:, 0], pos[:, 1]) # avstand
+    v2 = np.einsum("ij,ij->i", vel, vel) # fart i andre
+    rv = np.einsum("ij,ij->i", pos, vel) # r*v
+    sqrt_mu = np.sqrt(mu)
+    alpha = 2/r0 - v2/mu # 1/a, positiv for elliptiske baner
+    chi = np.where(alpha > 0, sqrt_mu*alpha*dt, sqrt_mu*dt/r0) # startgjett for universell anomali
+
+    for _ in range(50): # Newton iterasjon
+        z = alpha*chi**2
+        c, s = _stumpff(z)
+        chi2 = chi**2
+        f = rv/sqrt_mu*chi2*c + (1 - alpha*r0)*chi**3*s + r0*chi - sqrt_mu*dt # Keplers ligning
+        df = rv/sqrt_mu*chi*(1 - z*s) + (1 - alpha*r0)*chi2*c + r0 # den deriverte, som også er r
+        delta = f/df
+        chi -= delta
+        if np.all(np.abs(delta) <= 1e-14*np.maximum(np.abs(chi), 1e-300)): # alle har konvergert
+            break
+
+    z = alpha*chi**2
+    c, s = _stumpff(z)
+    chi2 = chi**2
+    f = 1 - chi2/r0*c # Lagrange koeffisienter
+    g = dt - chi**3/sqrt_mu*s
+    new_pos = f[:, None]*pos + g[:, None]*vel
+    r = np.hypot(new_pos[:, 0], new_pos[:, 1])
+    fdot = sqrt_mu/(r*r0)*(z*s - 1)*chi
+    gdot = 1 - chi2/r*c
+    vel[:] = fdot[:, None]*pos + gdot[:, None]*vel
+    pos[:] = new_pos
+
+
+class WisdomHolman(Integrator):
+    """
+    Wisdom-Holman integrator i demokratiske heliosentriske koordinater. Bevegelsen deles opp i en Kepler bane rundt det tyngste legemet (som løses eksakt), et kick fra gravitasjonen mellom de andre legemene og en drift fra bevegelsen til sentralmassen.
+    Siden Kepler delen løses eksakt, kan tidssteget være mye større enn for de andre integratorene så lenge planetene er mye lettere enn sola
+    """
+    name = "wisdom_holman"
+    timestep_factor = 10
+
+    def step(self, simulator, dt: float) -> None:
+        state = simulator.state
+        mass = state.mass
+        central = int(np.argmax(mass)) # det tyngste legemet er sentralmassen
+        others = np.flatnonzero(np.arange(len(mass)) != central) # alle andre legemer
+        m0 = mass[central]
+        m = mass[others]
+        total = mass.sum()
+
+        ### fra barysentriske til demokratiske heliosentriske koordinater
+        x_cm = (mass[:, None]*state.pos).sum(axis=0) / total # massesenter
+        v_cm = (mass[:, None]*state.vel).sum(axis=0) / total # fart til massesenteret
+        q = state.pos[others] - state.pos[central] # posisjon relativt til sentralmassen
+        p = state.vel[others] - v_cm # barysentrisk fart
+
+        self.kick(simulator, q, p, m, dt/2) # halvt kick fra de andre legemene
+        q += (m[:, None]*p).sum(axis=0) / m0 * (dt/2) # halv drift fra sentralmassen
+        kepler_drift(q, p, GRAV_CONST*m0, dt) # Kepler bane rundt sentralmassen
+        q += (m[:, None]*p).sum(axis=0) / m0 * (dt/2) # halv drift fra sentralmassen
+        self.kick(simulator, q, p, m, dt/2) # halvt kick fra de andre legemene
+
+        ### tilbake til barysentriske koordinater
+        x_cm = x_cm + v_cm*dt # massesenteret beveger seg rett fram
+        x0 = x_cm - (m[:, None]*q).sum(axis=0) / total
+        state.pos[central] = x0
+        state.pos[others] = q + x0
+        state.vel[central] = v_cm - (m[:, None]*p).sum(axis=0) / m0
+        state.vel[others] = p + v_cm
+        simulator.update_aks() # akselerasjonene i ny posisjon, slik at de kan vises
+
+    @staticmethod
+    def kick(simulator, q: np.ndarray, p: np.ndarray, m: np.ndarray, dt: float) -> None:
+        """
+        metode som oppdaterer fartsvektorene ut fra gravitasjonen mellom legemene som ikke er sentralmassen
+        """
+        p += simulator.accelerations(q, m) * dt
+
+
+class RK45(Integrator):
+    """
+    adaptiv Runge-Kutta (Dormand-Prince 5(4)). Integrerer hvert steg dt med så mange mindre delsteg som trengs for at den estimerte feilen skal være under toleransen. Ikke symplektisk, men nøyaktigheten styres direkte av tol
+    """
+    name = "rk45"
+    force_evaluations = 6
+    timestep_factor = 20 # delstegene velges ut fra toleransen, tidssteget er bare hvor ofte integratoren stopper
+    A = ( # koeffisienter
+        (),
+        (1/5,),
+        (3/40, 9/40),
+        (44/45, -56/15, 32/9),
+        (19372/6561, -25360/2187, 64448/6561, -212/729),
+        (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+        (35/384, 0, 500/1113, 125/192, -2187/6784, 11/84),
+    )
+    B5 = (35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0) # femte ordens vekter
+    B4 = (5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40) # fjerde ordens vekter for feilestimat
+
+    def __init__(self, tol: float=1e-10) -> None: # constructor
+        self.tol = tol # relativ toleranse per steg
+        self.h = None # siste delsteg, brukes som startgjett for neste steg
+
+    def derivative(self, simulator, pos: np.ndarray, vel: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        metode som returnerer den deriverte av tilstanden: (fart, akselerasjon)
+        """
+        return vel, simulator.accelerations(pos, simulator.state.mass)
+
+    def step(self, simulator, dt: float) -> None:
+        state = simulator.state
+        remaining = dt # tid som gjenstår av steget
+        h = dt if self.h is None or np.sign(self.h) != np.sign(dt) else self.h # delsteg
+        pos_scale = self.tol * np.sqrt(np.mean(state.pos**2)) + 1e-300 # skala for feil i posisjon
+        vel_scale = self.tol * np.sqrt(np.mean(state.vel**2)) + 1e-300 # skala for feil i fart
+
+        while remaining != 0:
+            if abs(h) >= abs(remaining): # siste delsteg treffer slutten av steget
+                h = remaining
+            k_pos, k_vel = [], [] # de deriverte i hvert trinn
+            for stage in range(7):
+                p = state.pos + sum((a*h)*kp for a, kp in zip(self.A[stage], k_pos) if a) if stage else state.pos
+                v = state.vel + sum((a*h)*kv for a, kv in zip(self.A[stage], k_vel) if a) if stage else state.vel
+                dp, dv = self.derivative(simulator, p, v)
+                k_pos.append(dp)
+                k_vel.append(dv)
+            new_pos = state.pos + h*sum(b*kp for b, kp in zip(self.B5, k_pos) if b)
+            new_vel = state.vel + h*sum(b*kv for b, kv in zip(self.B5, k_vel) if b)
+            err_pos = h*sum((b5 - b4)*kp for b5, b4, kp in zip(self.B5, self.B4, k_pos))
+            err_vel = h*sum((b5 - b4)*kv for b5, b4, kv in zip(self.B5, self.B4, k_vel))
+            err = max(np.abs(err_pos).max()/pos_scale, np.abs(err_vel).max()/vel_scale) # feil i forhold til toleransen
+
+            if not np.isfinite(err): # f.eks legemer i samme posisjon uten softening. Delsteget kan aldri godtas, så NaN blir ført videre som i de andre integratorene
+                state.pos[:] = new_pos
+                state.vel[:] = new_vel
+                state.acc[:] = k_vel[6]
+                break
+            if err <= 1: # delsteget er godtatt
+                state.pos[:] = new_pos
+                state.vel[:] = new_vel
+                state.acc[:] = k_vel[6] # akselerasjonen i ny posisjon (siste trinn er i ny posisjon)
+                remaining -= h
+                if remaining != 0 or self.h is None:
+                    self.h = h
+            h = h * min(5.0, max(0.2, 0.9 * err**-0.2)) if err > 0 else h * 5 # nytt delsteg ut fra feilen
+
+
+class BlockHermite(Integrator):
+    """
+    fjerde ordens Hermite integrator med individuelle tidssteg i blokker. Hvert legeme får sitt eget tidssteg dt/2^nivå ut fra sin egen akselerasjon og de deriverte av den (Aarseth kriteriet), slik at Merkur kan ta mange små steg mens Neptun tar ett steg.
+    I hvert delsteg blir alle legemene med masse predikert fram til samme tid, og akselerasjon og jerk regnes bare ut for legemene som tar et steg. Et legeme kan få kortere tidssteg når som helst, men bare lengre når tiden passer med det lengre steget, slik at alle er synkronisert igjen ved slutten av dt.
+    Etter hvert steg har alle legemene posisjon og fart ved samme tid, så tilstanden kan tegnes og lagres som vanlig. Regner alltid ut kreftene med direkte summering.
+    Lønner seg når mange legemer kan ta lange steg, f.eks belter med testpartikler. Med bare solsystemet er det lite å spare, og yoshida4 er som regel raskest ved samme nøyaktighet (se python3 -m benchmarks.integrators --check)
+    """
+    name = "block_hermite"
+    timestep_factor = 1
+    individual_timesteps = True
+
+    def __init__(self, eta: float=BLOCK_ETA) -> None: # constructor
+        self.eta = eta # nøyaktighetsmål for tidssteget til hvert legeme
+        self.jerk = None # jerk til alle legemene ved slutten av forrige steg
+        self.step_size = None # tidssteget hvert legeme ønsker i sekunder, fra siste korreksjon
+        self.synced = None # posisjoner og fartsvektorer ved slutten av forrige steg. Hvis tilstanden er endret utenfra, må akselerasjon og jerk regnes ut på nytt
+        self.body_steps = 0 # antall steg tatt av enkeltlegemer, for å måle hvor mye arbeid blokkstegene sparer
+
+    def set_accuracy(self, accuracy: float) -> None:
+        """
+        metode som velger eta ut fra nøyaktighetsmålet, slik at feilen blir omtrent som for leapfrog med samme nøyaktighetsmål
+        """
+        self.eta = accuracy * BLOCK_ETA_PER_ACCURACY
+
+    def initial_step_size(self, acc: np.ndarray, jerk: np.ndarray) -> np.ndarray:
+        """
+        metode som returnerer tidssteget hvert legeme ønsker når bare akselerasjon og jerk er kjent: en forsiktig andel av |a|/|jerk|
+        """
+        a = np.hypot(acc[:, 0], acc[:, 1])
+        j = np.hypot(jerk[:, 0], jerk[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(j > 0, 0.5 * np.sqrt(self.eta) * a / j, np.inf) # uten jerk er det ingen grense
+
+    def step_size_from_derivatives(self, acc: np.ndarray, jerk: np.ndarray, snap: np.ndarray, crackle: np.ndarray) -> np.ndarray:
+        """
+        metode som returnerer tidssteget hvert legeme ønsker ut fra akselerasjonen og de tre neste deriverte (Aarseth kriteriet). Er mer robust enn |a|/|jerk| alene, som blir alt for langt når jerk er nær 0
+        """
+        norm = lambda v: np.hypot(v[:, 0], v[:, 1])
+        a, j, s, c = norm(acc), norm(jerk), norm(snap), norm(crackle)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(j*c + s*s > 0, np.sqrt(self.eta * (a*s + j*j) / (j*c + s*s)), np.inf)
+
+    def levels(self, step_size: np.ndarray, dt: float) -> np.ndarray:
+        """
+        metode som returnerer nivået til hvert legeme, altså hvor mange ganger dt må halveres for at tidssteget skal bli kortere enn step_size
+        """
+        with np.errstate(divide="ignore"):
+            ratio = np.abs(dt) / step_size # hvor mange ganger for langt dt er
+        return np.clip(np.ceil(np.log2(np.maximum(ratio, 1.0))), 0, BLOCK_MAX_LEVEL).astype(np.int64)
+
+    def predict(self, state, index, t: np.ndarray, t_next: float, dt: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        metode som returnerer posisjonene og fartsvektorene til legemene index predikert fra tiden deres t fram til t_next med Taylor rekke i akselerasjon og jerk
+        """
+        tau = ((t_next - t[index]) * dt)[:, None] # tid fra hvert legeme sin tid fram til t_next
+        acc, jerk = state.acc[index], self.jerk[index]
+        return state.pos[index] + state.vel[index]*tau + acc*(tau**2/2) + jerk*(tau**3/6), state.vel[index] + acc*tau + jerk*(tau**2/2)
+
+    def step(self, simulator, dt: float) -> None:
+        state = simulator.state
+        pos, vel, acc = state.pos, state.vel, state.acc
+        n = len(state)
+        sources = np.flatnonzero(state.mass > 0) # legemer som trekker på de andre
+        source_mass = state.mass[sources]
+        source_slot = np.full(n, -1) # indeksen til hvert legeme blant kildene, -1 for testpartikler
+        source_slot[sources] = np.arange(len(sources))
+        if len(sources) == n: # ingen testpartikler, bruker slice slik at arrayene ikke kopieres
+            sources = slice(None)
+        if self.synced is None or self.synced[0].shape != pos.shape or not (np.array_equal(self.synced[0], pos) and np.array_equal(self.synced[1], vel)): # tilstanden er ny eller endret
+            acc[:], self.jerk = compute_field_jerks(pos, vel, pos[sources], vel[sources], source_mass, simulator.softening)
+            self.step_size = self.initial_step_size(acc, self.jerk)
+        jerk, step_size = self.jerk, self.step_size
+        level = self.levels(step_size, dt) # nivået til hvert legeme
+        t = np.zeros(n) # tiden til hvert legeme som andel av dt. Alle tider er summer av potenser av 2 og blir derfor eksakte
+
+        while True:
+            h = np.ldexp(1.0, -level) # tidssteget til hvert legeme som andel av dt
+            t_end = t + h
+            t_next = t_end.min() # neste tid der noen legemer skal ta steg
+            active = np.flatnonzero(t_end == t_next) # legemene som tar steg nå
+            source_pos, source_vel = self.predict(state, sources, t, t_next, dt) # alle kildene predikert fram til t_next
+            slot = source_slot[active]
+            if slot.min() >= 0: # bare legemer med masse tar steg, de er allerede predikert
+                active_pos, active_vel = source_pos[slot], source_vel[slot]
+            else: # testpartiklene som tar steg må predikeres for seg
+                active_pos, active_vel = self.predict(state, active, t, t_next, dt)
+            new_acc, new_jerk = compute_field_jerks(active_pos, active_vel, source_pos, source_vel, source_mass, simulator.softening)
+
+            ### Hermite korreksjon for legemene som tar steg
+            step = (h[active] * dt)[:, None] # tidssteget i sekunder
+            a0, j0, v0 = acc[active], jerk[active], vel[active]
+            new_vel = v0 + (a0 + new_acc)*(step/2) + (j0 - new_jerk)*(step**2/12)
+            pos[active] += (v0 + new_vel)*(step/2) + (a0 - new_acc)*(step**2/12)
+            vel[active] = new_vel
+            acc[active], jerk[active] = new_acc, new_jerk
+            t[active] = t_next
+            self.body_steps += len(active)
+
+            ### snap og crackle fra Hermite interpolasjon gir nytt ønsket tidssteg
+            crackle = (12*(a0 - new_acc) + 6*step*(j0 + new_jerk)) / step**3 # tredje deriverte av akselerasjonen
+            snap = (-6*(a0 - new_acc) - step*(4*j0 + 2*new_jerk)) / step**2 + step*crackle # andre deriverte ved slutten av steget
+            step_size[active] = self.step_size_from_derivatives(new_acc, new_jerk, snap, crackle)
+            if t_next >= 1.0: # alle legemene har kommet til slutten av dt
+                break
+
+            ### nye nivåer: kortere steg med en gang, lengre steg bare når tiden passer med det lengre steget
+            wanted = self.levels(step_size[active], dt)
+            current = level[active]
+            coarser = (wanted < current) & (np.mod(t_next, np.ldexp(2.0, -current)) == 0) # tiden passer med et dobbelt så langt steg
+            level[active] = np.where(wanted > current, wanted, current - coarser)
+        self.synced = (pos.copy(), vel.copy())
+
+INTEGRATORS = {cls.name: cls for cls in (SemiImplicitEuler, Leapfrog, Yoshida4, WisdomHolman, RK45, BlockHermite)} # alle integratorer etter navn
+
+
+def get_integrator(name: str, **options) -> Integrator:
+    """
+    funksjon som lager en integrator ut fra navnet. options blir sendt videre til integratoren, f.eks tol for rk45
+    """
+    if name not in INTEGRATORS:
+        raise ValueError(f"ukjent integrator {name}, velg en av {', '.join(INTEGRATORS)}")
+    return INTEGRATORS[name](**options)
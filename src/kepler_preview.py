@@ -0,0 +1,80 @@
+from __future__ import annotations
+import numpy as np # importerer numpy for å regne ut banene til alle legemene samtidig
+from src.physics import GRAV_CONST # importerer gravitasjonskonstanten
+from src.integrators import kepler_drift # importerer Kepler løsningen med universelle variabler
+from src.simulation import SystemState # importerer tilstanden forhåndsvisningen lages fra
+
+
+class KeplerPreview:
+    """
+    klasse som regner ut omtrentlige posisjoner for alle legemer ved en vilkårlig tid uten å integrere. Hvert legeme følger sin egen Kepler bane rundt det tyngste legemet (sola). For planeter med måner er det massesenteret til systemet som går rundt sola, og hver måne følger sin egen Kepler bane rundt planeten.
+    Kostnaden er O(N) per tidspunkt uansett hvor langt fra starttilstanden tiden er, så den brukes for å vise en forhåndsvisning mens man velger dato. Forstyrrelsene mellom planetene er ikke med, så posisjonene blir mindre nøyaktige jo lenger unna starttilstanden man kommer
+    """
+    def __init__(self, state: SystemState, satellites: list[np.ndarray]|None=None) -> None: # constructor
+        self.state = state.copy() # starttilstanden
+        self.central = int(np.argmax(state.mass)) # sola
+        self.groups = [np.asarray(group) for group in satellites or []] # planet og måner i hvert satellittsystem
+        self.parent = np.full(len(state), self.central) # legemet hvert legeme går i bane rundt
+        for group in self.groups: # måner går i bane rundt planeten sin
+            self.parent[group[1:]] = group[0]
+        self.parent[self.central] = -1 # sola går ikke i bane rundt noe
+        self.planets = np.flatnonzero(self.parent == self.central) # legemer som går rundt sola
+        self.moons = np.flatnonzero((self.parent != self.central) & (self.parent >= 0)) # legemer som går rundt en planet
+        self.mu = GRAV_CONST * (state.mass[np.maximum(self.parent, 0)] + state.mass) # gravitasjonsparameter for hver bane (G*(M + m))
+        self.mu[self.central] = 0.0
+        self.rel_pos = state.pos - state.pos[np.maximum(self.parent, 0)] # posisjon relativt til sentralmassen
+        self.rel_vel = state.vel - state.vel[np.maximum(self.parent, 0)] # fart relativt til sentralmassen
+        for group in self.groups: # planeter med måner: massesenteret til systemet går rundt sola
+            mass = state.mass[group]
+            self.rel_pos[group[0]] = mass @ state.pos[group] / mass.sum() - state.pos[self.central]
+            self.rel_vel[group[0]] = mass @ state.vel[group] / mass.sum() - state.vel[self.central]
+            self.mu[group[0]] = GRAV_CONST * (state.mass[self.central] + mass.sum())
+        total = state.mass.sum()
+        self.cm_pos = state.mass @ state.pos / total # massesenteret, som beveger seg med konstant fart
+        self.cm_vel = state.mass @ state.vel / total
+        self.periods = self.orbit_periods() # omløpstid for hver bane, uendelig for ubundne baner
+
+    def orbit_periods(self) -> np.ndarray:
+        """
+        metode som returnerer omløpstiden til hver bane, eller uendelig for baner som ikke er bundet
+        """
+        r = np.hypot(self.rel_pos[:, 0], self.rel_pos[:, 1])
+        v2 = np.einsum("ij,ij->i", self.rel_vel, self.rel_vel)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            alpha = 2/r - v2/self.mu # 1/a, positiv for bundne baner
+            periods = 2*np.pi / np.sqrt(self.mu * alpha**3)
+        return np.where(alpha > 0, periods, np.inf)
+
+    def propagate(self, index: np.ndarray, dt: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        metode som returnerer posisjonen og farten relativt til sentralmassen for legemene i index etter tiden dt. For bundne baner brukes bare resten etter hele omløp, slik at Newton iterasjonen i Kepler løsningen konvergerer like raskt uansett hvor lang tid det er
+        """
+        pos, vel = self.rel_pos[index].copy(), self.rel_vel[index].copy()
+        periods = self.periods[index]
+        bound = np.isfinite(periods)
+        times = np.full(len(index), float(dt))
+        times[bound] = np.fmod(dt, periods[bound]) # tid etter siste hele omløp
+        kepler_drift(pos, vel, self.mu[index], times)
+        return pos, vel
+
+    def state_at(self, time: float) -> SystemState:
+        """
+        metode som returnerer en omtrentlig tilstand ved simuleringstiden time. Planetene blir plassert rundt sola, månene rundt planetene, og sola blir plassert slik at massesenteret til hele systemet følger sin rette linje
+        """
+        dt = time - self.state.time # tid fra starttilstanden
+        mass = self.state.mass
+        rel_pos, rel_vel = np.zeros_like(self.rel_pos), np.zeros_like(self.rel_vel) # posisjon og fart relativt til sola
+        rel_pos[self.planets], rel_vel[self.planets] = self.propagate(self.planets, dt)
+        if len(self.moons): # månene i bane rundt planetene sine
+            rel_pos[self.moons], rel_vel[self.moons] = self.propagate(self.moons, dt)
+        for group in self.groups: # planeten ligger slik at massesenteret til systemet er på rett sted, og månene ligger rundt planeten
+            planet, moons = group[0], group[1:]
+            system_mass = mass[group].sum()
+            rel_pos[planet] -= mass[moons] @ rel_pos[moons] / system_mass
+            rel_vel[planet] -= mass[moons] @ rel_vel[moons] / system_mass
+            rel_pos[moons] += rel_pos[planet]
+            rel_vel[moons] += rel_vel[planet]
+        total = mass.sum()
+        sun_pos = self.cm_pos + self.cm_vel*dt - mass @ rel_pos / total # sola ligger slik at massesenteret er på rett sted
+        sun_vel = self.cm_vel - mass @ rel_vel / total
+        return SystemState(self.state.names, mass, sun_pos + rel_pos, sun_vel + rel_vel, time)
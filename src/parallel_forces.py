@@ -0,0 +1,238 @@
+"""
+kraftberegning ved direkte summering fordelt på flere prosesser. Legemene som blir trukket på deles i fliser (sammenhengende rader), og hver prosess regner ut akselerasjonen til flisene den får mot alle legemene med masse.
+Posisjonene, massene og akselerasjonene ligger i delt minne, så bare små beskrivelser av flisene sendes over køene hvert steg, og prosessene skriver akselerasjonene rett inn i resultatet. For få legemer regnes alt ut i prosessen selv, siden det da går raskere enn å vente på køene.
+Tiden til hvert kall blir tatt vare på, slik at man kan se hvor mye raskere det går med flere kjerner:
+    python3 -m benchmarks.parallel_forces
+"""
+from __future__ import annotations
+import atexit # importerer bibliotek for å stoppe prosessene og slette det delte minnet når programmet avslutter
+import collections # importerer deque for de siste tidsmålingene
+import multiprocessing # importerer bibliotek for å regne i flere prosesser samtidig
+import os # importerer bibliotek for å finne antall kjerner og prosess id
+import queue # importerer Empty som kastes når det ikke kommer resultater innen tidsfristen
+import sys # importerer bibliotek for å skrive advarsler til stderr
+import time # importerer bibliotek for å måle tid
+from multiprocessing import resource_tracker, shared_memory # importerer delt minne slik at tilstanden ikke må sendes gjennom køene
+import numpy as np # importerer numpy for å lese og skrive det delte minnet
+from src.physics import compute_direct_accelerations, compute_field_accelerations # importerer direkte summering
+
+PARALLEL_THRESHOLD = 1_000_000 # minste antall par (legemer ganger legemer med masse) før kraftberegningen fordeles på prosessene. Under dette er køene tregere enn regningen
+TILES_PER_PROCESS = 4 # antall fliser per prosess. Flere fliser enn prosesser gjør at en prosess som blir forsinket ikke holder igjen hele steget
+MIN_TILE_SIZE = 64 # minste antall rader i en flis
+TIMING_HISTORY = 1000 # antall kall det tas vare på tidsmålinger for
+RESULT_POLL_INTERVAL = 0.1 # antall sekunder det ventes på resultater før det sjekkes om prosessene fortsatt lever
+
+
+def buffer_views(data: np.ndarray, capacity: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    funksjon som deler det delte minnet for capacity legemer i posisjonene til alle legemer, posisjonene og massene til legemene med masse, og akselerasjonene
+    """
+    pos = data[0:2*capacity].reshape(capacity, 2) # posisjonene til legemene som blir trukket på
+    source_pos = data[2*capacity:4*capacity].reshape(capacity, 2) # posisjonene til legemene med masse
+    source_mass = data[4*capacity:5*capacity] # massene til legemene med masse
+    acc = data[5*capacity:7*capacity].reshape(capacity, 2) # akselerasjonene
+    return pos, source_pos, source_mass, acc
+
+
+def run_tiles(tasks, results) -> None:
+    """
+    funksjon som kjører i hver prosess. Henter fliser fra tasks, regner ut akselerasjonen til radene i flisen og skriver dem til det delte minnet. Sender radene og hvor lang tid det tok til results. None i køen stopper prosessen
+    """
+    shm, name, views = None, None, None # delt minne prosessen er koblet til
+    while True:
+        task = tasks.get()
+        if task is None: # stopp
+            break
+        shm_name, capacity, n_sources, softening, i0, i1 = task
+        try:
+            if shm_name != name: # minnet er laget på nytt fordi det ble for lite
+                if shm is not None:
+                    del views
+                    shm.close()
+                shm, name = shared_memory.SharedMemory(name=shm_name), shm_name
+                views = buffer_views(np.ndarray(7*capacity, dtype=np.float64, buffer=shm.buf), capacity)
+            pos, source_pos, source_mass, acc = views
+            start = time.perf_counter()
+            compute_field_accelerations(pos[i0:i1], source_pos[:n_sources], source_mass[:n_sources], softening, out=acc[i0:i1]) # legemet selv blir hoppet over
+            results.put((i0, i1, time.perf_counter() - start, None))
+        except Exception as error: # sender feilen tilbake istedenfor å stoppe, ellers ville den som venter aldri fått svar
+            results.put((i0, i1, 0.0, repr(error)))
+    if shm is not None:
+        del views
+        shm.close()
+
+
+class ParallelForces:
+    """
+    klasse som regner ut gravitasjonen mellom legemene med direkte summering fordelt på processes prosesser. Prosessene startes første gang det er nok legemer, og bruker fork slik at de ikke importerer programmet på nytt.
+    Hvis prosesser ikke kan startes (ingen fork, eller kallet skjer i en daemon prosess som PhysicsWorker eller en prosess pool), eller det er færre enn threshold par av legemer og legemer med masse, regnes alt ut i prosessen selv med samme resultat.
+    Hvis en av prosessene dør (f.eks tom for minne eller drept med et signal), blir alle prosessene stoppet og resten av kallene regnes ut i prosessen selv, istedenfor at programmet venter for alltid på svar.
+    timings har en oppføring per kall med antall legemer, om prosessene ble brukt, antall fliser, tiden kallet tok, tiden til den tregeste flisen og tiden alle flisene tok til sammen
+    """
+    def __init__(self, processes: int|None=None, threshold: int=PARALLEL_THRESHOLD) -> None: # constructor
+        self.processes = processes or os.cpu_count() or 1 # antall prosesser
+        self.threshold = threshold # minste antall par før prosessene brukes
+        self.pid = os.getpid() # prosessen som eier prosessene og minnet
+        self.workers = [] # prosessene
+        self.tasks = None # kø med fliser
+        self.results = None # kø med ferdige fliser
+        self.available = None # om prosessene kan brukes. None før det er prøvd
+        self.shm = None # delt minne
+        self.capacity = 0 # antall legemer det delte minnet har plass til
+        self.timings = collections.deque(maxlen=TIMING_HISTORY) # tidsmålinger for de siste kallene
+
+    def start(self) -> bool:
+        """
+        metode som starter prosessene hvis de ikke er startet, og returnerer om de kan brukes
+        """
+        if self.available is None:
+            self.available = self.processes > 1 and "fork" in multiprocessing.get_all_start_methods() and not multiprocessing.current_process().daemon # daemon prosesser kan ikke ha egne prosesser
+            if self.available:
+                resource_tracker.ensure_running() # prosessene arver resource trackeren til eieren. Ellers ville de startet hver sin, som sletter det delte minnet når prosessen avslutter
+                context = multiprocessing.get_context("fork")
+                self.tasks, self.results = context.SimpleQueue(), context.Queue() # resultatkøen kan vente med tidsfrist
+                self.workers = [context.Process(target=run_tiles, args=(self.tasks, self.results), daemon=True) for _ in range(self.processes)]
+                for worker in self.workers:
+                    worker.start()
+                atexit.register(self.close)
+        return self.available
+
+    def reserve(self, n: int) -> None:
+        """
+        metode som sørger for at det delte minnet har plass til n legemer. Minnet blir laget på nytt med dobbel størrelse når det er for lite, og prosessene kobler seg til det nye minnet neste gang de får en flis
+        """
+        if n <= self.capacity:
+            return
+        capacity = max(n, 2*self.capacity)
+        shm = shared_memory.SharedMemory(create=True, size=7*capacity*8)
+        self.release()
+        self.shm, self.capacity = shm, capacity
+        self.pos, self.source_pos, self.source_mass, self.acc = buffer_views(np.ndarray(7*capacity, dtype=np.float64, buffer=shm.buf), capacity)
+
+    def release(self) -> None:
+        """
+        metode som lukker og sletter det delte minnet
+        """
+        if self.shm is None:
+            return
+        del self.pos, self.source_pos, self.source_mass, self.acc # numpy arrayene må slettes før minnet kan lukkes
+        self.shm.close()
+        self.shm.unlink()
+        self.shm, self.capacity = None, 0
+
+    def tiles(self, n: int) -> list[tuple[int, int]]:
+        """
+        metode som deler n rader i omtrent like store fliser, TILES_PER_PROCESS per prosess, men ingen mindre enn MIN_TILE_SIZE
+        """
+        count = max(1, min(self.processes * TILES_PER_PROCESS, n // MIN_TILE_SIZE)) # antall fliser
+        edges = np.linspace(0, n, count + 1).astype(int)
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+    def accelerations(self, pos: np.ndarray, mass: np.ndarray, softening: float=0.0, out: np.ndarray|None=None) -> np.ndarray:
+        """
+        metode som regner ut akselerasjonen til alle legemer fra legemene med masse. Testpartikler uten masse blir trukket på, men er ikke med i summen
+        """
+        n = len(mass) # antall legemer
+        if out is None:
+            out = np.empty((n, 2))
+        start = time.perf_counter()
+        sources = np.flatnonzero(mass > 0) # legemene med masse
+        if n * len(sources) < self.threshold or not self.start() or not self.alive(): # for få par, eller prosessene kan ikke brukes
+            return self.local_accelerations(pos, mass, softening, out, start)
+
+        self.reserve(n)
+        self.pos[:n] = pos
+        self.source_pos[:len(sources)] = pos[sources]
+        self.source_mass[:len(sources)] = mass[sources]
+        tiles = self.tiles(n)
+        for i0, i1 in tiles: # sender flisene. Prosessene tar neste flis når de er ferdige med den forrige
+            self.tasks.put((self.shm.name, self.capacity, len(sources), softening, i0, i1))
+        slowest, work, errors = 0.0, 0.0, [] # tiden til den tregeste flisen, tiden til alle flisene og feil fra prosessene
+        for _ in tiles: # venter på alle flisene, også hvis noen feiler, slik at køen er tom til neste kall
+            result = self.next_result()
+            if result is None: # en prosess er død, flisene den hadde kommer aldri
+                self.alive()
+                return self.local_accelerations(pos, mass, softening, out, start)
+            i0, i1, elapsed, error = result
+            slowest, work = max(slowest, elapsed), work + elapsed
+            if error is not None:
+                errors.append(f"rad {i0}-{i1}: {error}")
+        if errors:
+            raise RuntimeError("kraftberegningen feilet i en prosess: " + "; ".join(errors))
+        out[:] = self.acc[:n]
+        self.timings.append({"bodies": n, "parallel": True, "tiles": len(tiles), "wall": time.perf_counter() - start, "slowest": slowest, "work": work})
+        return out
+
+    def local_accelerations(self, pos: np.ndarray, mass: np.ndarray, softening: float, out: np.ndarray, start: float) -> np.ndarray:
+        """
+        metode som regner ut akselerasjonene i denne prosessen og tar vare på tiden fra start
+        """
+        compute_direct_accelerations(pos, mass, softening, out=out)
+        elapsed = time.perf_counter() - start
+        self.timings.append({"bodies": len(mass), "parallel": False, "tiles": 1, "wall": elapsed, "slowest": elapsed, "work": elapsed})
+        return out
+
+    def alive(self) -> bool:
+        """
+        metode som returnerer True hvis alle prosessene lever. Hvis en av dem er død, blir resten stoppet og minnet slettet, og prosessene blir ikke startet igjen
+        """
+        if all(worker.is_alive() for worker in self.workers):
+            return True
+        print("en prosess i kraftberegningen døde, regner videre i denne prosessen", file=sys.stderr)
+        self.close()
+        self.available = False # prøver ikke å starte prosessene igjen
+        return False
+
+    def next_result(self) -> tuple|None:
+        """
+        metode som venter på neste ferdige flis. Sjekker hvert RESULT_POLL_INTERVAL sekund om alle prosessene lever, og returnerer None hvis en av dem er død
+        """
+        while True:
+            try:
+                return self.results.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in self.workers):
+                    return None
+
+    def summary(self) -> dict:
+        """
+        metode som oppsummerer tidsmålingene: antall kall med og uten prosessene, gjennomsnittlig tid per kall og for den tregeste flisen i millisekunder, og hvor stor del av tiden prosessene regnet (1 betyr at alle prosessene regnet hele tiden)
+        """
+        timings = list(self.timings)
+        parallel = [timing for timing in timings if timing["parallel"]]
+        result = {"processes": self.processes, "calls": len(timings), "parallel_calls": len(parallel)}
+        if timings:
+            result["wall_ms"] = 1000 * sum(timing["wall"] for timing in timings) / len(timings)
+        if parallel:
+            result["slowest_tile_ms"] = 1000 * sum(timing["slowest"] for timing in parallel) / len(parallel)
+            result["efficiency"] = sum(timing["work"] for timing in parallel) / (self.processes * sum(timing["wall"] for timing in parallel))
+        return result
+
+    def close(self) -> None:
+        """
+        metode som stopper prosessene og sletter det delte minnet. Gjør ingenting i en prosess som er laget med fork fra eieren
+        """
+        if os.getpid() != self.pid:
+            return
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join(timeout=1)
+            if worker.is_alive(): # henger, f.eks på en lås en død prosess holdt
+                worker.terminate()
+        self.workers = []
+        self.available = None
+        self.release()
+
+
+_backends: dict[int, ParallelForces] = {} # prosess id -> backend. En prosess laget med fork kan ikke bruke prosessene til foreldreprosessen
+
+
+def shared_backend() -> ParallelForces:
+    """
+    funksjon som returnerer backenden til denne prosessen, med en prosess per kjerne. Lages første gang den brukes
+    """
+    pid = os.getpid()
+    if pid not in _backends:
+        _backends[pid] = ParallelForces()
+    return _backends[pid]
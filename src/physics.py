@@ -0,0 +1,139 @@
+import numpy as np # importerer numpy for å regne med hele arrays av posisjoner og masser på en gang
+
+GRAV_CONST = 6.67430e-11 # gravitasjonskonstanten
+
+BLOCK_SIZE = 512 # maks antall legemer i en blokk når akselerasjonen regnes ut. Begrenser hvor mye minne de midlertidige matrisene bruker når det er mange legemer
+
+_pair_index_cache: dict[int, tuple[np.ndarray, np.ndarray]] = {} # cache med indekser for alle par (i < j) for en gitt blokkstørrelse slik at de ikke lages på nytt hvert steg
+
+
+def _pair_indices(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    funksjon som returnerer indeksene til alle par (i, j) med i < j for n legemer. Indeksene caches slik at de bare lages en gang per blokkstørrelse
+    """
+    if n not in _pair_index_cache: # hvis indeksene ikke er laget for denne størrelsen
+        _pair_index_cache[n] = np.triu_indices(n, 1) # lager indekser for øvre trekant av matrisen, altså hvert par en gang
+    return _pair_index_cache[n] # returnerer indeksene
+
+
+def compute_accelerations(pos: np.ndarray, mass: np.ndarray, softening: float=0.0, out: np.ndarray|None=None) -> np.ndarray:
+    """
+    funksjon som regner ut akselerasjonsvektoren til alle legemer fra gravitasjonskraften mellom alle par av legemer. pos er et (N, 2) array med posisjoner, mass er et (N,) array med masser og softening er en mykningslengde som gjør at kraften ikke blir uendelig når to legemer er veldig nærme hverandre.
+    Avstanden mellom hvert par regnes bare ut en gang, og Newtons tredje lov brukes for å finne akselerasjonen til begge legemene i paret
+    """
+    n = len(mass) # antall legemer
+    if out is None: # hvis det ikke er gitt et array å skrive til
+        out = np.empty((n, 2)) # lager nytt array for akselerasjonene
+    out[:] = 0 # nullstiller akselerasjonen
+    eps2 = softening**2 # mykningslengden i andre
+
+    for i0 in range(0, n, BLOCK_SIZE): # looper gjennom blokker med legemer
+        i1 = min(i0 + BLOCK_SIZE, n) # slutten av blokken
+        pos_i = pos[i0:i1] # posisjonene i blokken
+        mass_i = mass[i0:i1] # massene i blokken
+
+        ### par innenfor samme blokk
+        ii, jj = _pair_indices(i1 - i0) # indekser for alle par i blokken
+        d = pos_i[jj] - pos_i[ii] # avstandsvektor fra legeme i til legeme j
+        r2 = np.einsum("ij,ij->i", d, d) + eps2 # avstanden i andre
+        w = GRAV_CONST / (r2 * np.sqrt(r2)) # G/r^3 for hvert par
+        for k in range(2): # x og y retning
+            f = d[:, k] * w # G*d/r^3 for hvert par
+            out[i0:i1, k] += np.bincount(ii, weights=f*mass_i[jj], minlength=i1-i0) # legeme i blir trukket mot legeme j
+            out[i0:i1, k] -= np.bincount(jj, weights=f*mass_i[ii], minlength=i1-i0) # legeme j blir trukket motsatt vei (Newtons tredje lov)
+
+        ### par mellom denne blokken og blokkene etter
+        for j0 in range(i1, n, BLOCK_SIZE): # looper gjennom resten av blokkene
+            j1 = min(j0 + BLOCK_SIZE, n) # slutten av blokken
+            d_x = pos[j0:j1, 0][None, :] - pos_i[:, 0][:, None] # avstand i x retning mellom alle par i de to blokkene
+            d_y = pos[j0:j1, 1][None, :] - pos_i[:, 1][:, None] # avstand i y retning mellom alle par i de to blokkene
+            r2 = d_x*d_x + d_y*d_y + eps2 # avstanden i andre
+            w = GRAV_CONST / (r2 * np.sqrt(r2)) # G/r^3 for hvert par
+            w_x = w * d_x # G*d_x/r^3
+            w_y = w * d_y # G*d_y/r^3
+            out[i0:i1, 0] += w_x @ mass[j0:j1] # akselerasjon på legemene i blokk i
+            out[i0:i1, 1] += w_y @ mass[j0:j1]
+            out[j0:j1, 0] -= mass_i @ w_x # akselerasjon på legemene i blokk j (Newtons tredje lov)
+            out[j0:j1, 1] -= mass_i @ w_y
+    return out # returnerer akselerasjonene
+
+
+def compute_field_accelerations(pos: np.ndarray, source_pos: np.ndarray, source_mass: np.ndarray, softening: float=0.0, out: np.ndarray|None=None) -> np.ndarray:
+    """
+    funksjon som regner ut akselerasjonen i posisjonene pos fra gravitasjonen til legemene i source_pos med massene source_mass. Posisjonene trekker ikke på kildene, så dette brukes for testpartikler uten masse. Kostnaden er O(antall posisjoner ganger antall kilder).
+    En posisjon kan også være en av kildene, f.eks når en del av legemene regnes ut om gangen. Par med avstand 0 blir hoppet over slik at legemet ikke trekker på seg selv
+    """
+    n = len(pos) # antall posisjoner
+    if out is None: # hvis det ikke er gitt et array å skrive til
+        out = np.empty((n, 2)) # lager nytt array for akselerasjonene
+    eps2 = softening**2 # mykningslengden i andre
+    for i0 in range(0, n, BLOCK_SIZE): # looper gjennom blokker med posisjoner for å begrense minnebruk
+        i1 = min(i0 + BLOCK_SIZE, n) # slutten av blokken
+        d_x = source_pos[:, 0][None, :] - pos[i0:i1, 0][:, None] # avstand i x retning fra hver posisjon til hver kilde
+        d_y = source_pos[:, 1][None, :] - pos[i0:i1, 1][:, None] # avstand i y retning fra hver posisjon til hver kilde
+        r2 = d_x*d_x + d_y*d_y + eps2 # avstanden i andre
+        if eps2 == 0: # uten mykning er avstanden 0 bare for legemet selv
+            r2[r2 == 0] = np.inf # gir G/r^3 = 0
+        w = GRAV_CONST / (r2 * np.sqrt(r2)) # G/r^3 for hvert par
+        out[i0:i1, 0] = (w * d_x) @ source_mass # akselerasjon i x retning
+        out[i0:i1, 1] = (w * d_y) @ source_mass # akselerasjon i y retning
+    return out # returnerer akselerasjonene
+
+
+def compute_direct_accelerations(pos: np.ndarray, mass: np.ndarray, softening: float=0.0, out: np.ndarray|None=None) -> np.ndarray:
+    """
+    funksjon som regner ut akselerasjonen til alle legemer ved direkte summering. Testpartikler uten masse blir trukket på, men er ikke med i summen, slik at kostnaden er O(N ganger antall legemer med masse)
+    """
+    massive = mass > 0 # legemer som trekker på de andre
+    if massive.all(): # ingen testpartikler
+        return compute_accelerations(pos, mass, softening, out=out) # regner ut akselerasjonene direkte
+    if out is None:
+        out = np.empty((len(mass), 2))
+    sources, tests = np.flatnonzero(massive), np.flatnonzero(~massive) # indeksene til legemene med og uten masse
+    out[sources] = compute_accelerations(pos[sources], mass[sources], softening) # legemene med masse trekker på hverandre
+    out[tests] = compute_field_accelerations(pos[tests], pos[sources], mass[sources], softening) # testpartiklene blir bare trukket på av legemene med masse
+    return out
+
+
+def compute_field_jerks(pos: np.ndarray, vel: np.ndarray, source_pos: np.ndarray, source_vel: np.ndarray, source_mass: np.ndarray, softening: float=0.0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    funksjon som regner ut akselerasjonen og jerk (den deriverte av akselerasjonen) i posisjonene pos med fartsvektorene vel fra legemene i source_pos. Brukes av Hermite integratoren, som bare regner ut kreftene på legemene som tar et steg.
+    Et legeme kan være med både i pos og i kildene, par med avstand 0 blir hoppet over slik at legemet ikke trekker på seg selv
+    """
+    n = len(pos) # antall posisjoner
+    acc = np.empty((n, 2)) # akselerasjonene
+    jerk = np.empty((n, 2)) # jerk
+    eps2 = softening**2 # mykningslengden i andre
+    for i0 in range(0, n, BLOCK_SIZE): # looper gjennom blokker med posisjoner for å begrense minnebruk
+        i1 = min(i0 + BLOCK_SIZE, n) # slutten av blokken
+        d_x = source_pos[:, 0][None, :] - pos[i0:i1, 0][:, None] # avstand i x retning fra hver posisjon til hver kilde
+        d_y = source_pos[:, 1][None, :] - pos[i0:i1, 1][:, None] # avstand i y retning fra hver posisjon til hver kilde
+        u_x = source_vel[:, 0][None, :] - vel[i0:i1, 0][:, None] # relativ fart i x retning
+        u_y = source_vel[:, 1][None, :] - vel[i0:i1, 1][:, None] # relativ fart i y retning
+        r2 = d_x*d_x + d_y*d_y + eps2 # avstanden i andre
+        self_pair = r2 == 0 # legemet selv
+        r2[self_pair] = 1.0 # unngår deling på 0
+        w = GRAV_CONST / (r2 * np.sqrt(r2)) * source_mass # G*m/r^3 for hvert par
+        w[self_pair] = 0.0
+        rv = 3 * (d_x*u_x + d_y*u_y) / r2 # 3*(d*u)/r^2
+        acc[i0:i1, 0] = (w * d_x).sum(axis=1) # akselerasjon i x retning
+        acc[i0:i1, 1] = (w * d_y).sum(axis=1) # akselerasjon i y retning
+        jerk[i0:i1, 0] = (w * (u_x - rv*d_x)).sum(axis=1) # G*m*(u/r^3 - 3*(d*u)*d/r^5)
+        jerk[i0:i1, 1] = (w * (u_y - rv*d_y)).sum(axis=1)
+    return acc, jerk # returnerer akselerasjonene og jerk
+
+
+def total_energy(pos: np.ndarray, vel: np.ndarray, mass: np.ndarray, softening: float=0.0) -> float:
+    """
+    funksjon som regner ut den totale energien (kinetisk pluss potensiell) til alle legemer. Brukes for å måle hvor godt en integrator bevarer energien
+    """
+    kinetic = 0.5 * np.sum(mass * np.einsum("ij,ij->i", vel, vel)) # kinetisk energi
+    potential = 0.0 # potensiell energi
+    n = len(mass) # antall legemer
+    for i0 in range(0, n, BLOCK_SIZE): # looper gjennom blokker med legemer for å begrense minnebruk
+        i1 = min(i0 + BLOCK_SIZE, n) # slutten av blokken
+        d = pos[i0:i1, None, :] - pos[None, i0:, :] # avstand fra blokken til alle legemer fra og med blokken
+        r = np.sqrt(np.einsum("ijk,ijk->ij", d, d) + softening**2) # avstanden
+        upper = np.arange(i0, n)[None, :] > np.arange(i0, i1)[:, None] # hvert par en gang (j > i)
+        potential -= GRAV_CONST * np.sum((mass[i0:i1, None] * mass[None, i0:] / np.where(upper, r, 1.0))[upper]) # -G*m_i*m_j/r
+    return kinetic + potential # returnerer total energi
@@ -0,0 +1,58 @@
+import numpy as np # importerer numpy for å bygge rutenettet for alle legemer samtidig
+
+PICK_CELL_SIZE = 32 # bredden til hver rute i rutenettet i piksler
+PICK_TOLERANCE = 6 # hvor mange piksler utenfor et legeme man kan klikke og fortsatt treffe det
+
+
+class PickGrid:
+    """
+    klasse for et uniformt rutenett i skjermkoordinater som brukes for å finne legemet nærmest et museklikk. Legemene blir sortert etter hvilken rute de ligger i, slik at et klikk bare trenger å se på legemene i rutene rundt klikket.
+    Rutenettet bygges på nytt hver frame fra posisjonene som allerede er regnet ut for tegningen
+    """
+    def __init__(self, cell_size: float=PICK_CELL_SIZE) -> None: # constructor
+        self.cell_size = cell_size # bredden til hver rute
+        self.codes = np.zeros(0, dtype=np.int64) # ruten til hvert legeme, sortert
+        self.centers = np.zeros((0, 2)) # senteret til hvert legeme på skjermen, i samme rekkefølge som codes
+        self.radii = np.zeros(0) # radiusen til hvert legeme på skjermen i piksler
+        self.keys = np.zeros(0, dtype=np.int64) # nøkkelen til hvert legeme, f.eks indeksen i SystemState
+        self.max_radius = 0.0 # største radius, bestemmer hvor mange ruter et klikk må se på
+
+    def cell_codes(self, cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        """
+        metode som gjør om rutekoordinater til ett heltall per rute
+        """
+        return (cx.astype(np.int64) << 32) + (cy.astype(np.int64) & 0xFFFFFFFF)
+
+    def build(self, centers: np.ndarray, radii: np.ndarray, keys: np.ndarray) -> None:
+        """
+        metode som bygger rutenettet. centers er et (N, 2) array med senteret til hvert legeme på skjermen, radii er radiusen i piksler (0 for punkter) og keys er nøkkelen som returneres når legemet blir klikket
+        """
+        cells = np.floor(centers / self.cell_size) # ruten hvert legeme ligger i
+        codes = self.cell_codes(cells[:, 0], cells[:, 1])
+        order = np.argsort(codes, kind="stable") # sorterer legemene etter rute
+        self.codes = codes[order]
+        self.centers = centers[order]
+        self.radii = radii[order]
+        self.keys = keys[order]
+        self.max_radius = float(radii.max()) if len(radii) else 0.0
+
+    def query(self, x: float, y: float, tolerance: float=PICK_TOLERANCE) -> int|None:
+        """
+        metode som returnerer nøkkelen til legemet som er nærmest (x, y) og ikke lenger unna enn tolerance piksler fra kanten, eller None. Avstanden til et legeme er avstanden til senteret minus radiusen, så et stort legeme blir truffet over hele bildet
+        """
+        if len(self.codes) == 0:
+            return None
+        reach = tolerance + self.max_radius # et legeme kan ligge så langt unna og fortsatt bli truffet
+        cx = np.arange(np.floor((x - reach) / self.cell_size), np.floor((x + reach) / self.cell_size) + 1) # rutene som må sjekkes
+        cy = np.arange(np.floor((y - reach) / self.cell_size), np.floor((y + reach) / self.cell_size) + 1)
+        codes = self.cell_codes(*np.meshgrid(cx, cy)).ravel()
+        starts = np.searchsorted(self.codes, codes, side="left") # legemene i hver rute ligger etter hverandre
+        ends = np.searchsorted(self.codes, codes, side="right")
+        candidates = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)]) # legemene i rutene rundt klikket
+        if len(candidates) == 0:
+            return None
+        distance = np.hypot(self.centers[candidates, 0] - x, self.centers[candidates, 1] - y) - self.radii[candidates] # avstand fra kanten av hvert legeme
+        best = int(np.argmin(distance))
+        if distance[best] > tolerance: # for langt unna
+            return None
+        return int(self.keys[candidates[best]])
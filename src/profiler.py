@@ -0,0 +1,125 @@
+import json # importerer bibliotek for å skrive målinger som json linjer
+import os # importerer bibliotek for å finne hele stien til filen målingene skrives til
+import time # importerer bibliotek for å måle tid
+import numpy as np # importerer numpy for å holde målingene i en ringbuffer og regne ut persentiler
+
+PHASES = ("events", "buttons", "physics", "camera", "hud", "present") # fasene i en frame i simulation_screen, i rekkefølge
+PHASE_LABELS = {"events": "hendelser", "buttons": "knapper", "physics": "fysikk", "camera": "kamera", "hud": "tekst", "present": "tegning"} # navn som vises på skjermen
+RENDER_PHASES = ("camera", "hud", "present") # fasene som hører til tegning
+PROFILE_WINDOW = 300 # antall frames persentilene regnes ut fra
+SLOW_FPS = 30 # FPS der profileren sier fra om hva som er tregest
+BLAME_FRAMES = 30 # antall siste frames som brukes for å finne ut hva som er tregest
+
+_output_sessions: dict[str, int] = {} # fil -> antall profilere som har skrevet til den i denne prosessen
+
+
+class FrameProfiler:
+    """
+    klasse som måler hvor lang tid hver fase i en frame tar. mark(fase) lagrer tiden siden forrige mark, og end_frame lagrer framen i en ringbuffer med de siste PROFILE_WINDOW framene, slik at persentiler kan regnes ut uten at minnebruken vokser.
+    Hvis output er gitt, blir hver frame også skrevet til en csv fil eller en jsonl fil (hvis navnet slutter på .jsonl). Filen blir tømt første gang den åpnes i prosessen. Senere profilere (f.eks etter reset eller nytt skjermbilde) skriver videre på slutten, og hver rad har nummeret til økten den hører til
+    """
+    def __init__(self, window: int=PROFILE_WINDOW, output: str|None=None) -> None: # constructor
+        self.samples = np.zeros((window, len(PHASES) + 1)) # ringbuffer med tid for hver fase og hele framen (sekunder)
+        self.head = 0 # indeksen neste frame skrives til
+        self.count = 0 # antall frames som er lagret
+        self.frame = np.zeros(len(PHASES) + 1) # framen som måles nå
+        self.last_mark = time.perf_counter() # tidspunktet til forrige mark
+        self.frames = 0 # antall frames som er målt totalt
+        self.output = None # fil målingene skrives til
+        self.jsonl = bool(output) and output.endswith(".jsonl") # json linjer eller csv
+        self.session = 0 # nummeret til økten i filen
+        if output:
+            path = os.path.abspath(output)
+            self.session = _output_sessions.get(path, 0) + 1
+            _output_sessions[path] = self.session
+            self.output = open(output, "w" if self.session == 1 else "a") # tømmer filen bare første gang i prosessen
+            if not self.jsonl and self.session == 1:
+                self.output.write(",".join(("session", "frame", "wall_time") + PHASES + ("frame_time",)) + "\n") # header i csv filen
+
+    def start(self) -> None:
+        """
+        metode som kalles i starten av en frame
+        """
+        self.frame[:] = 0
+        self.last_mark = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """
+        metode som lagrer tiden siden forrige mark (eller start) som tiden til fasen
+        """
+        now = time.perf_counter()
+        self.frame[PHASES.index(phase)] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self, frame_time: float) -> None:
+        """
+        metode som lagrer framen i ringbufferen. frame_time er hvor lang tid hele framen tok, inkludert ventingen i CLOCK.tick
+        """
+        self.frame[-1] = frame_time
+        self.samples[self.head] = self.frame
+        self.head = (self.head + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+        self.frames += 1
+        if self.output: # skriver framen til fil
+            if self.jsonl:
+                self.output.write(json.dumps({"session": self.session, "frame": self.frames, "wall_time": time.time(), **dict(zip(PHASES + ("frame_time",), self.frame.tolist()))}) + "\n")
+            else:
+                self.output.write(f"{self.session},{self.frames},{time.time()}," + ",".join(f"{value:.6g}" for value in self.frame) + "\n")
+
+    def recent(self, n: int) -> np.ndarray:
+        """
+        metode som returnerer de n siste framene, eldst først
+        """
+        n = min(n, self.count)
+        return self.samples[(self.head - n + np.arange(n)) % len(self.samples)]
+
+    def percentiles(self) -> dict[str, tuple[float, float, float]]:
+        """
+        metode som returnerer p50, p95 og p99 i sekunder for hver fase og for hele framen ("frame_time")
+        """
+        if self.count == 0:
+            return {}
+        values = np.percentile(self.recent(self.count), (50, 95, 99), axis=0) # (persentil, fase)
+        return {phase: tuple(values[:, i]) for i, phase in enumerate(PHASES + ("frame_time",))}
+
+    def fps(self) -> float:
+        """
+        metode som returnerer gjennomsnittlig FPS de siste BLAME_FRAMES framene
+        """
+        frame_times = self.recent(BLAME_FRAMES)[:, -1]
+        return 1 / frame_times.mean() if len(frame_times) and frame_times.mean() > 0 else 0.0
+
+    def slowest(self) -> tuple[str, float, float]:
+        """
+        metode som returnerer fasen som tok lengst tid i snitt de siste BLAME_FRAMES framene, og hvor mange sekunder fysikken og tegningen tok i snitt
+        """
+        means = self.recent(BLAME_FRAMES)[:, :-1].mean(axis=0) # gjennomsnittlig tid for hver fase
+        physics = means[PHASES.index("physics")]
+        render = sum(means[PHASES.index(phase)] for phase in RENDER_PHASES)
+        return PHASES[int(np.argmax(means))], physics, render
+
+    def summary(self) -> list[str]:
+        """
+        metode som returnerer linjer med tekst som beskriver målingene, for å vises på skjermen
+        """
+        stats = self.percentiles()
+        if not stats:
+            return []
+        fps = self.fps()
+        lines = [f"FPS: {fps:.0f}   p50 / p95 / p99 (ms)"]
+        for phase in PHASES + ("frame_time",):
+            label = PHASE_LABELS.get(phase, "hele framen")
+            lines.append(f"{label}: " + " / ".join(f"{value*1000:.2f}" for value in stats[phase]))
+        if fps < SLOW_FPS: # sier fra hva som er tregest
+            phase, physics, render = self.slowest()
+            culprit = "fysikken" if physics > render else "tegningen"
+            lines.append(f"Under {SLOW_FPS} FPS: {culprit} er tregest (fysikk {physics*1000:.1f} ms, tegning {render*1000:.1f} ms, tregeste fase: {PHASE_LABELS[phase]})")
+        return lines
+
+    def close(self) -> None:
+        """
+        metode som lukker filen målingene skrives til
+        """
+        if self.output:
+            self.output.close()
+            self.output = None
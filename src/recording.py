@@ -0,0 +1,140 @@
+import json # importerer bibliotek for å lagre informasjon om opptaket som json
+import os # importerer bibliotek for å jobbe med filer
+import numpy as np # importerer numpy for å skrive og lese tilstander som binære arrays
+from src.simulation import SystemState # importerer tilstanden som blir tatt opp
+
+RECORDING_CADENCE = 21600 # simuleringstid mellom hver tilstand i opptaket (6 timer)
+CHUNK_FRAMES = 4096 # antall tilstander i hver chunk fil
+RECORDING_VERSION = 1 # versjon av formatet. Endres hvis formatet endres
+
+
+def latest_recording(directory: str) -> str|None:
+    """
+    funksjon som returnerer mappen til det nyeste opptaket i directory, eller None hvis det ikke finnes noen opptak
+    """
+    if not os.path.isdir(directory):
+        return None
+    recordings = sorted(name for name in os.listdir(directory) if os.path.exists(os.path.join(directory, name, "meta.json"))) # mappene har tidspunkt som navn, så sortert blir nyeste sist
+    return os.path.join(directory, recordings[-1]) if recordings else None
+
+
+class TrajectoryRecorder:
+    """
+    klasse som tar opp tilstanden til alle legemer til filer som bare blir lagt til på slutten. En ny tilstand blir skrevet når simuleringstiden har gått cadence sekunder fram siden forrige tilstand. Mens tiden går bakover blir ingenting tatt opp, og paused() forteller det til brukeren.
+    Tilstandene (x, y, v_x, v_y for hvert legeme) blir skrevet til chunk filer med CHUNK_FRAMES tilstander i hver, og tidspunktene til en egen indeksfil. meta.json har navn, masser og innstillinger
+    """
+    def __init__(self, path: str, state: SystemState, cadence: float=RECORDING_CADENCE, chunk_frames: int=CHUNK_FRAMES) -> None: # constructor
+        self.path = path # mappe med opptaket
+        self.cadence = cadence # simuleringstid mellom hver tilstand
+        self.chunk_frames = chunk_frames # antall tilstander per chunk fil
+        self.names = list(state.names) # navn til legemene, opptaket kan bare spilles av med samme legemer
+        self.n_frames = 0 # antall tilstander som er skrevet
+        self.last_time = None # tiden til siste tilstand
+        os.makedirs(path, exist_ok=True)
+        meta = {"version": RECORDING_VERSION, "names": self.names, "mass": state.mass.tolist(), "cadence": cadence, "chunk_frames": chunk_frames} # informasjon om opptaket
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        self.times_file = open(os.path.join(path, "times.bin"), "ab") # indeks med tidspunkter
+        self.chunk_file = None # chunk filen som skrives til nå
+
+    def paused(self, state: SystemState) -> bool:
+        """
+        metode som returnerer True hvis tiden i state er før siste tilstand i opptaket. Opptaket har bare tider som øker, så ingenting blir tatt opp før simuleringen er tilbake forbi siste tilstand
+        """
+        return self.last_time is not None and state.time < self.last_time
+
+    def record(self, state: SystemState) -> bool:
+        """
+        metode som skriver tilstanden hvis simuleringstiden har gått minst cadence fram siden forrige tilstand. Returnerer True hvis tilstanden ble skrevet
+        """
+        if self.last_time is not None and state.time - self.last_time < self.cadence: # for kort tid siden forrige tilstand, eller tiden går bakover
+            return False
+        if self.n_frames % self.chunk_frames == 0: # ny chunk fil
+            if self.chunk_file:
+                self.chunk_file.close()
+            self.chunk_file = open(os.path.join(self.path, f"chunk_{self.n_frames // self.chunk_frames:05d}.bin"), "ab")
+        self.chunk_file.write(np.hstack((state.pos, state.vel)).astype("<f8").tobytes()) # tilstanden
+        self.chunk_file.flush()
+        self.times_file.write(np.float64(state.time).astype("<f8").tobytes()) # tidspunktet skrives etter tilstanden, slik at indeksen aldri peker på en tilstand som ikke er skrevet
+        self.times_file.flush()
+        self.n_frames += 1
+        self.last_time = state.time
+        return True
+
+    def close(self) -> None:
+        """
+        metode som lukker filene
+        """
+        if self.chunk_file:
+            self.chunk_file.close()
+        self.times_file.close()
+
+
+class TrajectoryReader:
+    """
+    klasse som leser et opptak med numpy.memmap, slik at bare delene som brukes blir lest fra disk. Tilstanden ved et vilkårlig tidspunkt blir funnet ved å slå opp i tidsindeksen og interpolere mellom de to nærmeste tilstandene
+    """
+    def __init__(self, path: str) -> None: # constructor
+        self.path = path # mappe med opptaket
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["version"] != RECORDING_VERSION:
+            raise ValueError(f"opptaket {path} har en annen versjon")
+        self.names = meta["names"] # navn til legemene
+        self.mass = np.array(meta["mass"]) # masser
+        self.cadence = meta["cadence"] # simuleringstid mellom hver tilstand
+        self.chunk_frames = meta["chunk_frames"] # antall tilstander per chunk fil
+        self.n_bodies = len(self.names) # antall legemer
+        self.chunks: dict[int, np.memmap] = {} # chunk nummer -> memmap
+        times_path = os.path.join(path, "times.bin")
+        n_frames = os.path.getsize(times_path) // 8 if os.path.exists(times_path) else 0 # antall tilstander i indeksen
+        self.times = np.memmap(times_path, dtype="<f8", mode="r", shape=(n_frames,)) if n_frames else np.zeros(0) # tidsindeks
+
+    def __len__(self) -> int:
+        return len(self.times) # antall tilstander
+
+    @property
+    def start_time(self) -> float: # tiden til første tilstand
+        return float(self.times[0])
+
+    @property
+    def end_time(self) -> float: # tiden til siste tilstand
+        return float(self.times[-1])
+
+    def frame(self, k: int) -> np.ndarray:
+        """
+        metode som returnerer tilstand nummer k som et (N, 4) array med x, y, v_x, v_y
+        """
+        chunk = k // self.chunk_frames # chunk filen tilstanden ligger i
+        if chunk not in self.chunks:
+            chunk_path = os.path.join(self.path, f"chunk_{chunk:05d}.bin")
+            n = os.path.getsize(chunk_path) // (self.n_bodies * 4 * 8) # antall tilstander i filen
+            self.chunks[chunk] = np.memmap(chunk_path, dtype="<f8", mode="r", shape=(n, self.n_bodies, 4))
+        return self.chunks[chunk][k % self.chunk_frames]
+
+    def locate(self, t: float) -> int:
+        """
+        metode som returnerer indeksen k til siste tilstand med tid <= t, men aldri den aller siste slik at det alltid er en tilstand etter. Tidsindeksen er sortert, så oppslaget er et binærsøk og tar O(log N) uansett hvor tett tilstandene ligger
+        """
+        k = int(np.searchsorted(self.times, t, side="right")) - 1 # siste tilstand med tid <= t
+        return min(max(k, 0), len(self.times) - 2)
+
+    def sample(self, t: float, state: SystemState) -> None:
+        """
+        metode som setter posisjonene og fartsvektorene i state til tilstanden ved tiden t. Bruker kubisk Hermite interpolasjon mellom de to nærmeste tilstandene, med fartsvektorene som deriverte, slik at banene blir glatte
+        """
+        t = min(max(t, self.start_time), self.end_time) # holder tiden innenfor opptaket
+        if len(self) == 1: # bare en tilstand
+            record = self.frame(0)
+            state.pos[:], state.vel[:] = record[:, 0:2], record[:, 2:4]
+            state.time = t
+            return
+        k = self.locate(t)
+        a, b = self.frame(k), self.frame(k + 1) # tilstandene før og etter t
+        h = self.times[k + 1] - self.times[k] # tid mellom tilstandene
+        s = (t - self.times[k]) / h # andel av veien fra a til b
+        h00, h10, h01, h11 = 2*s**3 - 3*s**2 + 1, s**3 - 2*s**2 + s, -2*s**3 + 3*s**2, s**3 - s**2 # Hermite basisfunksjoner
+        state.pos[:] = h00*a[:, 0:2] + h10*h*a[:, 2:4] + h01*b[:, 0:2] + h11*h*b[:, 2:4] # posisjoner
+        state.vel[:] = a[:, 2:4] + (b[:, 2:4] - a[:, 2:4]) * s # fartsvektorer interpolert lineært
+        state.acc[:] = (b[:, 2:4] - a[:, 2:4]) / h # gjennomsnittlig akselerasjon mellom tilstandene
+        state.time = t
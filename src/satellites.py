@@ -0,0 +1,176 @@
+"""
+integrasjon av satellittsystemer (planeter med måner). Hver planet og månene dens blir sett på som ett legeme i massesenteret til systemet i den ytre integrasjonen, slik at det ytre tidssteget kan være like langt som uten måner.
+Månene integreres relativt til planeten sin med kortere indre steg, og tidevannskraften fra resten av solsystemet (forskjellen på gravitasjonen på hver måne og på massesenteret) blir lagt til som kick mellom de indre stegene
+"""
+from __future__ import annotations
+import numpy as np # importerer numpy for å integrere alle månene samtidig
+from src.physics import GRAV_CONST, compute_accelerations # importerer gravitasjonskonstanten og funksjonen som regner ut akselerasjoner
+from src.integrators import WisdomHolman, kepler_drift # importerer Kepler løsningen som brukes for månene
+
+TIDAL_STEP_FRACTION = 0.1 # største ytre steg som andel av banetidsskalaen (|v|/|a|) til planetene med måner. Posisjonene til de ytre legemene blir interpolert over steget når tidevannskraften regnes ut, og interpolasjonen er bare nøyaktig over en liten del av banen
+
+
+class SatelliteSystems:
+    """
+    klasse som integrerer et sett med satellittsystemer sammen med resten av legemene. groups er en liste med indeksarrays, der første indeks er planeten og resten er månene.
+    Den ytre integrasjonen bruker en egen simulator der hver planet er byttet ut med massesenteret til systemet sitt, og månene ikke er med. Månene integreres med Wisdom-Holman i demokratiske koordinater rundt planeten sin, for alle systemene samtidig
+    """
+    def __init__(self, simulator, groups: list[np.ndarray]) -> None: # constructor
+        state = simulator.state
+        self.groups = [np.asarray(group, dtype=np.int64) for group in groups] # planet og måner i hvert system
+        self.planets = np.array([group[0] for group in self.groups], dtype=np.int64) # indeksen til planeten i hvert system
+        self.moons = np.concatenate([group[1:] for group in self.groups]) # indeksen til alle månene
+        self.moon_group = np.concatenate([np.full(len(group) - 1, k) for k, group in enumerate(self.groups)]) # hvilket system hver måne hører til
+        self.outer_index = np.setdiff1d(np.arange(len(state)), self.moons) # legemene i den ytre integrasjonen. Planetene står for massesenteret til systemet sitt
+        self.slots = np.searchsorted(self.outer_index, self.planets) # raden til hvert massesenter i den ytre tilstanden
+        self.outer = simulator.subset(self.outer_index) # simulator for den ytre integrasjonen
+        self.same_group = (self.moon_group[:, None] == self.moon_group[None, :]) & ~np.eye(len(self.moons), dtype=bool) # par av måner i samme system
+        self.sources = np.flatnonzero(self.outer.state.mass > 0) # legemene i den ytre tilstanden som gir tidevannskraft. Testpartikler har ingen masse
+        self.source_slots = np.searchsorted(self.sources, self.slots) # raden til hvert massesenter blant kildene
+        self.member_group = np.concatenate((np.arange(len(self.groups)), self.moon_group)) # hvilket system planetene og månene hører til, planetene først
+        self.own_centre = self.source_slots[self.member_group][:, None] == np.arange(len(self.sources))[None, :] # paret mellom hvert legeme og massesenteret til eget system
+        self.softening = simulator.softening # mykningslengde
+        self.q = np.zeros((len(self.moons), 2)) # posisjonen til hver måne relativt til planeten
+        self.p = np.zeros((len(self.moons), 2)) # farten til hver måne relativt til massesenteret
+        self.synced = None # posisjoner og fartsvektorer etter forrige steg. Hvis tilstanden er endret utenfra, blir systemene satt opp på nytt
+
+    def gather(self, state) -> None:
+        """
+        metode som setter opp den ytre tilstanden og koordinatene til månene fra tilstanden, hvis tilstanden er endret siden forrige steg
+        """
+        if self.synced is not None and np.array_equal(self.synced[0], state.pos) and np.array_equal(self.synced[1], state.vel): # ingen endring
+            return
+        outer = self.outer.state
+        outer.pos[:] = state.pos[self.outer_index]
+        outer.vel[:] = state.vel[self.outer_index]
+        outer.mass[:] = state.mass[self.outer_index]
+        outer.time = state.time
+        self.m = state.mass[self.moons] # massene til månene
+        self.m0 = state.mass[self.planets] # massene til planetene
+        self.total = self.m0 + np.bincount(self.moon_group, weights=self.m, minlength=len(self.groups)) # massen til hvert system
+        for k, group in enumerate(self.groups): # massesenteret til hvert system
+            mass = state.mass[group]
+            outer.pos[self.slots[k]] = mass @ state.pos[group] / self.total[k]
+            outer.vel[self.slots[k]] = mass @ state.vel[group] / self.total[k]
+            outer.mass[self.slots[k]] = self.total[k]
+        self.source_mass = outer.mass[self.sources] # massene til kildene, med massesentrene
+        self.q = state.pos[self.moons] - state.pos[self.planets[self.moon_group]]
+        self.p = state.vel[self.moons] - outer.vel[self.slots[self.moon_group]]
+
+    def group_sums(self, values: np.ndarray) -> np.ndarray:
+        """
+        metode som returnerer summen av m*values for månene i hvert system
+        """
+        weighted = self.m[:, None] * values
+        return np.column_stack([np.bincount(self.moon_group, weights=weighted[:, k], minlength=len(self.groups)) for k in range(2)])
+
+    def planet_positions(self) -> np.ndarray:
+        """
+        metode som returnerer posisjonen til hver planet ut fra massesenteret og posisjonene til månene
+        """
+        return self.outer.state.pos[self.slots] - self.group_sums(self.q) / self.total[:, None]
+
+    def scatter(self, state) -> None:
+        """
+        metode som skriver den ytre tilstanden og månene tilbake til tilstanden
+        """
+        outer = self.outer.state
+        state.pos[self.outer_index] = outer.pos
+        state.vel[self.outer_index] = outer.vel
+        state.acc[self.outer_index] = outer.acc
+        planet_pos = self.planet_positions()
+        centre_vel = outer.vel[self.slots]
+        state.pos[self.planets] = planet_pos
+        state.vel[self.planets] = centre_vel - self.group_sums(self.p) / self.m0[:, None]
+        state.pos[self.moons] = self.q + planet_pos[self.moon_group]
+        state.vel[self.moons] = self.p + centre_vel[self.moon_group]
+        for k, group in enumerate(self.groups): # akselerasjonen som vises: massesenteret pluss gravitasjonen inne i systemet
+            state.acc[group] = outer.acc[self.slots[k]] + compute_accelerations(state.pos[group], state.mass[group], self.softening)
+        self.synced = (state.pos.copy(), state.vel.copy())
+
+    def kick(self, dt: float) -> None:
+        """
+        metode som oppdaterer farten til månene ut fra gravitasjonen mellom månene i samme system. Gravitasjonen fra planeten er med i Kepler banen
+        """
+        if len(self.moons) < 2:
+            return
+        d = self.q[None, :, :] - self.q[:, None, :] # avstandsvektor fra måne i til måne j
+        r2 = np.einsum("ijk,ijk->ij", d, d) + self.softening**2
+        w = np.where(self.same_group, GRAV_CONST / (np.where(self.same_group, r2, 1.0)**1.5), 0.0) * self.m[None, :] # G*m_j/r^3 for par i samme system
+        self.p += np.einsum("ij,ijk->ik", w, d) * dt
+
+    def drift(self, dt: float) -> None:
+        """
+        metode som flytter månene ut fra bevegelsen til planeten relativt til massesenteret
+        """
+        self.q += (self.group_sums(self.p) / self.m0[:, None])[self.moon_group] * dt
+
+    def tidal_kick(self, dt: float, source_pos: np.ndarray) -> None:
+        """
+        metode som oppdaterer farten til månene ut fra tidevannskraften fra legemene utenfor systemet: gravitasjonen på hver måne og på planeten minus gjennomsnittet for systemet, som allerede er med i den ytre integrasjonen.
+        source_pos er posisjonene til legemene med masse i den ytre tilstanden på tidspunktet kicket tas
+        """
+        planet_pos = source_pos[self.source_slots] - self.group_sums(self.q) / self.total[:, None] # posisjonen til hver planet
+        members = np.vstack((planet_pos, self.q + planet_pos[self.moon_group])) # posisjonene til planetene og månene
+        d = source_pos[None, :, :] - members[:, None, :] # avstandsvektor fra hvert legeme i systemene til hver kilde
+        r2 = np.einsum("ijk,ijk->ij", d, d) + self.softening**2
+        w = GRAV_CONST * self.source_mass / (np.where(self.own_centre, 1.0, r2)**1.5) # G*m/r^3 for hvert par
+        w[self.own_centre] = 0.0 # massesenteret til eget system er ikke en ytre kraft
+        acc = np.einsum("ij,ijk->ik", w, d)
+        mass = np.concatenate((self.m0, self.m))
+        mean = np.column_stack([np.bincount(self.member_group, weights=mass*acc[:, k], minlength=len(self.groups)) for k in range(2)]) / self.total[:, None] # gjennomsnittlig akselerasjon for hvert system
+        self.p += (acc[len(self.groups):] - mean[self.moon_group]) * dt # farten til planeten følger av at massesenteret ikke blir påvirket
+
+    def inner_step(self, dt: float) -> None:
+        """
+        metode som tar ett Wisdom-Holman steg for månene i alle systemene samtidig: halvt kick, halv drift, Kepler bane rundt planeten, halv drift og halvt kick
+        """
+        self.kick(dt/2)
+        self.drift(dt/2)
+        kepler_drift(self.q, self.p, GRAV_CONST*self.m0[self.moon_group], dt)
+        self.drift(dt/2)
+        self.kick(dt/2)
+
+    def inner_timestep(self, accuracy: float) -> float:
+        """
+        metode som velger det indre tidssteget ut fra den korteste banetidsskalaen |r|/|v| blant månene, på samme måte som Simulator.timestep
+        """
+        planet_vel = -self.group_sums(self.p) / self.m0[:, None] # farten til planetene relativt til massesenteret
+        u = self.p - planet_vel[self.moon_group] # farten til månene relativt til planeten
+        scale = np.hypot(self.q[:, 0], self.q[:, 1]) / np.maximum(np.hypot(u[:, 0], u[:, 1]), 1e-300)
+        return accuracy * WisdomHolman.timestep_factor * scale.min()
+
+    def timestep(self, state, accuracy: float, slowest: bool=False) -> int:
+        """
+        metode som velger det ytre tidssteget fra den ytre tilstanden, slik at månene ikke bestemmer tidssteget. Hvis slowest er True, er steget likevel ikke lengre enn TIDAL_STEP_FRACTION av banetidsskalaen til planetene med måner
+        """
+        self.gather(state)
+        dt = self.outer.timestep(accuracy, slowest)
+        if slowest:
+            outer = self.outer.state
+            speed = np.hypot(outer.vel[self.slots, 0], outer.vel[self.slots, 1])
+            acc = np.hypot(outer.acc[self.slots, 0], outer.acc[self.slots, 1])
+            dt = min(dt, max(1, int(TIDAL_STEP_FRACTION * np.min(speed / np.maximum(acc, 1e-300)))))
+        return dt
+
+    def step(self, state, integrator, dt: float, accuracy: float) -> None:
+        """
+        metode som flytter alle legemene ett ytre steg dt. Først tas det ytre steget med integratoren, så blir månene integrert med indre steg. Tidevannskraften blir lagt til som kick mellom hvert indre steg, med posisjonene til de ytre legemene interpolert mellom start og slutt av det ytre steget (kubisk Hermite interpolasjon).
+        Da kan det ytre steget være mye lengre enn omløpstiden til månene
+        """
+        self.gather(state)
+        outer = self.outer.state
+        sources = self.sources
+        start_pos, start_vel = outer.pos[sources].copy(), outer.vel[sources].copy() # de ytre legemene ved starten av steget
+        integrator.step(self.outer, dt) # den ytre integrasjonen med massesentrene
+        end_pos, end_vel = outer.pos[sources], outer.vel[sources] # de ytre legemene ved slutten av steget
+        n = max(1, int(np.ceil(abs(dt) / self.inner_timestep(accuracy)))) # antall indre steg
+
+        def source_pos(s: float) -> np.ndarray: # posisjonene til de ytre legemene en andel s inn i steget
+            return (2*s**3 - 3*s**2 + 1) * start_pos + (s**3 - 2*s**2 + s) * dt * start_vel + (3*s**2 - 2*s**3) * end_pos + (s**3 - s**2) * dt * end_vel
+
+        self.tidal_kick(dt/n/2, start_pos)
+        for k in range(1, n + 1):
+            self.inner_step(dt/n)
+            self.tidal_kick(dt/n if k < n else dt/n/2, source_pos(k/n) if k < n else end_pos) # to halve kick mellom hvert indre steg er slått sammen til ett
+        self.scatter(state)
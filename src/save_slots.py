@@ -0,0 +1,192 @@
+import datetime # importerer bibliotek for å gjøre om simuleringstid til dato
+import json # importerer bibliotek for å lagre indeksen som json
+import os # importerer bibliotek for å jobbe med filer
+import shutil # importerer bibliotek for å kopiere filer
+import threading # importerer bibliotek for å lagre i en egen tråd
+import time # importerer bibliotek for å måle tid
+from src.storage import Storage # importerer klassen som leser og skriver en snapshot fil
+from src.simulation import SystemState, DEFAULT_DATE # importerer tilstanden og datoen simuleringstiden regnes fra
+
+AUTOSAVE_INTERVAL = 30.0 # antall sekunder (virkelig tid) mellom hver autolagring
+AUTOSAVE_DEBOUNCE = 1.0 # antall sekunder autolagringen venter etter siste kopi før den skriver, slik at mange kopier rett etter hverandre blir en lagring
+
+
+class SaveSlots:
+    """
+    klasse som holder flere lagringsplasser (slots) med navn i en mappe. Hver slot er en egen snapshot fil, og en liten json indeks har dato, simuleringstid, antall legemer og når slotten ble lagret, slik at slottene kan listes uten å lese snapshot filene
+    """
+    def __init__(self, directory: str) -> None: # constructor
+        self.directory = directory # mappe med snapshot filer og indeks
+        self.index_path = os.path.join(directory, "index.json") # indeks
+        self.lock = threading.Lock() # indeksen kan bli skrevet fra både render loopen og autolagringen
+        self.storages: dict[str, Storage] = {} # slot -> Storage
+        os.makedirs(directory, exist_ok=True) # lager mappen hvis den ikke finnes
+
+    def path(self, slot: str) -> str:
+        """
+        metode som returnerer path til snapshot filen til slotten
+        """
+        return os.path.join(self.directory, slot + ".bin")
+
+    def storage(self, slot: str, legacy_json_path: str|None=None) -> Storage:
+        """
+        metode som returnerer Storage objektet til slotten
+        """
+        if slot not in self.storages:
+            self.storages[slot] = Storage(self.path(slot), legacy_json_path)
+            if legacy_json_path and slot not in self.read_index() and self.storages[slot].get(): # lagring fra eldre versjon som ble importert
+                self.update_index(slot, self.storages[slot].get()["time"], len(self.storages[slot].get()["names"]))
+        return self.storages[slot]
+
+    def read_index(self) -> dict[str, dict]:
+        """
+        metode som returnerer indeksen: slot -> {date, time, n_bodies, saved_at}. Leser bare indeksen, ikke snapshot filene
+        """
+        try:
+            with open(self.index_path) as f: # åpner indeksen
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError): # ingen eller ødelagt indeks
+            return {}
+
+    def latest(self) -> str|None:
+        """
+        metode som returnerer slotten som ble lagret sist, eller None hvis ingenting er lagret
+        """
+        slots = {slot: entry for slot, entry in self.read_index().items() if os.path.exists(self.path(slot))} # slotter som finnes på disk
+        return max(slots, key=lambda slot: slots[slot]["saved_at"]) if slots else None
+
+    def save(self, slot: str, state: SystemState, sim_time: float, dt_per_s: float, zoom: float, camera_offset) -> None:
+        """
+        metode som lagrer tilstanden i slotten og oppdaterer indeksen
+        """
+        self.storage(slot).update(state, sim_time, dt_per_s, zoom, camera_offset) # skriver snapshot filen
+        self.update_index(slot, sim_time, len(state))
+
+    def update_index(self, slot: str, sim_time: float, n_bodies: int) -> None:
+        """
+        metode som oppdaterer informasjonen om slotten i indeksen. Skriver til en midlertidig fil og bytter navn slik at indeksen aldri blir halvveis skrevet
+        """
+        with self.lock:
+            index = self.read_index()
+            index[slot] = {
+                "date": (DEFAULT_DATE + datetime.timedelta(seconds=sim_time)).isoformat(), # dato i simuleringen
+                "time": sim_time, # simuleringstid
+                "n_bodies": n_bodies, # antall legemer
+                "saved_at": time.time(), # når slotten ble lagret
+            }
+            self.write_index(index)
+
+    def write_index(self, index: dict) -> None:
+        """
+        metode som skriver indeksen til fil via en midlertidig fil
+        """
+        tmp_path = self.index_path + ".tmp" # midlertidig fil
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(tmp_path, self.index_path)
+
+    def copy(self, source: str, target: str) -> None:
+        """
+        metode som kopierer slotten source til target, f.eks for å ta vare på en simulering før en ny startes
+        """
+        if not os.path.exists(self.path(source)): # ingenting å kopiere
+            return
+        tmp_path = self.path(target) + ".tmp"
+        shutil.copyfile(self.path(source), tmp_path)
+        os.replace(tmp_path, self.path(target))
+        with self.lock:
+            index = self.read_index()
+            if source in index:
+                index[target] = dict(index[source])
+                self.write_index(index)
+
+    def archive(self, slots: list[str], target: str) -> None:
+        """
+        metode som flytter den nyeste av slots til target og sletter resten av slots. Brukes når en ny simulering startes, slik at den forrige simuleringen ikke blir borte
+        """
+        index = self.read_index()
+        saved = [slot for slot in slots if slot in index and os.path.exists(self.path(slot))] # slotter som er lagret
+        if saved:
+            self.copy(max(saved, key=lambda slot: index[slot]["saved_at"]), target) # tar vare på den nyeste
+        for slot in slots:
+            self.delete(slot)
+
+    def delete(self, slot: str) -> None:
+        """
+        metode som sletter slotten
+        """
+        self.storage(slot).clear() # sletter snapshot filen
+        with self.lock:
+            index = self.read_index()
+            if index.pop(slot, None) is not None:
+                self.write_index(index)
+
+
+class Autosaver:
+    """
+    klasse som lagrer tilstanden med jevne mellomrom i en egen tråd, slik at render loopen aldri venter på disken. Render loopen gir bare fra seg en kopi av tilstanden, og tråden skriver den når det ikke har kommet en nyere kopi på debounce sekunder.
+    Hvis simuleringstiden og kameraet er de samme som i forrige kopi, f.eks når simuleringen er pauset, blir det ikke laget noen ny kopi
+    """
+    def __init__(self, slots: SaveSlots, slot: str="autosave", interval: float=AUTOSAVE_INTERVAL, debounce: float=AUTOSAVE_DEBOUNCE) -> None: # constructor
+        self.slots = slots # lagringsplassene
+        self.slot = slot # slotten som autolagringen skriver til
+        self.interval = interval # sekunder mellom hver autolagring
+        self.debounce = debounce # sekunder uten nye kopier før det skrives
+        self.pending = None # siste kopi som ikke er skrevet enda
+        self.requested_at = 0.0 # når siste kopi ble gitt
+        self.last_key = None # simuleringstid, tidsendring per sekund, zoom og kamera i siste kopi
+        self.last_request = time.monotonic() # når render loopen sist ba om autolagring
+        self.condition = threading.Condition() # vekker tråden når det kommer en ny kopi
+        self.running = True # om tråden skal fortsette
+        self.thread = threading.Thread(target=self.run, daemon=True) # tråd som skriver til disk
+        self.thread.start()
+
+    def maybe_save(self, state: SystemState, sim_time: float, dt_per_s: float, zoom: float, camera_offset) -> None:
+        """
+        metode som kalles hver frame. Gir en kopi av tilstanden til tråden hvis det har gått interval sekunder siden forrige gang og noe er endret siden forrige kopi
+        """
+        if time.monotonic() - self.last_request >= self.interval and self.key(sim_time, dt_per_s, zoom, camera_offset) != self.last_key:
+            self.request(state, sim_time, dt_per_s, zoom, camera_offset)
+
+    @staticmethod
+    def key(sim_time: float, dt_per_s: float, zoom: float, camera_offset) -> tuple:
+        """
+        metode som returnerer det som avgjør om tilstanden er endret siden forrige kopi. Posisjonene endres bare når simuleringstiden endres, så de trenger ikke sammenlignes
+        """
+        return (sim_time, dt_per_s, zoom, float(camera_offset[0]), float(camera_offset[1]))
+
+    def request(self, state: SystemState, sim_time: float, dt_per_s: float, zoom: float, camera_offset) -> None:
+        """
+        metode som gir en kopi av tilstanden til tråden. En eldre kopi som ikke er skrevet enda blir erstattet
+        """
+        snapshot = (state.copy(), sim_time, dt_per_s, zoom, (camera_offset[0], camera_offset[1])) # kopi slik at render loopen kan fortsette å endre tilstanden
+        with self.condition:
+            self.pending = snapshot
+            self.last_key = self.key(sim_time, dt_per_s, zoom, camera_offset)
+            self.requested_at = time.monotonic()
+            self.last_request = self.requested_at
+            self.condition.notify()
+
+    def run(self) -> None:
+        """
+        metode som kjører i tråden. Venter på en kopi, venter til det ikke har kommet nye kopier på debounce sekunder og skriver den siste
+        """
+        while True:
+            with self.condition:
+                while self.pending is None and self.running: # venter på en kopi
+                    self.condition.wait()
+                while self.running and time.monotonic() - self.requested_at < self.debounce: # venter til det ikke kommer flere kopier
+                    self.condition.wait(self.debounce - (time.monotonic() - self.requested_at))
+                snapshot, self.pending = self.pending, None
+                if snapshot is None: # stoppet uten noe å skrive
+                    return
+            self.slots.save(self.slot, *snapshot) # skriver utenfor låsen slik at render loopen ikke venter
+
+    def close(self) -> None:
+        """
+        metode som stopper tråden. En kopi som ikke er skrevet enda blir skrevet før tråden avslutter
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
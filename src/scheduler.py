@@ -0,0 +1,88 @@
+import math # importerer bibliotek for å runde av til blokkgrensene
+import time # importerer bibliotek for å måle hvor lang tid fysikken bruker
+from typing import Callable
+
+PHYSICS_DT = 1200 # fast fysisk delsteg i sekunder simuleringstid. Alle steg har denne lengden uansett FPS og dt_per_s
+FRAME_BUDGET = 0.008 # maks antall sekunder (virkelig tid) fysikken kan bruke per frame
+MAX_FRAME_TIME = 0.25 # lengste frame tid som blir regnet med. Hindrer at simuleringen prøver å ta igjen lange pauser, f.eks når vinduet blir flyttet
+BATCH_SIZE = 8 # antall delsteg som tas før tiden sjekkes mot budsjettet
+SPEED_SMOOTHING = 0.1 # hvor raskt målt tidsendring per sekund følger nye målinger (0 til 1)
+
+
+class FixedStepScheduler:
+    """
+    klasse som bestemmer hvor mange fysiske delsteg som skal tas hver frame. Simuleringstid blir samlet opp i en akkumulator (dt_per_s ganger tiden framen tok), og så tas det så mange delsteg med fast lengde substep som det er plass til.
+    Siden alle steg har samme lengde, blir banene like uansett FPS. Hvis fysikken ikke rekker alle stegene innenfor budsjettet, blir resten kastet slik at simuleringen går saktere istedenfor at tidssteget blir større.
+    Hvis merge_steps er True, blir BATCH_SIZE delsteg tatt som ett langt steg som starter og slutter på et helt antall ganger substep*BATCH_SIZE simuleringstid. Brukes med integratorer som velger tidssteget til hvert legeme selv, slik at trege legemer ikke tar alle delstegene.
+    Stegene tas bare når hele blokken er samlet opp i akkumulatoren, slik at grensene mellom stegene ikke avhenger av hvor lang tid hver frame tok
+    """
+    def __init__(self, substep: int=PHYSICS_DT, budget: float=FRAME_BUDGET, merge_steps: bool=False) -> None: # constructor
+        self.substep = substep # lengden på hvert delsteg i sekunder
+        self.budget = budget # maks tid fysikken kan bruke per frame
+        self.merge_steps = merge_steps # om delstegene i en omgang tas som ett steg
+        self.accumulator = 0.0 # simuleringstid som ikke er integrert enda
+        self.falling_behind = False # True hvis fysikken ikke rakk alle stegene forrige frame
+        self.achieved_dt_per_s = 0.0 # målt tidsendring per sekund, glattet over flere frames
+
+    def reset(self) -> None:
+        """
+        metode som nullstiller akkumulatoren, f.eks når simuleringen blir pauset
+        """
+        self.accumulator = 0.0
+        self.falling_behind = False
+
+    def advance(self, frame_time: float, dt_per_s: float, step: Callable[[float, int], None], sim_time: float=0.0) -> int:
+        """
+        metode som tar de delstegene framen skal ha. frame_time er hvor mange sekunder (virkelig tid) framen tok, step(dt, n) tar n steg med lengde dt og sim_time er simuleringstiden før stegene. Returnerer antall delsteg som ble tatt
+        """
+        frame_time = min(frame_time, MAX_FRAME_TIME) # begrenser lange frames
+        self.accumulator += dt_per_s * frame_time # legger til simuleringstiden framen skal ha
+        direction = 1 if self.accumulator >= 0 else -1 # fram eller tilbake i tid
+        if self.merge_steps:
+            integrated, wanted = self.advance_blocks(direction, step, sim_time) # simuleringstid som ble integrert, og om det var flere hele blokker
+        else:
+            integrated, wanted = self.advance_substeps(direction, step)
+
+        self.accumulator -= integrated # trekker fra simuleringstiden som er integrert
+        self.falling_behind = wanted # fysikken rakk ikke alle stegene
+        if self.falling_behind: # kaster resten slik at simuleringen går saktere istedenfor å hope opp steg
+            self.accumulator = 0.0
+
+        if frame_time > 0: # oppdaterer målt tidsendring per sekund
+            measured = integrated / frame_time
+            self.achieved_dt_per_s += SPEED_SMOOTHING * (measured - self.achieved_dt_per_s)
+        return round(abs(integrated) / self.substep)
+
+    def advance_substeps(self, direction: int, step: Callable[[float, int], None]) -> tuple[float, bool]:
+        """
+        metode som tar hele delsteg så lenge det er tid igjen i budsjettet. Returnerer simuleringstiden som ble integrert og om det var delsteg igjen som ikke ble tatt
+        """
+        wanted = int(abs(self.accumulator) // self.substep) # antall hele delsteg som skal tas
+        done = 0 # antall delsteg som er tatt
+        start = time.perf_counter() # tidspunkt fysikken startet
+        while done < wanted and time.perf_counter() - start < self.budget: # tar steg så lenge det er tid igjen i budsjettet
+            n = min(BATCH_SIZE, wanted - done) # antall steg i denne omgangen
+            step(direction * self.substep, n) # tar n delsteg
+            done += n
+        return direction * done * self.substep, done < wanted
+
+    def advance_blocks(self, direction: int, step: Callable[[float, int], None], sim_time: float) -> tuple[float, bool]:
+        """
+        metode som tar ett steg per blokk med BATCH_SIZE delsteg. Blokkene ligger fast i simuleringstid, så det første steget etter et hopp går bare fram til neste blokkgrense. Returnerer simuleringstiden som ble integrert og om det var hele blokker igjen som ikke ble tatt
+        """
+        block = self.substep * BATCH_SIZE # lengden på en blokk
+        integrated = 0.0 # simuleringstid som er integrert
+        start = time.perf_counter() # tidspunkt fysikken startet
+        while True:
+            now = sim_time + integrated # simuleringstiden før neste steg
+            if direction > 0:
+                boundary = (math.floor(now / block + 1e-9) + 1) * block # neste blokkgrense framover
+            else:
+                boundary = (math.ceil(now / block - 1e-9) - 1) * block # neste blokkgrense bakover
+            dt = boundary - now
+            if abs(dt) > abs(self.accumulator - integrated): # blokken er ikke samlet opp enda
+                return integrated, False
+            if time.perf_counter() - start >= self.budget: # ikke mer tid i budsjettet
+                return integrated, True
+            step(dt, 1) # ett steg fram til blokkgrensen, integratoren deler det opp for hvert legeme
+            integrated += dt
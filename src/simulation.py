@@ -0,0 +1,185 @@
+from __future__ import annotations
+import datetime # importerer bibliotek for å bruke datoer i python
+import time # importerer bibliotek for å måle hvor lang tid som har gått
+from typing import Callable
+import numpy as np # importerer numpy for å holde tilstanden til alle legemer i arrays
+from src.physics import compute_direct_accelerations # importerer funksjon som regner ut akselerasjonen til alle legemer samtidig
+from src.barnes_hut import barnes_hut_accelerations, BARNES_HUT_THETA # importerer Barnes-Hut algoritmen for mange legemer
+from src.parallel_forces import shared_backend # importerer kraftberegning fordelt på flere prosesser
+from src.integrators import Integrator, get_integrator # importerer integratorene
+from src.satellites import SatelliteSystems # importerer integrasjonen av måner rundt planetene
+
+DEFAULT_DATE = datetime.date(2022, 1, 1) # dato som startverdiene til legemene er hentet fra
+
+SECONDS_PER_DAY = 86400 # antall sekunder i et døgn
+
+DEFAULT_INTEGRATOR = "euler" # navn på integratoren som brukes når simuleringen spilles av
+
+FAST_FORWARD_INTEGRATOR = "wisdom_holman" # navn på integratoren som brukes i fast forward. Brukes også for å vite om lagrede checkpoints er regnet ut med samme integrator
+
+FAST_FORWARD_ACCURACY = 0.1 # nøyaktighetsmål for fast forward. Tidssteget blir denne andelen av den korteste banetidsskalaen (|v|/|a|) blant legemene, ganget med timestep_factor til integratoren
+
+BARNES_HUT_THRESHOLD = 2000 # antall legemer der simulatoren bytter fra direkte summering til Barnes-Hut når solver er "auto"
+
+PROGRESS_INTERVAL = 0.05 # minste antall sekunder (virkelig tid) mellom hver gang fremdrift rapporteres under fast forward
+
+
+class SystemState:
+    """
+    klasse som holder den fysiske tilstanden til alle legemer som struct-of-arrays: ett array for masser, ett for posisjoner, ett for fartsvektorer og ett for akselerasjoner. Indeks i i alle arrayene hører til legeme nummer i. time er simuleringstiden i sekunder fra DEFAULT_DATE
+    """
+    def __init__(self, names: list[str]|None=None, mass=None, pos=None, vel=None, time: float=0) -> None: # constructor
+        self.names = list(names) if names else [] # navn til legemene
+        n = len(self.names) # antall legemer
+        self.mass = np.array(mass, dtype=np.float64) if mass is not None else np.zeros(n) # masser
+        self.pos = np.array(pos, dtype=np.float64).reshape(n, 2) if pos is not None else np.zeros((n, 2)) # posisjoner (x, y)
+        self.vel = np.array(vel, dtype=np.float64).reshape(n, 2) if vel is not None else np.zeros((n, 2)) # fartsvektorer (v_x, v_y)
+        self.acc = np.zeros((n, 2)) # akselerasjonsvektorer (a_x, a_y)
+        self.time = time # simuleringstid i sekunder fra DEFAULT_DATE
+
+    def __len__(self) -> int:
+        return len(self.names) # antall legemer
+
+    def add_body(self, name: str, mass: float, x: float, y: float, v_x: float, v_y: float) -> int:
+        """
+        metode for å legge til et legeme. Returnerer indeksen til legemet i arrayene
+        """
+        self.names.append(name) # legger til navn
+        self.mass = np.append(self.mass, mass) # legger til masse
+        self.pos = np.vstack((self.pos, (x, y))) # legger til posisjon
+        self.vel = np.vstack((self.vel, (v_x, v_y))) # legger til fartsvektor
+        self.acc = np.vstack((self.acc, (0.0, 0.0))) # legger til akselerasjonsvektor
+        return len(self.names) - 1 # returnerer indeksen til legemet
+
+    def copy(self) -> SystemState:
+        """
+        metode som returnerer en kopi av tilstanden som ikke deler arrays med originalen
+        """
+        state = SystemState(self.names, self.mass, self.pos, self.vel, self.time) # lager ny tilstand med kopier av arrayene
+        state.acc[:] = self.acc # kopierer akselerasjonene
+        return state
+
+
+class Simulator:
+    """
+    klasse som integrerer en SystemState framover eller bakover i tid. Bruker ikke pygame, og kan derfor brukes uten skjerm, f.eks på servere, i tester eller i andre prosesser.
+    solver bestemmer hvordan gravitasjonen regnes ut: "direct" summerer over alle par, "barnes_hut" bruker et quadtree, "parallel" summerer direkte fordelt på en prosess per kjerne (se src/parallel_forces.py), og "auto" bruker direkte summering opp til BARNES_HUT_THRESHOLD legemer og Barnes-Hut over det.
+    integrator er navnet på integratoren step() bruker (se src/integrators.py).
+    satellites er en liste med satellittsystemer, hvert gitt som indeksene til planeten og månene (se Catalog.satellite_groups). Månene blir da integrert rundt planeten sin med egne korte steg, og integratoren ser bare massesenteret til hvert system (se src/satellites.py)
+    """
+    def __init__(self, state: SystemState, softening: float=0.0, solver: str="auto", theta: float=BARNES_HUT_THETA, integrator: str=DEFAULT_INTEGRATOR, satellites: list[np.ndarray]|None=None) -> None: # constructor
+        self.state = state # tilstanden som integreres
+        self.softening = softening # mykningslengde i meter
+        self.solver = solver # "auto", "direct", "barnes_hut" eller "parallel"
+        self.theta = theta # åpningsvinkel for Barnes-Hut
+        self.integrator = get_integrator(integrator) # integratoren step() bruker
+        self.satellite_groups = satellites or [] # planet og måner i hvert satellittsystem
+        self.satellites = SatelliteSystems(self, self.satellite_groups) if self.satellite_groups else None # integrerer månene hvis det er noen
+
+    def subset(self, index: np.ndarray) -> Simulator:
+        """
+        metode som returnerer en simulator med de samme innstillingene for legemene med indeksene index. Tilstanden er en kopi
+        """
+        state = self.state
+        subset = SystemState([state.names[i] for i in index], state.mass[index], state.pos[index], state.vel[index], state.time)
+        return Simulator(subset, self.softening, self.solver, self.theta, self.integrator.name)
+
+    def advance(self, integrator: Integrator, dt: float, accuracy: float=FAST_FORWARD_ACCURACY) -> None:
+        """
+        metode som flytter tilstanden ett steg dt med integratoren. Hvis simulatoren har satellittsystemer, blir steget tatt med massesentrene, og månene blir integrert rundt planetene sine med indre steg valgt ut fra accuracy
+        """
+        if self.satellites:
+            self.satellites.step(self.state, integrator, dt, accuracy)
+        else:
+            integrator.step(self, dt)
+
+    def accelerations(self, pos: np.ndarray, mass: np.ndarray, out: np.ndarray|None=None) -> np.ndarray:
+        """
+        metode som regner ut akselerasjonen i posisjonene pos fra legemene med massene mass, med solveren til simulatoren. Brukes av integratorer som trenger akselerasjonen i andre posisjoner enn tilstanden
+        """
+        if self.solver == "parallel": # fordeler kraftberegningen på flere prosesser
+            return shared_backend().accelerations(pos, mass, self.softening, out=out)
+        if self.solver == "barnes_hut" or (self.solver == "auto" and np.count_nonzero(mass) > BARNES_HUT_THRESHOLD): # mange legemer med masse
+            return barnes_hut_accelerations(pos, mass, self.theta, self.softening, out=out) # regner ut akselerasjonene med Barnes-Hut. Treet har bare legemer med masse
+        return compute_direct_accelerations(pos, mass, self.softening, out=out) # regner ut akselerasjonene direkte. Testpartikler uten masse blir trukket på, men er ikke med i summen
+
+    def update_aks(self) -> None:
+        """
+        metode for å oppdatere akselerasjonsvektoren til alle legemer
+        """
+        self.accelerations(self.state.pos, self.state.mass, out=self.state.acc) # regner ut akselerasjonene og skriver dem direkte til state.acc
+
+    def timestep(self, accuracy: float=FAST_FORWARD_ACCURACY, slowest: bool=False) -> int:
+        """
+        metode som velger et tidssteg i hele sekunder ut fra et nøyaktighetsmål. For en bane er |v|/|a| omtrent omløpstiden delt på 2*pi, så tidssteget blir accuracy ganger den korteste banetidsskalaen blant legemene.
+        Hvis slowest er True brukes den lengste banetidsskalaen istedenfor, for integratorer som deler opp steget for de raske legemene selv. Med satellittsystemer bestemmer ikke månene tidssteget
+        """
+        if self.satellites:
+            return self.satellites.timestep(self.state, accuracy, slowest)
+        self.update_aks() # regner ut akselerasjonene for nåværende posisjoner
+        speed = np.hypot(self.state.vel[:, 0], self.state.vel[:, 1]) # banefart
+        acc = np.hypot(self.state.acc[:, 0], self.state.acc[:, 1]) # baneakselerasjon
+        moving = acc > 0 # legemer uten akselerasjon har ingen banetidsskala
+        if not moving.any(): # hvis ingen legemer akselererer
+            return SECONDS_PER_DAY # bruk ett døgn som tidssteg
+        scales = speed[moving] / acc[moving] # banetidsskalaen til hvert legeme
+        return max(1, int(accuracy * (np.max(scales) if slowest else np.min(scales)))) # returnerer tidssteget, minst ett sekund
+
+    def fast_forward(self, target_time: int, accuracy: float=FAST_FORWARD_ACCURACY, progress: Callable[[float], bool]|None=None, integrator: str|Integrator=FAST_FORWARD_INTEGRATOR) -> bool:
+        """
+        metode som integrerer tilstanden direkte fram (eller tilbake) til simuleringstiden target_time uten å oppdatere noe som har med skjermen å gjøre. Klokken er et heltall sekunder fra DEFAULT_DATE, og tidssteget velges ut fra accuracy.
+        integrator er integratoren (eller navnet på den) som brukes. Standard er Wisdom-Holman, som følger banene rundt sola nøyaktig og bare regner forstyrrelsene fra planetene i kick, slik at tidssteget kan være mye lengre enn med leapfrog ved samme nøyaktighet.
+        progress blir kalt med andelen som er ferdig (0 til 1). Hvis progress returnerer False avbrytes integrasjonen og metoden returnerer False. Returnerer True når target_time er nådd
+        """
+        if isinstance(integrator, str): # lager integratoren ut fra navnet
+            integrator = get_integrator(integrator)
+        state = self.state
+        state.time = int(state.time) # bruker heltall sekunder som klokke
+        start_time = state.time # tiden integrasjonen starter fra
+        total = abs(target_time - start_time) # hvor langt det skal integreres
+        integrator.set_accuracy(accuracy) # integratorer som velger tidssteget til hvert legeme selv bruker nøyaktighetsmålet direkte, dt er da bare hvor ofte alle legemene synkroniseres
+        dt = self.timestep(accuracy * integrator.timestep_factor, slowest=integrator.individual_timesteps) # velger tidssteg ut fra nøyaktighetsmålet og hvor store steg integratoren tåler
+        chunk = 1 if integrator.individual_timesteps else 64 # antall steg før fremdrift sjekkes. Steg med individuelle tidssteg er lange, så fremdrift sjekkes etter hvert steg
+        if target_time < start_time: # integrerer bakover i tid
+            dt = -dt
+        last_report = time.perf_counter() # tidspunkt fremdrift sist ble rapportert
+
+        while state.time != target_time: # looper så lenge vi ikke er på riktig tid
+            remaining = target_time - state.time # tid som gjenstår
+            n = abs(remaining) // abs(dt) # antall hele tidssteg som gjenstår
+            if n == 0: # siste steg er kortere enn dt slik at vi lander nøyaktig på target_time
+                n, step_dt = 1, remaining
+            else:
+                n, step_dt = min(n, chunk), dt # tar maks chunk steg før fremdrift sjekkes
+            for _ in range(n):
+                self.advance(integrator, step_dt, accuracy) # ett steg med integratoren
+            state.time += n*step_dt # oppdaterer klokken
+
+            if progress and time.perf_counter() - last_report > PROGRESS_INTERVAL: # rapporterer fremdrift med jevne mellomrom
+                last_report = time.perf_counter()
+                if progress(abs(state.time - start_time)/total) == False: # hvis progress ber om å avbryte
+                    return False
+        return True
+
+    def step(self, dt: float, n: int=1) -> None:
+        """
+        metode som tar n tidssteg med lengde dt med integratoren til simulatoren. Standard er semi-implisitt Euler: først oppdateres akselerasjonen, så fartsvektoren og til slutt posisjonen
+        """
+        for _ in range(n): # tar n tidssteg
+            self.advance(self.integrator, dt) # flytter posisjoner og fartsvektorer ett steg
+            self.state.time += dt # oppdaterer simuleringstiden
+
+
+def date_to_seconds(date: datetime.date) -> int:
+    """
+    funksjon som gjør om en dato til simuleringstid, altså et heltall sekunder fra DEFAULT_DATE
+    """
+    return (date - DEFAULT_DATE).days * SECONDS_PER_DAY
+
+
+def init_system_state() -> SystemState:
+    """
+    funksjon som lager tilstanden til solsystemet 1 januar 2022 fra standardkatalogen (data/catalog.csv)
+    """
+    from src.catalog import load_catalog # importeres her fordi src.catalog importerer SystemState fra denne modulen
+    return load_catalog().state # returnerer tilstanden
@@ -1,57 +1,130 @@
 import json
+import os
+import struct
+import numpy as np
 
-class Storage: 
+MAGIC = b"SOLSIM" # de første bytene i filen, brukes for å kjenne igjen formatet
+VERSION = 1 # versjon av formatet. Endres hvis formatet endres
+HEADER = struct.Struct("<6sHI5dI") # magic, versjon, antall legemer, tid, tidsendring per s, zoom, kamera offset x og y, antall bytes med navn
+
+class Storage:
     """
-    klasse for å lagre data til json fil for å huske simulering state, og å hente ut data igjen
+    klasse for å lagre simulering state til en binær fil, og å hente ut data igjen. Filen har en header med klokke og kamera, navnene til legemene og så masser, posisjoner og fartsvektorer som float64 arrays.
+    Filen skrives først til en midlertidig fil som så får riktig navn, slik at en krasj midt i lagringen aldri gir en halvveis skrevet fil. Filen leses bare en gang og holdes i minnet så lenge den ikke er endret på disk.
+    Data kan også importeres fra og eksporteres til det gamle json formatet
     """
-    def __init__(self, path) -> None: # constructor
-        self.file_path =  path # file path for stored data 
-       
-    def get(self) -> str|None:  
-        """ 
-        henter cache data 
-        """
-        try: 
-            with open(self.file_path) as f: # åpner fil 
-                json_str = f.read() # leser innnhold i fil
-                if json_str == "": # hvis innhold er tomt, returner ingenting
-                    return None 
-                else: 
-                    return json.loads(json_str) # hvis innhold, parse json string og convert til python dictionary og returner 
-        
-        except FileNotFoundError: 
+    def __init__(self, path: str, legacy_json_path: str|None=None) -> None: # constructor
+        self.file_path = path # file path for stored data
+        self.legacy_json_path = legacy_json_path # json fil fra eldre versjoner som importeres hvis den binære filen ikke finnes
+        self.cache = None # data som er lest fra filen
+        self.cache_key = None # (mtime, størrelse) til filen da den ble lest
+        if legacy_json_path and not os.path.exists(path) and os.path.exists(legacy_json_path): # importerer gammel lagring
+            self.import_json(legacy_json_path)
+
+    def get(self) -> dict|None:
+        """
+        henter lagret data som en dictionary med names, mass, pos, vel, time, dt_per_s, zoom og camera_offset, eller None hvis ingenting er lagret
+        """
+        try:
+            stat = os.stat(self.file_path) # mtime og størrelse
+        except FileNotFoundError:
+            self.cache, self.cache_key = None, None
             return None
-            
-    def update(self, space_objects, time, dt_per_s, zoom, camera_offset) -> None: 
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key != self.cache_key: # filen er endret siden den ble lest, eller er ikke lest enda
+            with open(self.file_path, "rb") as f: # åpner fil i binær modus
+                self.cache = self.decode(f.read()) # leser og dekoder innhold
+            self.cache_key = key
+        return self.cache
+
+    @staticmethod
+    def decode(raw: bytes) -> dict|None:
         """
-        oppdater data i storage
+        metode som gjør om innholdet i en binær fil til en dictionary. Returnerer None hvis filen er tom eller ikke har riktig format
         """
-        space_objects_data_arr = [] # liste for å holde data om space objects
-        for space_object in space_objects: # looper igjennom alle space objects
-            space_object_data = { # all data som lagres om hver av space_objects 
-            "name": space_object.name, # navn
-            "x": space_object.x, # x koordinat
-            "y": space_object.y, # y koordinat
-            "v_x": space_object.v_x, # fartsvektor
-            "v_y": space_object.v_y, # fartsvektor
-            }
-            space_objects_data_arr.append(space_object_data) # appender data til liste
-            
-        data = { # data som skal lagres
-            "space_objects": space_objects_data_arr, # liste med data for hver space_object
-            "time": time, # simuleringstid 
-            "dt_per_s": dt_per_s, # tidsendring per s 
+        if len(raw) < HEADER.size: # tom eller ødelagt fil
+            return None
+        magic, version, n, time, dt_per_s, zoom, offset_x, offset_y, names_size = HEADER.unpack_from(raw)
+        if magic != MAGIC or version != VERSION or len(raw) != HEADER.size + names_size + n * 5 * 8: # annet format eller ødelagt fil
+            return None
+        try:
+            names = raw[HEADER.size:HEADER.size + names_size].decode("utf-8").split("\n") if n else [] # navn
+        except UnicodeDecodeError: # ødelagte navn
+            return None
+        if len(names) != n: # antall navn passer ikke med antall legemer
+            return None
+        arrays = np.frombuffer(raw, dtype="<f8", offset=HEADER.size + names_size) # masser, posisjoner og fartsvektorer
+        return {
+            "names": names, # navn
+            "mass": arrays[:n], # masser
+            "pos": arrays[n:3*n].reshape(n, 2), # posisjoner
+            "vel": arrays[3*n:].reshape(n, 2), # fartsvektorer
+            "time": time, # simuleringstid
+            "dt_per_s": dt_per_s, # tidsendring per s
             "zoom": zoom, # kamera zoom
-            "camera_offset": [camera_offset.x, camera_offset.y] # camera offset
+            "camera_offset": [offset_x, offset_y], # camera offset
         }
-        
-        with open(self.file_path, "w") as f: # åpner fil i write modus
-           json.dump(data, f) # lagrer python dictionary som json i fil 
 
-    def clear(self) -> None: 
+    def update(self, state, time, dt_per_s, zoom, camera_offset) -> None:
         """
-        metode for å slette all lagret data
+        oppdater data i storage. state er SystemState med tilstanden til alle legemer
+        """
+        self.save(state.names, state.mass, state.pos, state.vel, time, dt_per_s, zoom, camera_offset)
+
+    def save(self, names, mass, pos, vel, time, dt_per_s, zoom, camera_offset) -> None:
+        """
+        metode som pakker tilstand, klokke og kamera i det binære formatet og skriver det til filen
         """
-        with open(self.file_path, "w") as f: # åpner fil i write modus
-            f.write("") # oppdaterer innhold til tomt 
+        names = "\n".join(names).encode("utf-8") # navn
+        header = HEADER.pack(MAGIC, VERSION, len(mass), time, dt_per_s, zoom, camera_offset[0], camera_offset[1], len(names))
+        arrays = [np.ascontiguousarray(a, dtype="<f8").tobytes() for a in (mass, pos, vel)] # masser, posisjoner og fartsvektorer
+        self.write(b"".join([header, names, *arrays]))
 
+    def write(self, raw: bytes) -> None:
+        """
+        metode som skriver raw til filen via en midlertidig fil og bytter navn, slik at filen aldri blir halvveis skrevet
+        """
+        tmp_path = self.file_path + ".tmp" # midlertidig fil
+        with open(tmp_path, "wb") as f: # åpner midlertidig fil i binær write modus
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno()) # sørger for at innholdet er på disk før filen får nytt navn
+        os.replace(tmp_path, self.file_path) # bytter ut gammel fil med ny
+        self.cache, self.cache_key = None, None # leses på nytt neste gang
+
+    def export_json(self, path: str) -> None:
+        """
+        metode for å eksportere lagret data til json i samme format som eldre versjoner brukte
+        """
+        data = self.get()
+        space_objects_data_arr = [] # liste for å holde data om space objects
+        if data:
+            for name, (x, y), (v_x, v_y) in zip(data["names"], data["pos"].tolist(), data["vel"].tolist()):
+                space_objects_data_arr.append({"name": name, "x": x, "y": y, "v_x": v_x, "v_y": v_y})
+        with open(path, "w") as f: # åpner fil i write modus
+            if data:
+                json.dump({"space_objects": space_objects_data_arr, "time": data["time"], "dt_per_s": data["dt_per_s"], "zoom": data["zoom"], "camera_offset": data["camera_offset"]}, f) # lagrer python dictionary som json i fil
+
+    def import_json(self, path: str) -> None:
+        """
+        metode for å importere lagret data fra json i formatet eldre versjoner brukte. Masser er ikke med i json formatet og blir lagret som 0
+        """
+        with open(path) as f: # åpner fil
+            json_str = f.read() # leser innnhold i fil
+        if json_str == "": # hvis innhold er tomt, er det ingenting å importere
+            self.clear()
+            return
+        data = json.loads(json_str)
+        objects = data["space_objects"] # liste med data for hver space_object
+        names = [o["name"] for o in objects] # navn
+        pos = np.array([(o["x"], o["y"]) for o in objects], dtype=np.float64).reshape(-1, 2) # posisjoner
+        vel = np.array([(o["v_x"], o["v_y"]) for o in objects], dtype=np.float64).reshape(-1, 2) # fartsvektorer
+        self.save(names, np.zeros(len(objects)), pos, vel, data["time"], data["dt_per_s"], data["zoom"], data["camera_offset"])
+
+    def clear(self) -> None:
+        """
+        metode for å slette all lagret data
+        """
+        if os.path.exists(self.file_path): # sletter filen
+            os.remove(self.file_path)
+        self.cache, self.cache_key = None, None
@@ -0,0 +1,69 @@
+from collections import OrderedDict # importerer ordnet dict som brukes som LRU cache
+import pygame # importerer pygame for å laste inn og skalere bilder
+
+TEXTURE_CACHE_BYTES = 32 * 1024 * 1024 # maks antall bytes skalerte bilder kan bruke i cachen
+MIN_LEVEL_SIZE = 4 # minste bredde eller høyde på et nivå i pyramiden
+
+
+class TextureCache:
+    """
+    klasse som holder bilder i minnet slik at de bare blir lest fra disk og dekodet en gang. For hvert bilde lages en pyramide med nivåer som er halvparten så store som nivået over (mipmap).
+    Skalerte bilder blir lagret i en LRU cache med en grense for hvor mye minne de kan bruke. Når en ny størrelse trengs, blir den skalert fra det minste nivået i pyramiden som er minst like stort, slik at det går raskt og ser bra ut også når bildet blir mye mindre
+    """
+    def __init__(self, max_bytes: int=TEXTURE_CACHE_BYTES) -> None: # constructor
+        self.max_bytes = max_bytes # maks antall bytes for skalerte bilder
+        self.pyramids: dict[str, list[pygame.Surface]] = {} # path -> nivåer i pyramiden, fra originalt bilde og nedover
+        self.scaled: OrderedDict[tuple[str, int, int], pygame.Surface] = OrderedDict() # (path, bredde, høyde) -> skalert bilde. Sist brukte ligger sist
+        self.bytes = 0 # antall bytes skalerte bilder bruker nå
+
+    def pyramid(self, img_path: str) -> list[pygame.Surface]:
+        """
+        metode som returnerer pyramiden til bildet. Bildet blir lest fra disk første gang
+        """
+        levels = self.pyramids.get(img_path)
+        if levels is None:
+            image = pygame.image.load(img_path).convert_alpha() # laster inn bildet en gang
+            levels = [image]
+            w, h = image.get_size()
+            while w // 2 >= MIN_LEVEL_SIZE and h // 2 >= MIN_LEVEL_SIZE: # halverer til bildet blir for lite
+                w, h = w // 2, h // 2
+                levels.append(pygame.transform.smoothscale(levels[-1], (w, h)))
+            self.pyramids[img_path] = levels
+        return levels
+
+    def get(self, img_path: str, size: tuple[float, float]) -> pygame.Surface:
+        """
+        metode som returnerer bildet skalert til size. Størrelsen blir rundet ned til hele piksler, slik at alle zoom nivåer som gir samme størrelse deler samme bilde
+        """
+        w, h = max(1, int(size[0])), max(1, int(size[1])) # størrelse i hele piksler
+        key = (img_path, w, h)
+        image = self.scaled.get(key)
+        if image is not None: # finnes i cachen
+            self.scaled.move_to_end(key) # sist brukt
+            return image
+
+        levels = self.pyramid(img_path)
+        source = levels[0] # originalt bilde hvis ingen nivåer er store nok
+        for level in levels: # finner det minste nivået som er minst like stort
+            if level.get_width() < w or level.get_height() < h:
+                break
+            source = level
+        image = source if source.get_size() == (w, h) else pygame.transform.smoothscale(source, (w, h)) # skalerer fra nivået
+
+        self.scaled[key] = image # legger til i cachen
+        self.bytes += w * h * 4
+        while self.bytes > self.max_bytes and len(self.scaled) > 1: # fjerner bildene som er brukt minst nylig til cachen er under grensen
+            (_, old_w, old_h), _ = self.scaled.popitem(last=False)
+            self.bytes -= old_w * old_h * 4
+        return image
+
+    def clear(self) -> None:
+        """
+        metode som tømmer cachen
+        """
+        self.pyramids.clear()
+        self.scaled.clear()
+        self.bytes = 0
+
+
+textures = TextureCache() # felles cache for alle bilder i programmet
@@ -0,0 +1,72 @@
+import numpy as np # importerer numpy for å lagre og transformere banene som arrays
+import pygame # importerer pygame for å tegne banene
+
+TRAIL_CAPACITY = 2048 # maks antall punkter i banen til hvert legeme
+TRAIL_SAMPLE_SECONDS = 86400 # simuleringstid mellom hvert punkt i banen
+TRAIL_MIN_SEGMENT = 2.0 # minste lengde i piksler på en linje i banen. Punkter som ligger tettere blir hoppet over når man zoomer ut
+
+
+class OrbitTrails:
+    """
+    klasse som holder banen til alle legemer i en ringbuffer med fast størrelse, slik at minnebruken er den samme uansett hvor lenge simuleringen kjører. Et nytt punkt blir lagt til hver gang simuleringstiden har endret seg med sample_interval, uavhengig av FPS.
+    Banene tegnes med en pygame.draw.lines per legeme etter at alle punktene er gjort om til skjermkoordinater samtidig
+    """
+    def __init__(self, n_bodies: int, capacity: int=TRAIL_CAPACITY, sample_interval: float=TRAIL_SAMPLE_SECONDS) -> None: # constructor
+        self.capacity = capacity # maks antall punkter per legeme
+        self.sample_interval = sample_interval # simuleringstid mellom hvert punkt
+        self.points = np.zeros((n_bodies, capacity, 2)) # ringbuffer med posisjoner (legeme, punkt, x/y)
+        self.head = 0 # indeksen neste punkt skrives til
+        self.count = 0 # antall punkter som er lagret
+        self.last_time = None # simuleringstiden til siste punkt
+
+    def clear(self) -> None:
+        """
+        metode som sletter alle punktene, f.eks etter et hopp i tid
+        """
+        self.head = 0
+        self.count = 0
+        self.last_time = None
+
+    def record(self, pos: np.ndarray, time: float) -> None:
+        """
+        metode som legger til posisjonene som et nytt punkt hvis simuleringstiden har endret seg med minst sample_interval siden forrige punkt
+        """
+        if self.last_time is not None and abs(time - self.last_time) < self.sample_interval: # for kort tid siden forrige punkt
+            return
+        if len(pos) != len(self.points): # antall legemer er endret
+            self.points = np.zeros((len(pos), self.capacity, 2))
+            self.clear()
+        self.points[:, self.head] = pos # skriver over det eldste punktet
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.last_time = time
+
+    def ordered(self) -> np.ndarray:
+        """
+        metode som returnerer punktene fra eldst til nyest som et (legemer, punkter, 2) array
+        """
+        if self.count < self.capacity: # bufferen er ikke full enda
+            return self.points[:, :self.count]
+        return np.concatenate((self.points[:, self.head:], self.points[:, :self.head]), axis=1)
+
+    def draw(self, surface: pygame.Surface, colors: list[tuple[int, int, int]], current_pos: np.ndarray, scale: float, center: tuple[float, float], offset: pygame.math.Vector2) -> None:
+        """
+        metode som tegner banene. Punktene gjøres om fra virkelige koordinater til skjermkoordinater med samme formel som romobjektene (scale er CONVERT ganger zoom), og banene slutter i posisjonen legemene har nå
+        """
+        if self.count == 0: # ingenting å tegne
+            return
+        world = np.concatenate((self.ordered(), current_pos[:, None, :]), axis=1) # punktene og posisjonen nå
+        screen = np.empty_like(world) # skjermkoordinater
+        screen[..., 0] = world[..., 0] * scale + center[0] - offset.x
+        screen[..., 1] = -world[..., 1] * scale + center[1] - offset.y
+        segment = np.hypot(*np.diff(screen, axis=1).transpose(2, 0, 1)).mean(axis=1) # gjennomsnittlig lengde på linjene i piksler for hvert legeme
+        lo, hi = screen.min(axis=1), screen.max(axis=1) # området hver bane dekker
+        width, height = surface.get_size()
+        visible = (hi[:, 0] >= 0) & (lo[:, 0] < width) & (hi[:, 1] >= 0) & (lo[:, 1] < height) # baner som er innenfor skjermen
+
+        for body in np.flatnonzero(visible): # en linje per legeme som kan synes
+            points = screen[body]
+            stride = max(1, int(TRAIL_MIN_SEGMENT / segment[body])) if segment[body] > 0 else len(points) # hopper over punkter som ligger tettere enn TRAIL_MIN_SEGMENT
+            points = points[::-1][::stride][::-1] # tar med det nyeste punktet, og hvert stride punkt bakover
+            if len(points) >= 2:
+                pygame.draw.lines(surface, colors[body], False, points.tolist())
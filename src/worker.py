@@ -0,0 +1,196 @@
+from __future__ import annotations
+import multiprocessing # importerer bibliotek for å kjøre fysikken i en egen prosess
+import queue # importerer bibliotek for kø mellom tråder
+import threading # importerer bibliotek for å kjøre fysikken i en egen tråd når prosess ikke er mulig
+import time # importerer bibliotek for å måle tid
+from multiprocessing import shared_memory # importerer delt minne slik at tilstanden kan leses uten å sendes gjennom en kø
+import numpy as np # importerer numpy for å lese og skrive tilstanden i det delte minnet
+from src.simulation import Simulator, SystemState, DEFAULT_INTEGRATOR # importerer simuleringskjernen
+from src.scheduler import FixedStepScheduler, PHYSICS_DT # importerer scheduler som tar fysiske steg med fast lengde
+
+SNAPSHOT_INTERVAL = 1/120 # antall sekunder mellom hver gang workeren publiserer tilstanden
+HEADER_SIZE = 5 # antall tall før tilstanden i hver buffer: sekvensnummer, simuleringstid, tidspunkt, målt tidsendring per sekund og om fysikken henger etter
+
+
+class SnapshotBuffer:
+    """
+    klasse for en dobbel buffer i delt minne. Workeren skriver alltid til bufferen som ikke er den nyeste og bytter så hvilken som er nyest, slik at den som leser alltid har en hel tilstand å lese.
+    Hver buffer har et sekvensnummer som er oddetall mens bufferen blir skrevet til, slik at den som leser kan oppdage at bufferen ble endret underveis og prøve på nytt
+    """
+    def __init__(self, n_bodies: int, name: str|None=None) -> None: # constructor
+        self.n_bodies = n_bodies # antall legemer
+        self.buffer_size = HEADER_SIZE + n_bodies * 6 # antall tall per buffer: header, posisjon, fart og akselerasjon
+        size = (1 + 2 * self.buffer_size) * 8 # antall bytes: hvilken buffer som er nyest og to buffere
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size) # delt minne
+        self.owner = name is None # den som lager minnet må også slette det
+        self.data = np.ndarray(1 + 2 * self.buffer_size, dtype=np.float64, buffer=self.shm.buf) # numpy array over det delte minnet
+        if self.owner:
+            self.data[:] = 0 # nullstiller
+            self.data[0] = -1 # ingen tilstand er publisert enda
+
+    def buffer(self, i: int) -> np.ndarray:
+        """
+        metode som returnerer buffer nummer i
+        """
+        start = 1 + i * self.buffer_size
+        return self.data[start:start + self.buffer_size]
+
+    def write(self, state: SystemState, wall_time: float, achieved_dt_per_s: float, falling_behind: bool) -> None:
+        """
+        metode som skriver tilstanden til bufferen som ikke er den nyeste, og gjør den til den nyeste
+        """
+        i = 1 if self.data[0] == 0 else 0 # bufferen som ikke er den nyeste
+        buf = self.buffer(i)
+        buf[0] += 1 # oddetall: skriving pågår
+        buf[1:HEADER_SIZE] = (state.time, wall_time, achieved_dt_per_s, falling_behind)
+        n = self.n_bodies
+        buf[HEADER_SIZE:HEADER_SIZE + 2*n] = state.pos.ravel() # posisjoner
+        buf[HEADER_SIZE + 2*n:HEADER_SIZE + 4*n] = state.vel.ravel() # fartsvektorer
+        buf[HEADER_SIZE + 4*n:] = state.acc.ravel() # akselerasjonsvektorer
+        buf[0] += 1 # partall: skriving ferdig
+        self.data[0] = i # bufferen er nå den nyeste
+
+    def read(self) -> np.ndarray|None:
+        """
+        metode som returnerer en kopi av den nyeste bufferen, eller None hvis ingenting er publisert enda
+        """
+        while True:
+            i = int(self.data[0]) # den nyeste bufferen
+            if i < 0: # ingenting er publisert
+                return None
+            buf = self.buffer(i)
+            seq = buf[0] # sekvensnummer før kopiering
+            copy = buf.copy() # kopierer bufferen
+            if seq % 2 == 0 and buf[0] == seq: # bufferen ble ikke endret mens den ble kopiert
+                return copy
+
+    def close(self) -> None:
+        """
+        metode som lukker det delte minnet, og sletter det hvis denne bufferen laget det
+        """
+        del self.data # numpy arrayet må slettes før minnet kan lukkes
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def run_worker(shm_name: str, names: list[str], mass: np.ndarray, pos: np.ndarray, vel: np.ndarray, start_time: float, dt_per_s: float, substep: int, integrator: str, satellites: list[np.ndarray], solver: str, commands) -> None:
+    """
+    funksjon som kjører i workeren. Integrerer tilstanden med fast delsteg, publiserer tilstanden til det delte minnet og håndterer kommandoer fra køen
+    """
+    simulator = Simulator(SystemState(names, mass, pos, vel, start_time), solver=solver, integrator=integrator, satellites=satellites) # simulator med samme solver, integrator og satellittsystemer som i render loopen
+    scheduler = FixedStepScheduler(substep, budget=SNAPSHOT_INTERVAL, merge_steps=simulator.integrator.individual_timesteps) # fysikken kan bruke hele tiden mellom to publiseringer
+    snapshots = SnapshotBuffer(len(names), name=shm_name) # delt minne
+    paused = False # om simuleringen er pauset
+    last = time.monotonic() # tidspunkt for forrige steg
+    snapshots.write(simulator.state, last, 0.0, False) # publiserer starttilstanden
+
+    while True:
+        ### håndterer kommandoer
+        while True:
+            try:
+                command, args = commands.get_nowait() # henter neste kommando uten å vente
+            except queue.Empty: # ingen flere kommandoer
+                break
+            if command == "stop": # avslutter workeren
+                snapshots.close()
+                return
+            elif command == "pause": # pauser simuleringen
+                paused = True
+                scheduler.reset()
+            elif command == "resume": # fortsetter simuleringen
+                paused = False
+            elif command == "speed": # ny tidsendring per sekund
+                dt_per_s = args[0]
+
+        ### integrerer
+        now = time.monotonic()
+        if not paused:
+            scheduler.advance(now - last, dt_per_s, simulator.step, simulator.state.time) # tar delstegene som hører til tiden som har gått
+        last = now
+        snapshots.write(simulator.state, now, scheduler.achieved_dt_per_s, scheduler.falling_behind) # publiserer tilstanden
+
+        sleep = SNAPSHOT_INTERVAL - (time.monotonic() - now) # venter resten av intervallet
+        if sleep > 0:
+            time.sleep(sleep)
+
+
+class PhysicsWorker:
+    """
+    klasse som kjører integrasjonen i en egen prosess (eller tråd hvis prosess med fork ikke er mulig på plattformen), slik at en tung fysikk-frame ikke stopper input og tegning.
+    Workeren publiserer tilstanden i delt minne, og render loopen leser den nyeste tilstanden og interpolerer posisjonene mellom de to siste tilstandene. Kommandoer som pause og ny tidsendring per sekund blir sendt over en kø. Ved hopp til en ny dato eller reset blir workeren stoppet og en ny startet med den nye tilstanden
+    """
+    def __init__(self, state: SystemState, dt_per_s: float, substep: int=PHYSICS_DT, integrator: str=DEFAULT_INTEGRATOR, satellites: list[np.ndarray]|None=None, solver: str="auto") -> None: # constructor
+        self.state = state # tilstanden som render loopen leser fra. Blir oppdatert av update_state() med posisjoner interpolert for visning
+        self.latest_state = state.copy() # nøyaktig den nyeste tilstanden workeren publiserte. Det er denne som skal lagres og tas opp, ikke den interpolerte
+        self.snapshots = SnapshotBuffer(len(state)) # delt minne
+        self.use_process = "fork" in multiprocessing.get_all_start_methods() # bruker prosess hvis fork er mulig. Med spawn ville simulering.py blitt importert på nytt og åpnet et nytt vindu
+        if self.use_process:
+            context = multiprocessing.get_context("fork")
+            self.commands = context.Queue() # kommandokø mellom prosessene
+            target = context.Process
+        else:
+            self.commands = queue.Queue() # kommandokø mellom trådene
+            target = threading.Thread
+        self.worker = target(target=run_worker, args=(self.snapshots.shm.name, state.names, state.mass, state.pos, state.vel, state.time, dt_per_s, substep, integrator, satellites, solver, self.commands), daemon=True) # prosess eller tråd som kjører run_worker
+        self.previous = None # nest nyeste tilstand
+        self.latest = None # nyeste tilstand
+        self.falling_behind = False # om fysikken henger etter
+        self.achieved_dt_per_s = 0.0 # målt tidsendring per sekund
+        self.stopped = False # om workeren er stoppet
+
+    def start(self) -> None:
+        """
+        metode som starter workeren
+        """
+        self.worker.start()
+
+    def send(self, command: str, *args) -> None:
+        """
+        metode som sender en kommando til workeren. Kommandoer: "pause", "resume", "speed" (dt_per_s) og "stop"
+        """
+        self.commands.put((command, args))
+
+    def poll(self) -> None:
+        """
+        metode som leser den nyeste tilstanden fra det delte minnet. Hvis den er ny, blir den forrige tatt vare på slik at posisjonene kan interpoleres
+        """
+        snapshot = self.snapshots.read() # nyeste tilstand
+        if snapshot is None or (self.latest is not None and snapshot[2] == self.latest[2]): # ingenting nytt
+            return
+        self.previous, self.latest = self.latest, snapshot
+        self.achieved_dt_per_s = snapshot[3]
+        self.falling_behind = bool(snapshot[4])
+
+    def update_state(self, interpolate: bool=True) -> None:
+        """
+        metode som oppdaterer self.state fra de to nyeste tilstandene. Posisjoner, fartsvektorer, akselerasjoner og tid blir interpolert mellom dem ut fra hvor lang tid som har gått, slik at bevegelsen blir jevn selv om workeren publiserer i en annen takt enn skjermen tegnes.
+        Visningen ligger derfor ett publiseringsintervall etter workeren. self.latest_state blir satt til den nyeste tilstanden uten interpolasjon
+        """
+        self.poll()
+        if self.latest is None: # ingenting er publisert enda
+            return
+        n = len(self.state)
+        latest = self.latest[HEADER_SIZE:].reshape(3, n, 2) # posisjoner, fartsvektorer og akselerasjoner
+        self.latest_state.pos[:], self.latest_state.vel[:], self.latest_state.acc[:] = latest
+        self.latest_state.time = self.latest[1]
+        if interpolate and self.previous is not None and self.latest[2] > self.previous[2]: # interpolerer mellom de to siste tilstandene
+            alpha = min(max((time.monotonic() - self.latest[2]) / (self.latest[2] - self.previous[2]), 0.0), 1.0) # hvor langt mellom forrige og nyeste tilstand
+            previous = self.previous[HEADER_SIZE:].reshape(3, n, 2)
+            self.state.pos[:], self.state.vel[:], self.state.acc[:] = previous + (latest - previous) * alpha # alle fra samme tidspunkt
+            self.state.time = self.previous[1] + (self.latest[1] - self.previous[1]) * alpha
+        else:
+            self.state.pos[:], self.state.vel[:], self.state.acc[:] = latest
+            self.state.time = self.latest[1]
+
+    def stop(self) -> None:
+        """
+        metode som stopper workeren og setter self.state til den siste tilstanden workeren publiserte, slik at den kan lagres
+        """
+        if self.stopped: # allerede stoppet
+            return
+        self.stopped = True
+        self.send("stop")
+        self.worker.join(timeout=2) # venter på at workeren avslutter
+        self.update_state(interpolate=False) # bruker nøyaktig siste tilstand
+        self.snapshots.close()
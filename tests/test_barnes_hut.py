@@ -0,0 +1,52 @@
+"""
+tester for Barnes-Hut algoritmen i src/barnes_hut.py mot direkte summering. Feilen fra å bruke en node som ett punkt går omtrent som theta^2
+"""
+import numpy as np # importerer numpy for å lage tilfeldige systemer
+import pytest # importerer pytest for parametriserte tester
+from src.barnes_hut import barnes_hut_accelerations # importerer Barnes-Hut algoritmen som testes
+from src.physics import compute_direct_accelerations # importerer direkte summering som referanse
+
+N = 1000 # antall legemer
+TEST_PARTICLES = 100 # antall legemer uten masse
+
+### grenser for relativ feil som andel av theta^2. Median og største feil er omtrent en tredjedel av dette i dag
+MEDIAN_ERROR_PER_THETA2 = 0.1
+MAX_ERROR_PER_THETA2 = 1.5
+
+
+def clustered_system(seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    funksjon som lager N legemer samlet rundt origo, slik at treet får noder med ulik dybde. De siste TEST_PARTICLES legemene har ikke masse
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.normal(0, 1e12, (N, 2))
+    mass = rng.uniform(1e20, 1e27, N)
+    mass[N - TEST_PARTICLES:] = 0 # testpartikler
+    return pos, mass
+
+
+def relative_errors(pos: np.ndarray, mass: np.ndarray, theta: float) -> np.ndarray:
+    """
+    funksjon som returnerer den relative feilen i akselerasjonen til hvert legeme med Barnes-Hut
+    """
+    direct = compute_direct_accelerations(pos, mass)
+    tree = barnes_hut_accelerations(pos, mass, theta)
+    return np.hypot(*(tree - direct).T) / np.hypot(*direct.T)
+
+
+@pytest.mark.parametrize("theta", [0.3, 0.5, 0.8])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_error_scales_with_theta(theta, seed):
+    """
+    test som sjekker at median og største relative feil holder seg under grensene for åpningsvinkelen
+    """
+    errors = relative_errors(*clustered_system(seed), theta)
+    assert np.median(errors) < MEDIAN_ERROR_PER_THETA2 * theta**2
+    assert errors.max() < MAX_ERROR_PER_THETA2 * theta**2
+
+
+def test_theta_zero_is_direct():
+    """
+    test som sjekker at theta = 0 åpner alle noder, slik at svaret blir det samme som direkte summering
+    """
+    assert relative_errors(*clustered_system(2), 0.0).max() < 1e-12
@@ -0,0 +1,67 @@
+"""
+tester for kommandolinjeverktøyet i src/batch.py: datoene fra --dates og --range, forstyrrelsen av ensemble medlemmene, og at datoer før og etter DEFAULT_DATE blir integrert hver for seg fra starttilstanden
+"""
+import datetime # importerer bibliotek for å bruke datoer i python
+import numpy as np # importerer numpy for å sammenligne tilstander
+import pytest # importerer pytest for å sjekke feil
+from src.batch import make_dates, make_runs, perturbed_state, run # importerer funksjonene som testes
+from src.simulation import Simulator, init_system_state, SECONDS_PER_DAY # importerer simuleringskjernen
+
+
+def test_make_dates_range():
+    """
+    test som sjekker at --range gir datoer fra start med fast avstand, med slutten bare hvis den treffes, og at datoer fra --dates blir slått sammen, sortert og ikke gjentatt
+    """
+    assert make_dates(None, ["2022-01-01", "2022-01-10", "3"]) == [datetime.date(2022, 1, day) for day in (1, 4, 7, 10)]
+    assert make_dates(None, ["2022-01-01", "2022-01-09", "3"]) == [datetime.date(2022, 1, day) for day in (1, 4, 7)]
+    dates = [datetime.date(2030, 1, 1), datetime.date(2022, 1, 4), datetime.date(2021, 12, 31)]
+    assert make_dates(dates, ["2022-01-01", "2022-01-07", "3"]) == [datetime.date(2021, 12, 31), datetime.date(2022, 1, 1), datetime.date(2022, 1, 4), datetime.date(2022, 1, 7), datetime.date(2030, 1, 1)]
+    assert make_dates(None, ["2022-01-10", "2022-01-01", "3"]) == [] # slutten før starten
+    assert make_dates(dates, None) == sorted(dates)
+
+
+def test_make_dates_rejects_step():
+    """
+    test som sjekker at 0 eller negativt antall dager mellom datoene gir ValueError
+    """
+    with pytest.raises(ValueError):
+        make_dates(None, ["2022-01-01", "2022-01-10", "0"])
+
+
+def test_perturbed_state():
+    """
+    test som sjekker at medlem 0 er uforstyrret, at samme seed og medlem alltid gir samme forstyrrelse, og at andre medlemmer og seeds gir en annen
+    """
+    reference = init_system_state()
+    member0 = perturbed_state(0, 1e-3, 1e-3, seed=5)
+    np.testing.assert_array_equal(member0.mass, reference.mass)
+    np.testing.assert_array_equal(member0.vel, reference.vel)
+
+    first = perturbed_state(3, 1e-3, 1e-3, seed=5)
+    again = perturbed_state(3, 1e-3, 1e-3, seed=5)
+    np.testing.assert_array_equal(first.mass, again.mass)
+    np.testing.assert_array_equal(first.vel, again.vel)
+    assert not np.array_equal(first.mass, reference.mass) and not np.array_equal(first.vel, reference.vel)
+    np.testing.assert_array_equal(first.pos, reference.pos) # posisjonene blir ikke forstyrret
+    for other in (perturbed_state(4, 1e-3, 1e-3, seed=5), perturbed_state(3, 1e-3, 1e-3, seed=6)):
+        assert not np.array_equal(other.vel, first.vel)
+
+    cross = first.vel[:, 0]*reference.vel[:, 1] - first.vel[:, 1]*reference.vel[:, 0]
+    np.testing.assert_allclose(cross, 0, atol=1e-9 * np.abs(reference.vel).max()**2) # bare banefarten er forstyrret, ikke retningen
+
+
+def test_run_splits_backward_and_forward():
+    """
+    test som sjekker at tider før DEFAULT_DATE blir integrert bakover fra starttilstanden, nærmest først, og tider etter framover, uansett rekkefølgen tidene er gitt i
+    """
+    times = [20 * SECONDS_PER_DAY, -20 * SECONDS_PER_DAY, 10 * SECONDS_PER_DAY, -10 * SECONDS_PER_DAY]
+    spec = make_runs(1, ["wisdom_holman"], [0.1], 0.0, 0.0, 0)[0]
+    _, states = run(spec, times)
+    assert states.shape == (4, len(init_system_state()), 4)
+    for chain in ([-10, -20], [10, 20]): # forventet: hver retning for seg fra starttilstanden
+        simulator = Simulator(init_system_state())
+        for days in chain:
+            simulator.fast_forward(days * SECONDS_PER_DAY, 0.1, integrator="wisdom_holman")
+            i = times.index(days * SECONDS_PER_DAY)
+            np.testing.assert_array_equal(states[i, :, 0:2], simulator.state.pos)
+            np.testing.assert_array_equal(states[i, :, 2:4], simulator.state.vel)
@@ -0,0 +1,162 @@
+"""
+tester for katalogen i src/catalog.py: lesing av csv filer, syntetiske belter, satellittsystemer, og at testpartikler fra beltene ikke trekker på legemene med masse
+"""
+import numpy as np # importerer numpy for å sammenligne arrays
+import pytest # importerer pytest for fixtures og parametriserte tester
+from src.catalog import Catalog, AU, RENDER_IMAGE, RENDER_POINT, load_catalog, write_catalog, generate_belt # importerer katalogen som testes
+from src.physics import GRAV_CONST # importerer gravitasjonskonstanten for å regne ut banene
+from src.simulation import Simulator, SystemState # importerer simuleringskjernen
+
+SUN_MASS = 1.98847e30 # massen til sola
+
+
+def write_csv(path, text: str) -> str:
+    """
+    funksjon som skriver text til en csv fil og returnerer pathen
+    """
+    path.write_text(text)
+    return str(path)
+
+
+def test_load_catalog(tmp_path):
+    """
+    test som sjekker at tallene blir lest riktig, at tomme linjer blir hoppet over, at legemer uten bilde blir punkter, og at kolonner som mangler eller er tomme får standardverdier
+    """
+    path = write_csv(tmp_path / "catalog.csv", "\n".join([
+        "name,mass,x,y,v_x,v_y,texture,size,render,parent",
+        "Sola,2e30,1.5,-2.5,0.25,-0.5,./assets/sun.jpeg,15,image,",
+        "",
+        "Jorda,6e24,1.5e11,0,0,3e4,,,,",
+        "Månen,7e22,1.504e11,0,0,3.1e4,,,point,Jorda",
+        "Partikkel,0,3e11,0,0,2e4", # rad uten de valgfrie kolonnene
+    ]))
+    catalog = load_catalog(path)
+    assert len(catalog) == 4
+    assert catalog.state.names == ["Sola", "Jorda", "Månen", "Partikkel"]
+    np.testing.assert_array_equal(catalog.state.mass, [2e30, 6e24, 7e22, 0])
+    np.testing.assert_array_equal(catalog.state.pos, [[1.5, -2.5], [1.5e11, 0], [1.504e11, 0], [3e11, 0]])
+    np.testing.assert_array_equal(catalog.state.vel, [[0.25, -0.5], [0, 3e4], [0, 3.1e4], [0, 2e4]])
+    assert catalog.textures == ["./assets/sun.jpeg", "", "", ""]
+    np.testing.assert_array_equal(catalog.sizes, [15, 0, 0, 0])
+    assert list(catalog.render) == [RENDER_IMAGE, RENDER_POINT, RENDER_POINT, RENDER_POINT]
+    assert catalog.parents == ["", "", "Jorda", ""]
+    np.testing.assert_array_equal(catalog.image_indices(), [0])
+    np.testing.assert_array_equal(catalog.point_indices(), [1, 2, 3])
+
+
+def test_load_catalog_without_optional_columns(tmp_path):
+    """
+    test som sjekker at en katalog med bare de kolonnene som må være med kan leses, og at alle legemene blir punkter
+    """
+    path = write_csv(tmp_path / "catalog.csv", "name,mass,x,y,v_x,v_y\nSola,2e30,0,0,0,0\nJorda,6e24,1.5e11,0,0,3e4\n")
+    catalog = load_catalog(path)
+    assert list(catalog.render) == [RENDER_POINT, RENDER_POINT]
+    assert catalog.parents == ["", ""] and catalog.satellite_groups() == []
+
+
+@pytest.mark.parametrize("text", [
+    "name,mass,x,y,v_x\nSola,2e30,0,0,0\n", # mangler v_y
+    "name,mass,x,y,v_x,v_y,render\nSola,2e30,0,0,0,0,image\n", # skal tegnes med bilde, men har ikke bilde
+])
+def test_load_catalog_rejects(tmp_path, text):
+    """
+    test som sjekker at en katalog som mangler en kolonne, eller har et legeme som skal tegnes med bilde uten bilde, gir ValueError
+    """
+    with pytest.raises(ValueError):
+        load_catalog(write_csv(tmp_path / "catalog.csv", text))
+
+
+def test_write_catalog_roundtrip(tmp_path):
+    """
+    test som sjekker at standardkatalogen med et belte blir lik når den skrives og leses igjen
+    """
+    catalog = load_catalog()
+    catalog.extend(generate_belt(50, 2.1, 3.3, "Asteroide", SUN_MASS, catalog.state.pos[0], catalog.state.vel[0]))
+    path = str(tmp_path / "written.csv")
+    write_catalog(path, catalog)
+    written = load_catalog(path)
+    assert written.state.names == catalog.state.names
+    for name in ("mass", "pos", "vel"):
+        np.testing.assert_array_equal(getattr(written.state, name), getattr(catalog.state, name))
+    assert written.textures == catalog.textures and written.parents == catalog.parents
+    np.testing.assert_array_equal(written.sizes, catalog.sizes)
+    np.testing.assert_array_equal(written.render, catalog.render)
+
+
+def test_generate_belt():
+    """
+    test som sjekker at beltet har n testpartikler med bundne baner som går samme vei rundt, med store halvakse mellom r_min og r_max og eksentrisitet under grensen, og at samme seed gir samme belte
+    """
+    central_pos, central_vel = np.array([1e9, -2e9]), np.array([10.0, -20.0])
+    belt = generate_belt(500, 2.1, 3.3, "Asteroide", SUN_MASS, central_pos, central_vel, eccentricity=0.1, seed=7)
+    assert len(belt) == 500 and belt.state.names[0] == "Asteroide 1" and belt.state.names[-1] == "Asteroide 500"
+    assert np.all(belt.state.mass == 0) and np.all(belt.render == RENDER_POINT)
+
+    mu = GRAV_CONST * SUN_MASS
+    r = belt.state.pos - central_pos # relativt til sentralmassen
+    v = belt.state.vel - central_vel
+    distance = np.hypot(*r.T)
+    energy = (v**2).sum(axis=1) / 2 - mu / distance # spesifikk baneenergi
+    a = -mu / (2 * energy) # store halvakse
+    h = r[:, 0]*v[:, 1] - r[:, 1]*v[:, 0] # spesifikt banespinn
+    e = np.sqrt(1 - h**2 / (mu * a)) # eksentrisitet
+    assert np.all(energy < 0) and np.all(h > 0) # bundne baner mot klokka, som planetene
+    np.testing.assert_array_less(2.1 * AU * (1 - 1e-9), a)
+    np.testing.assert_array_less(a, 3.3 * AU * (1 + 1e-9))
+    np.testing.assert_array_less(e, 0.1 + 1e-6)
+
+    again = generate_belt(500, 2.1, 3.3, "Asteroide", SUN_MASS, central_pos, central_vel, eccentricity=0.1, seed=7)
+    np.testing.assert_array_equal(again.state.pos, belt.state.pos)
+    other = generate_belt(500, 2.1, 3.3, "Asteroide", SUN_MASS, central_pos, central_vel, eccentricity=0.1, seed=8)
+    assert not np.array_equal(other.state.pos, belt.state.pos)
+
+
+def small_catalog(parents: list[str], mass: list[float]|None=None) -> Catalog:
+    """
+    funksjon som lager en katalog med legemene a, b, c og d, der parents er planeten til hvert legeme
+    """
+    n = len(parents)
+    state = SystemState(["a", "b", "c", "d"][:n], mass or [1e24] * n, np.arange(2*n, dtype=np.float64).reshape(n, 2), np.zeros((n, 2)))
+    return Catalog(state, [""] * n, np.zeros(n), np.full(n, RENDER_POINT), parents)
+
+
+def test_satellite_groups():
+    """
+    test som sjekker at hvert satellittsystem er planeten fulgt av månene i rekkefølgen de har i katalogen
+    """
+    groups = small_catalog(["", "a", "", "a"]).satellite_groups()
+    assert len(groups) == 1
+    np.testing.assert_array_equal(groups[0], [0, 1, 3])
+    groups = small_catalog(["c", "", "", "b"]).satellite_groups()
+    assert sorted(map(list, groups)) == [[1, 3], [2, 0]]
+
+
+@pytest.mark.parametrize("parents, mass", [
+    (["", "x"], None), # planeten er ikke i katalogen
+    (["", "a", "b"], None), # planeten er selv en måne
+    (["", "a"], [0.0, 1e20]), # planeten har ikke masse
+])
+def test_satellite_groups_rejects(parents, mass):
+    """
+    test som sjekker at satellite_groups gir ValueError for måner som ikke kan integreres rundt planeten sin
+    """
+    with pytest.raises(ValueError):
+        small_catalog(parents, mass).satellite_groups()
+
+
+@pytest.mark.parametrize("solver", ["direct", "barnes_hut"])
+def test_test_particles_do_not_pull(solver):
+    """
+    test som sjekker at testpartiklene i et belte blir trukket på av sola, men ikke er med i summen for legemene med masse
+    """
+    catalog = load_catalog()
+    n = len(catalog)
+    catalog.extend(generate_belt(200, 2.1, 3.3, "Asteroide", catalog.state.mass[0], catalog.state.pos[0], catalog.state.vel[0]))
+    with_belt = Simulator(catalog.state.copy(), solver=solver)
+    with_belt.update_aks()
+    without_belt = Simulator(load_catalog().state, solver="direct")
+    without_belt.update_aks()
+    np.testing.assert_allclose(with_belt.state.acc[:n], without_belt.state.acc, rtol=1e-12)
+    r = catalog.state.pos[n:] - catalog.state.pos[0] # avstand fra sola
+    sun_acc = GRAV_CONST * catalog.state.mass[0] / (r**2).sum(axis=1) # akselerasjonen fra sola alene
+    np.testing.assert_allclose(np.hypot(*with_belt.state.acc[n:].T), sun_acc, rtol=0.01) # planetene trekker lite i beltet
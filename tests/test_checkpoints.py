@@ -0,0 +1,117 @@
+"""
+tester for checkpointene i src/checkpoints.py: at de blir gjenbrukt når ingenting er endret, og slettet når starttilstanden, integratoren, nøyaktigheten eller formatet endres
+"""
+import json # importerer bibliotek for å endre indeksen
+import os # importerer bibliotek for å sjekke filene
+import numpy as np # importerer numpy for å sammenligne tilstander
+from src import checkpoints # importerer modulen for å lese INDEX_VERSION
+from src.checkpoints import CheckpointStore # importerer checkpointene som testes
+from src.simulation import Simulator, init_system_state, SECONDS_PER_DAY # importerer simuleringskjernen
+
+INTERVAL_DAYS = 10 # korte intervaller slik at testene går fort
+TARGET = 45 * SECONDS_PER_DAY # gir fire checkpoints
+
+
+def filled_store(path: str, **options) -> CheckpointStore:
+    """
+    funksjon som lager en CheckpointStore for solsystemet og hopper til TARGET, slik at checkpointene på veien blir lagret
+    """
+    store = CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS, **options)
+    assert store.fast_forward(Simulator(init_system_state()), TARGET)
+    return store
+
+
+def test_checkpoints_are_reused(tmp_path):
+    """
+    test som sjekker at checkpointene blir lest igjen av en ny instans, og at et hopp fra et checkpoint gir nøyaktig samme tilstand som et hopp fra starten
+    """
+    path = str(tmp_path / "checkpoints")
+    cold = Simulator(init_system_state())
+    store = CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS)
+    store.fast_forward(cold, TARGET)
+    assert sorted(store.records) == [k * INTERVAL_DAYS * SECONDS_PER_DAY for k in range(1, 5)]
+
+    reopened = CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS)
+    assert reopened.records == store.records
+    assert reopened.nearest(TARGET) == 40 * SECONDS_PER_DAY
+    warm = Simulator(init_system_state())
+    reopened.fast_forward(warm, TARGET)
+    assert warm.state.time == cold.state.time == TARGET
+    np.testing.assert_array_equal(warm.state.pos, cold.state.pos)
+    np.testing.assert_array_equal(warm.state.vel, cold.state.vel)
+
+
+def test_invalidated_by_initial_state(tmp_path):
+    """
+    test som sjekker at checkpointene blir slettet når starttilstanden endres, f.eks med en annen katalog
+    """
+    path = str(tmp_path / "checkpoints")
+    filled_store(path)
+    state = init_system_state()
+    state.mass[3] *= 1.001
+    store = CheckpointStore(path, state, interval_days=INTERVAL_DAYS)
+    assert store.records == {}
+    assert not os.path.exists(store.data_path)
+
+
+def test_invalidated_by_integrator_and_accuracy(tmp_path):
+    """
+    test som sjekker at checkpointene blir slettet når integratoren eller nøyaktigheten endres
+    """
+    path = str(tmp_path / "checkpoints")
+    filled_store(path)
+    assert CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS, integrator="yoshida4").records == {}
+    filled_store(path)
+    assert CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS, accuracy=0.01).records == {}
+
+
+def test_invalidated_by_index_version(tmp_path):
+    """
+    test som sjekker at checkpoints fra en annen versjon av indeksen blir slettet
+    """
+    path = str(tmp_path / "checkpoints")
+    store = filled_store(path)
+    with open(store.index_path) as f:
+        index = json.load(f)
+    index["version"] = checkpoints.INDEX_VERSION - 1
+    with open(store.index_path, "w") as f:
+        json.dump(index, f)
+    assert CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS).records == {}
+
+
+def test_invalidated_by_corrupt_files(tmp_path):
+    """
+    test som sjekker at en ødelagt indeks eller en binær fil som er kortere enn indeksen gjør at checkpointene blir slettet
+    """
+    path = str(tmp_path / "checkpoints")
+    store = filled_store(path)
+    with open(store.index_path, "w") as f:
+        f.write("{")
+    assert CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS).records == {}
+
+    store = filled_store(path)
+    os.truncate(store.data_path, os.path.getsize(store.data_path) - 8)
+    assert CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS).records == {}
+
+
+def test_drops_checkpoints_missing_from_index(tmp_path):
+    """
+    test som sjekker at et checkpoint som ble skrevet til den binære filen men ikke til indeksen blir fjernet
+    """
+    path = str(tmp_path / "checkpoints")
+    store = filled_store(path)
+    size = os.path.getsize(store.data_path)
+    with open(store.data_path, "ab") as f:
+        f.write(b"\0" * (size // len(store.records)))
+    reopened = CheckpointStore(path, init_system_state(), interval_days=INTERVAL_DAYS)
+    assert reopened.records == store.records
+    assert os.path.getsize(store.data_path) == size
+
+
+def test_opening_writes_nothing(tmp_path):
+    """
+    test som sjekker at en ny CheckpointStore ikke lager filer før det finnes checkpoints å lagre
+    """
+    store = CheckpointStore(str(tmp_path / "checkpoints"), init_system_state(), interval_days=INTERVAL_DAYS)
+    assert store.records == {}
+    assert list(tmp_path.iterdir()) == []
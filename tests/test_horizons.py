@@ -0,0 +1,89 @@
+"""
+tester for lesingen av Horizons tabeller i src/horizons.py. tests/data har en liten tabell i tekstformatet (Jorda og Mars i km og km/s) og en i csv formatet (Jupiter i AU og AU/døgn), begge med tre døgn fra 1 januar 2022
+"""
+import os # importerer bibliotek for å finne testdataene
+import shutil # importerer bibliotek for å kopiere testdataene, slik at cachen ikke blir skrevet i tests/data
+import numpy as np # importerer numpy for å sammenligne tilstander
+import pytest # importerer pytest for å sjekke feil
+from src.horizons import parse_horizons, load_horizons, load_horizons_files, CACHE_SUFFIX # importerer lesingen som testes
+from src.simulation import Simulator, init_system_state, SECONDS_PER_DAY # importerer solsystemet tabellene er laget fra
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data") # mappe med testdataene
+TEXT_TABLE = os.path.join(DATA_DIR, "horizons_vectors.txt")
+CSV_TABLE = os.path.join(DATA_DIR, "horizons_vectors.csv")
+
+
+def test_parse_text_table():
+    """
+    test som sjekker navn, sorterte tidspunkter og omgjøring fra km og km/s til SI-enheter i tekstformatet
+    """
+    table = parse_horizons(TEXT_TABLE)
+    assert table.names == ["Jorda", "Mars"] # Horizons id 399 og 499 blir navnene i katalogen
+    for times in table.times:
+        np.testing.assert_array_equal(times, [0, SECONDS_PER_DAY, 2 * SECONDS_PER_DAY]) # tidspunktene står usortert i filen
+    start = init_system_state()
+    np.testing.assert_allclose(table.vectors_at("Jorda", 0), [*start.pos[3], *start.vel[3]], rtol=1e-14)
+
+
+def test_parse_csv_table():
+    """
+    test som sjekker at csv formatet med AU og AU/døgn gir samme enheter som tekstformatet
+    """
+    table = parse_horizons(CSV_TABLE)
+    assert table.names == ["Jupiter"]
+    start = init_system_state()
+    np.testing.assert_allclose(table.vectors_at("Jupiter", 0), [*start.pos[5], *start.vel[5]], rtol=1e-13)
+
+
+def test_interpolation_between_epochs():
+    """
+    test som sjekker at Hermite interpolasjon midt mellom to tidspunkter treffer en integrasjon av solsystemet, og at tid utenfor tabellen gir ValueError
+    """
+    table = parse_horizons(TEXT_TABLE)
+    simulator = Simulator(init_system_state(), solver="direct", integrator="leapfrog")
+    simulator.step(60, 720 + 1440) # halvannet døgn
+    vectors = table.vectors_at("Jorda", 1.5 * SECONDS_PER_DAY)
+    assert np.hypot(*(vectors[0:2] - simulator.state.pos[3])) < 1000 # mindre enn 1 km fra integrasjonen
+    assert np.hypot(*(vectors[2:4] - simulator.state.vel[3])) < 1e-3
+    with pytest.raises(ValueError):
+        table.vectors_at("Jorda", 3 * SECONDS_PER_DAY)
+
+
+def test_fill_state(tmp_path):
+    """
+    test som sjekker at tilstanden bare blir fylt når alle legemene med masse er i tabellene
+    """
+    shutil.copytree(DATA_DIR, tmp_path / "horizons")
+    table = load_horizons_files([str(tmp_path / "horizons")])
+    state = init_system_state()
+    assert not table.fill_state(state, SECONDS_PER_DAY) # sola og flere planeter mangler
+    assert state.time == 0
+    subset = Simulator(state).subset(np.array([3, 4, 5])).state # Jorda, Mars og Jupiter
+    assert table.fill_state(subset, SECONDS_PER_DAY)
+    assert subset.time == SECONDS_PER_DAY
+    np.testing.assert_array_equal(subset.pos[1], table.vectors_at("Mars", SECONDS_PER_DAY)[0:2])
+
+
+def test_rejects_other_center(tmp_path):
+    """
+    test som sjekker at en tabell som ikke er relativ til solsystemets barycenter gir ValueError
+    """
+    path = tmp_path / "heliocentric.txt"
+    with open(TEXT_TABLE) as f:
+        path.write_text(f.read().replace("Solar System Barycenter (0)", "Sun (10)"))
+    with pytest.raises(ValueError):
+        parse_horizons(str(path))
+
+
+def test_cache_roundtrip(tmp_path):
+    """
+    test som sjekker at cachen blir laget første gang og gir samme tabell som filen
+    """
+    path = tmp_path / "horizons.txt"
+    shutil.copy(TEXT_TABLE, path)
+    parsed = load_horizons(str(path))
+    assert os.path.exists(str(path) + CACHE_SUFFIX)
+    cached = load_horizons(str(path))
+    assert cached.names == parsed.names
+    for a, b in zip(cached.states, parsed.states):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,103 @@
+"""
+tester for integratorene i src/integrators.py: energiendring over to år med solsystemet, og at integrasjon fram og så like langt tilbake gir starttilstanden igjen
+"""
+import numpy as np # importerer numpy for å sammenligne tilstander
+import pytest # importerer pytest for parametriserte tester
+from src.integrators import INTEGRATORS, Integrator, get_integrator # importerer integratorene som testes
+from src.physics import total_energy # importerer energien til systemet
+from src.simulation import Simulator, SystemState, init_system_state, SECONDS_PER_DAY # importerer simuleringskjernen
+
+YEARS = 2 # hvor lenge det integreres
+
+### tidssteg i dager og største relative energiendring for hver integrator. Grensene er omtrent ti ganger det integratorene gir i dag
+ENERGY_DRIFT = {
+    "euler": (1, 1e-3),
+    "leapfrog": (1, 1e-5),
+    "yoshida4": (4, 3e-5),
+    "wisdom_holman": (4, 1e-6),
+    "rk45": (4, 1e-10),
+    "block_hermite": (4, 1e-7),
+}
+
+### største relative posisjonsfeil etter å ha integrert fram og tilbake. De symmetriske integratorene kommer tilbake på avrundingsfeil, rk45 og block_hermite velger stegene ut fra tilstanden og kommer tilbake innenfor nøyaktigheten sin.
+### Semi-implisitt Euler er ikke symmetrisk i tid (steget med -dt er ikke det motsatte av steget med dt), så den er ikke med
+REVERSIBILITY = {
+    "leapfrog": 1e-10,
+    "yoshida4": 1e-10,
+    "wisdom_holman": 1e-10,
+    "rk45": 1e-5,
+    "block_hermite": 1e-3,
+}
+
+
+def solar_system(integrator: str) -> Simulator:
+    """
+    funksjon som lager en simulator for solsystemet med direkte summering og integratoren
+    """
+    return Simulator(init_system_state(), solver="direct", integrator=integrator)
+
+
+@pytest.mark.parametrize("name", list(INTEGRATORS))
+def test_energy_drift(name):
+    """
+    test som sjekker at den relative energiendringen holder seg under grensen til integratoren gjennom hele integrasjonen
+    """
+    dt_days, limit = ENERGY_DRIFT[name] # nye integratorer må få en grense her
+    simulator = solar_system(name)
+    state = simulator.state
+    e0 = total_energy(state.pos, state.vel, state.mass)
+    drift = 0.0
+    for _ in range(int(YEARS * 365 / dt_days)):
+        simulator.step(dt_days * SECONDS_PER_DAY)
+        drift = max(drift, abs((total_energy(state.pos, state.vel, state.mass) - e0) / e0))
+    assert drift < limit
+
+
+@pytest.mark.parametrize("name", list(INTEGRATORS))
+def test_reversibility(name):
+    """
+    test som sjekker at integrasjon fram og så like langt tilbake med -dt gir starttilstanden igjen
+    """
+    if name not in REVERSIBILITY:
+        assert name == "euler" # bare semi-implisitt Euler er unntatt
+        return
+    dt_days = ENERGY_DRIFT[name][0]
+    n = int(YEARS * 365 / dt_days)
+    simulator = solar_system(name)
+    state = simulator.state
+    pos0, vel0 = state.pos.copy(), state.vel.copy()
+    simulator.step(dt_days * SECONDS_PER_DAY, n)
+    simulator.step(-dt_days * SECONDS_PER_DAY, n)
+    assert state.time == 0
+    assert np.max(np.hypot(*(state.pos - pos0).T) / np.hypot(*pos0.T)) < REVERSIBILITY[name]
+    assert np.max(np.hypot(*(state.vel - vel0).T) / np.hypot(*vel0.T)) < REVERSIBILITY[name]
+
+
+def test_unknown_integrator():
+    """
+    test som sjekker at et ukjent navn gir ValueError
+    """
+    with pytest.raises(ValueError):
+        get_integrator("runge")
+
+
+def test_integrator_needs_step():
+    """
+    test som sjekker at en integrator uten step ikke kan lages
+    """
+    class Missing(Integrator):
+        name = "missing"
+
+    with pytest.raises(TypeError):
+        Missing()
+
+
+def test_rk45_stops_on_nan():
+    """
+    test som sjekker at rk45 ikke går i evig løkke når feilen blir NaN, her med to legemer i samme posisjon uten softening
+    """
+    state = SystemState(["a", "b"], [1e24, 1e24], [[1e11, 0.0], [1e11, 0.0]], [[0.0, 1e3], [0.0, -1e3]])
+    simulator = Simulator(state, solver="direct", integrator="rk45")
+    with np.errstate(all="ignore"):
+        simulator.step(SECONDS_PER_DAY)
+    assert np.isnan(state.pos).all()
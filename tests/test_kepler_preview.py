@@ -0,0 +1,42 @@
+"""
+tester for forhåndsvisningen i src/kepler_preview.py
+"""
+import numpy as np # importerer numpy for å sammenligne tilstander
+import pytest # importerer pytest for parametriserte tester
+from src.catalog import load_catalog, generate_moons # importerer katalogen og de store månene
+from src.kepler_preview import KeplerPreview # importerer forhåndsvisningen som testes
+
+
+def solar_system(moons: bool):
+    """
+    funksjon som returnerer katalogen med solsystemet, med eller uten de store månene
+    """
+    catalog = load_catalog()
+    if moons:
+        catalog.extend(generate_moons(catalog))
+    return catalog
+
+
+@pytest.mark.parametrize("moons", [False, True])
+def test_initial_state(moons):
+    """
+    test som sjekker at tilstanden ved starttiden er starttilstanden, også når planetene med måner går rundt sola som massesenter
+    """
+    catalog = solar_system(moons)
+    state = catalog.state
+    preview = KeplerPreview(state, catalog.satellite_groups()).state_at(state.time)
+    assert preview.names == state.names and preview.time == state.time
+    np.testing.assert_allclose(preview.pos, state.pos, rtol=0, atol=1e-12 * np.abs(state.pos).max())
+    np.testing.assert_allclose(preview.vel, state.vel, rtol=0, atol=1e-12 * np.abs(state.vel).max())
+
+
+def test_periodic_orbit():
+    """
+    test som sjekker at en planet er tilbake på samme sted relativt til sola etter ett omløp
+    """
+    state = solar_system(moons=False).state
+    preview = KeplerPreview(state)
+    earth, sun = state.names.index("Jorda"), preview.central
+    later = preview.state_at(state.time + preview.periods[earth])
+    np.testing.assert_allclose(later.pos[earth] - later.pos[sun], state.pos[earth] - state.pos[sun], rtol=1e-8)
+    np.testing.assert_allclose(later.vel[earth] - later.vel[sun], state.vel[earth] - state.vel[sun], rtol=1e-8)
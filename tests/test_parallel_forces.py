@@ -0,0 +1,54 @@
+"""
+tester for kraftberegningen fordelt på flere prosesser i src/parallel_forces.py. threshold=0 gjør at prosessene brukes også for små systemer
+"""
+import numpy as np # importerer numpy for å lage tilfeldige systemer
+import pytest # importerer pytest for fixtures
+from src.parallel_forces import ParallelForces # importerer kraftberegningen som testes
+from src.physics import compute_direct_accelerations # importerer direkte summering som referanse
+
+
+def random_system(n: int, seed: int, test_particles: int=0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    funksjon som lager n legemer med tilfeldige posisjoner og masser. De siste test_particles legemene har ikke masse
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1e12, 1e12, (n, 2))
+    mass = rng.uniform(1e20, 1e27, n)
+    mass[n - test_particles:] = 0 # testpartikler
+    return pos, mass
+
+
+@pytest.fixture
+def forces():
+    """
+    fixture med to prosesser som alltid brukes. Prosessene blir stoppet etter testen
+    """
+    forces = ParallelForces(processes=2, threshold=0)
+    yield forces
+    forces.close()
+
+
+@pytest.mark.parametrize("softening", [0.0, 1e9])
+def test_matches_direct(forces, softening):
+    """
+    test som sjekker at flisene i prosessene gir samme akselerasjon som direkte summering, også når det delte minnet må gjøres større
+    """
+    for n in (300, 1000): # andre kall trenger mer delt minne
+        pos, mass = random_system(n, seed=n, test_particles=n // 10)
+        out = np.full((n, 2), np.nan)
+        result = forces.accelerations(pos, mass, softening, out=out)
+        assert result is out
+        assert forces.timings[-1]["parallel"] and forces.timings[-1]["tiles"] > 1
+        np.testing.assert_allclose(out, compute_direct_accelerations(pos, mass, softening), rtol=1e-12)
+
+
+def test_dead_process_falls_back(forces):
+    """
+    test som sjekker at kraftberegningen regnes ut i prosessen selv med samme svar når en av prosessene er drept
+    """
+    pos, mass = random_system(300, seed=1)
+    forces.accelerations(pos, mass) # starter prosessene
+    forces.workers[0].kill()
+    forces.workers[0].join()
+    np.testing.assert_allclose(forces.accelerations(pos, mass), compute_direct_accelerations(pos, mass), rtol=1e-12)
+    assert not forces.timings[-1]["parallel"] and forces.available is False
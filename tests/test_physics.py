@@ -0,0 +1,74 @@
+"""
+tester for kraftberegningen i src/physics.py mot en enkel O(N^2) referanse som summerer kraften fra hvert legeme på hvert legeme
+"""
+import numpy as np # importerer numpy for å lage tilfeldige systemer
+import pytest # importerer pytest for parametriserte tester
+from src.physics import GRAV_CONST, BLOCK_SIZE, compute_accelerations, compute_direct_accelerations # importerer kraftberegningen som testes
+
+
+def reference_accelerations(pos: np.ndarray, mass: np.ndarray, softening: float=0.0) -> np.ndarray:
+    """
+    funksjon som regner ut akselerasjonen til hvert legeme ved å summere over alle de andre legemene, ett legeme om gangen
+    """
+    acc = np.zeros((len(mass), 2))
+    for i in range(len(mass)):
+        for j in range(len(mass)):
+            if i == j:
+                continue
+            d = pos[j] - pos[i] # avstandsvektor fra legeme i til legeme j
+            r2 = d @ d + softening**2 # avstanden i andre
+            acc[i] += GRAV_CONST * mass[j] * d / r2**1.5
+    return acc
+
+
+def random_system(n: int, seed: int, test_particles: int=0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    funksjon som lager n legemer med tilfeldige posisjoner og masser. De siste test_particles legemene har ikke masse
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1e12, 1e12, (n, 2))
+    mass = rng.uniform(1e20, 1e27, n)
+    mass[n - test_particles:] = 0 # testpartikler
+    return pos, mass
+
+
+@pytest.mark.parametrize("n", [2, 9, BLOCK_SIZE + 40]) # flere enn BLOCK_SIZE legemer gir også par mellom blokker
+@pytest.mark.parametrize("softening", [0.0, 1e9])
+def test_compute_accelerations_matches_reference(n, softening):
+    """
+    test som sjekker at kraftberegningen med Newtons tredje lov og blokker gir samme svar som referansen
+    """
+    pos, mass = random_system(n, seed=n)
+    expected = reference_accelerations(pos, mass, softening)
+    np.testing.assert_allclose(compute_accelerations(pos, mass, softening), expected, rtol=1e-9, atol=1e-12 * np.abs(expected).max())
+
+
+def test_compute_accelerations_writes_to_out():
+    """
+    test som sjekker at akselerasjonen blir skrevet til out, og at gamle verdier i out blir nullstilt først
+    """
+    pos, mass = random_system(20, seed=1)
+    out = np.full((20, 2), 1.0)
+    result = compute_accelerations(pos, mass, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, reference_accelerations(pos, mass), rtol=1e-9)
+
+
+def test_compute_accelerations_conserves_momentum():
+    """
+    test som sjekker at summen av kreftene er null, siden hvert par trekker like mye på hverandre
+    """
+    pos, mass = random_system(BLOCK_SIZE + 40, seed=2)
+    acc = compute_accelerations(pos, mass)
+    total_force = (mass[:, None] * acc).sum(axis=0)
+    assert np.all(np.abs(total_force) <= 1e-12 * (mass[:, None] * np.abs(acc)).sum(axis=0))
+
+
+def test_direct_accelerations_with_test_particles():
+    """
+    test som sjekker at testpartikler uten masse blir trukket på, men ikke trekker på de andre legemene
+    """
+    pos, mass = random_system(30, seed=3, test_particles=10)
+    acc = compute_direct_accelerations(pos, mass)
+    np.testing.assert_allclose(acc, reference_accelerations(pos, mass), rtol=1e-9)
+    np.testing.assert_allclose(acc[:20], compute_accelerations(pos[:20], mass[:20]), rtol=1e-12) # legemene med masse merker ikke testpartiklene
@@ -0,0 +1,61 @@
+"""
+tester for rutenettet i src/pick_grid.py som finner legemet som blir klikket på
+"""
+import numpy as np # importerer numpy for å lage tilfeldige legemer
+from src.pick_grid import PickGrid, PICK_CELL_SIZE, PICK_TOLERANCE # importerer rutenettet som testes
+
+
+def brute_force(centers: np.ndarray, radii: np.ndarray, keys: np.ndarray, x: float, y: float, tolerance: float=PICK_TOLERANCE) -> int|None:
+    """
+    funksjon som finner legemet nærmest klikket ved å se på alle legemene
+    """
+    distance = np.hypot(centers[:, 0] - x, centers[:, 1] - y) - radii
+    best = int(np.argmin(distance))
+    return int(keys[best]) if distance[best] <= tolerance else None
+
+
+def test_hits_and_misses():
+    """
+    test som sjekker treff i et stort bilde langt fra senteret, treff like utenfor et punkt, og bom
+    """
+    grid = PickGrid()
+    grid.build(np.array([[100.0, 100.0], [400.0, 300.0], [-50.0, -70.0]]), np.array([60.0, 0.0, 0.0]), np.array([7, 8, 9]))
+    assert grid.query(150, 120) == 7 # inne i bildet, flere ruter fra senteret
+    assert grid.query(400 + PICK_TOLERANCE - 1, 300) == 8 # innenfor toleransen til punktet
+    assert grid.query(400 + PICK_TOLERANCE + 1, 300) is None # utenfor toleransen
+    assert grid.query(-52, -68) == 9 # negative skjermkoordinater
+    assert grid.query(1000, 1000) is None
+
+
+def test_nearest_wins():
+    """
+    test som sjekker at legemet med kanten nærmest klikket blir valgt når flere er innenfor toleransen
+    """
+    grid = PickGrid()
+    grid.build(np.array([[0.0, 0.0], [8.0, 0.0]]), np.array([0.0, 0.0]), np.array([1, 2]))
+    assert grid.query(3, 0) == 1
+    assert grid.query(5, 0) == 2
+
+
+def test_empty_grid():
+    """
+    test som sjekker at et tomt rutenett aldri gir treff
+    """
+    grid = PickGrid()
+    grid.build(np.zeros((0, 2)), np.zeros(0), np.zeros(0, dtype=np.int64))
+    assert grid.query(0, 0) is None
+
+
+def test_matches_brute_force():
+    """
+    test som sjekker at rutenettet gir samme svar som å se på alle legemene, for mange tilfeldige legemer og klikk
+    """
+    rng = np.random.default_rng(0)
+    n = 2000
+    centers = rng.uniform(-200, 1400, (n, 2))
+    radii = np.where(rng.random(n) < 0.01, rng.uniform(2, 3 * PICK_CELL_SIZE, n), 0.0) # noen få store bilder, resten punkter
+    keys = rng.permutation(n)
+    grid = PickGrid()
+    grid.build(centers, radii, keys)
+    for x, y in rng.uniform(-250, 1450, (500, 2)):
+        assert grid.query(x, y) == brute_force(centers, radii, keys, x, y)
@@ -0,0 +1,53 @@
+"""
+tester for ringbufferen i src/profiler.py: at recent gir de siste framene i riktig rekkefølge og at persentilene bare regnes ut fra framene i vinduet, også etter at bufferen har gått rundt
+"""
+import numpy as np # importerer numpy for å sammenligne målinger
+from src.profiler import FrameProfiler, PHASES # importerer profileren som testes
+
+WINDOW = 5 # antall frames i ringbufferen
+
+
+def record_frames(profiler: FrameProfiler, frame_times: list[float]) -> None:
+    """
+    funksjon som lagrer en frame for hver tid i frame_times. Fasen "physics" får samme tid som hele framen, slik at framene kan kjennes igjen
+    """
+    for frame_time in frame_times:
+        profiler.start()
+        profiler.frame[PHASES.index("physics")] = frame_time
+        profiler.end_frame(frame_time)
+
+
+def test_recent_before_wraparound():
+    """
+    test som sjekker at recent gir de lagrede framene eldst først, og aldri flere enn det er lagret
+    """
+    profiler = FrameProfiler(window=WINDOW)
+    assert len(profiler.recent(3)) == 0 and profiler.percentiles() == {}
+    record_frames(profiler, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(profiler.recent(10)[:, -1], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(profiler.recent(2)[:, -1], [2.0, 3.0])
+
+
+def test_recent_after_wraparound():
+    """
+    test som sjekker at recent gir de siste framene eldst først etter at ringbufferen har skrevet over de eldste
+    """
+    profiler = FrameProfiler(window=WINDOW)
+    record_frames(profiler, [float(i) for i in range(1, 13)]) # 12 frames, bufferen går rundt to ganger
+    assert profiler.count == WINDOW and profiler.frames == 12
+    np.testing.assert_array_equal(profiler.recent(WINDOW)[:, -1], [8.0, 9.0, 10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(profiler.recent(3)[:, -1], [10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(profiler.recent(3)[:, PHASES.index("physics")], [10.0, 11.0, 12.0])
+
+
+def test_percentiles_after_wraparound():
+    """
+    test som sjekker at persentilene etter at bufferen har gått rundt bare bruker framene i vinduet, ikke de som er skrevet over
+    """
+    profiler = FrameProfiler(window=WINDOW)
+    record_frames(profiler, [100.0] * WINDOW + [1.0, 2.0, 3.0, 4.0, 5.0]) # de trege framene er skrevet over
+    stats = profiler.percentiles()
+    assert set(stats) == set(PHASES) | {"frame_time"}
+    np.testing.assert_allclose(stats["frame_time"], np.percentile([1.0, 2.0, 3.0, 4.0, 5.0], (50, 95, 99)))
+    np.testing.assert_allclose(stats["physics"], stats["frame_time"])
+    assert stats["events"] == (0.0, 0.0, 0.0)
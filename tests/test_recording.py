@@ -0,0 +1,80 @@
+"""
+tester for opptakene i src/recording.py. Opptakene i testene er av legemer som beveger seg i rette linjer, som Hermite interpolasjonen gjenskaper nøyaktig
+"""
+import numpy as np # importerer numpy for å lage tilstander og tidspunkter
+import pytest # importerer pytest for fixtures
+from src.recording import TrajectoryRecorder, TrajectoryReader # importerer opptakene som testes
+from src.simulation import SystemState # importerer tilstanden som blir tatt opp
+
+CADENCE = 100.0 # simuleringstid mellom hver tilstand
+CHUNK_FRAMES = 4 # få tilstander per chunk fil, slik at opptaket går over flere filer
+VELOCITY = np.array([[1.0, 2.0], [-3.0, 0.5]]) # konstant fart til legemene
+
+
+def linear_state(t: float) -> SystemState:
+    """
+    funksjon som returnerer tilstanden ved tiden t til to legemer i rettlinjet bevegelse
+    """
+    return SystemState(["a", "b"], [1.0, 2.0], np.array([[10.0, 20.0], [0.0, -5.0]]) + VELOCITY * t, VELOCITY, t)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """
+    fixture med et opptak av 11 tilstander, der tidspunktene ikke ligger helt jevnt
+    """
+    path = str(tmp_path / "recording")
+    recorder = TrajectoryRecorder(path, linear_state(0), cadence=CADENCE, chunk_frames=CHUNK_FRAMES)
+    for t in np.arange(0, 1000, 10) + 0.5 * (np.arange(100) % 3): # tidspunkter med steg på 10 og 10.5
+        recorder.record(linear_state(t))
+    recorder.close()
+    return path
+
+
+def test_recorder_cadence_and_pause(tmp_path):
+    """
+    test som sjekker at en tilstand bare blir skrevet når det har gått cadence siden forrige, og at opptaket er pauset mens tiden er før siste tilstand
+    """
+    recorder = TrajectoryRecorder(str(tmp_path / "recording"), linear_state(0), cadence=CADENCE)
+    assert not recorder.paused(linear_state(0))
+    assert recorder.record(linear_state(0))
+    assert not recorder.record(linear_state(50))
+    assert recorder.record(linear_state(100))
+    assert recorder.paused(linear_state(40)) # tiden går bakover
+    assert not recorder.record(linear_state(40))
+    assert not recorder.paused(linear_state(150))
+    recorder.close()
+    assert len(TrajectoryReader(str(tmp_path / "recording"))) == 2
+
+
+def test_locate(recording):
+    """
+    test som sjekker at locate gir siste tilstand med tid <= t, og holder seg innenfor opptaket for tider før og etter
+    """
+    reader = TrajectoryReader(recording)
+    times = np.array(reader.times)
+    assert len(reader) == 10 and np.all(np.diff(times) >= CADENCE)
+    assert reader.locate(times[0] - 50) == 0
+    assert reader.locate(times[-1] + 50) == len(reader) - 2 # aldri den aller siste, slik at det finnes en tilstand etter
+    assert reader.locate(times[-1]) == len(reader) - 2
+    for k, t in enumerate(times[:-1]):
+        assert reader.locate(t) == k # nøyaktig på en tilstand
+        assert reader.locate(t + 1e-6) == k
+        assert reader.locate(np.nextafter(times[k + 1], -np.inf)) == k # rett før neste tilstand
+
+
+def test_sample(recording):
+    """
+    test som sjekker at sample gjenskaper rettlinjet bevegelse mellom tilstandene, også over grensen mellom to chunk filer
+    """
+    reader = TrajectoryReader(recording)
+    state = linear_state(0)
+    for t in np.linspace(reader.start_time, reader.end_time, 37):
+        reader.sample(t, state)
+        expected = linear_state(t)
+        np.testing.assert_allclose(state.pos, expected.pos, rtol=1e-12, atol=1e-9)
+        np.testing.assert_allclose(state.vel, expected.vel, rtol=1e-12)
+        assert state.time == t
+    reader.sample(reader.end_time + 500, state) # tiden blir holdt innenfor opptaket
+    assert state.time == reader.end_time
+    np.testing.assert_allclose(state.pos, linear_state(reader.end_time).pos, rtol=1e-12)
@@ -0,0 +1,68 @@
+"""
+tester for satellittsystemene i src/satellites.py: månene skal følge planetene sine like godt som en direkte integrasjon med små tidssteg, selv om det ytre tidssteget er mye lengre enn omløpstiden til månene
+"""
+import numpy as np # importerer numpy for å regne ut feil
+import pytest # importerer pytest for fixtures og parametriserte tester
+from src.catalog import load_catalog, generate_moons # importerer katalogen og de store månene
+from src.simulation import Simulator, SECONDS_PER_DAY # importerer simuleringskjernen
+
+DAYS = 20 # hvor lenge det integreres. Io går rundt Jupiter over ti ganger
+REFERENCE_ACCURACY = 0.005 # nøyaktighetsmål for referanseløsningen med yoshida4 uten satellittsystemer
+
+### integrator, nøyaktighetsmål og største relative feil i posisjonen til månene relativt til planeten. Grensene er omtrent ti ganger det integratorene gir i dag
+MOON_ERROR = [
+    ("wisdom_holman", 0.1, 5e-3),
+    ("leapfrog", 0.02, 2e-4),
+]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """
+    fixture med solsystemet og de store månene
+    """
+    catalog = load_catalog()
+    catalog.extend(generate_moons(catalog))
+    return catalog
+
+
+@pytest.fixture(scope="module")
+def reference(catalog):
+    """
+    fixture med referanseløsningen: alle legemer integrert direkte med tidssteg som er korte nok for månene
+    """
+    simulator = Simulator(catalog.state.copy(), solver="direct")
+    simulator.fast_forward(DAYS * SECONDS_PER_DAY, REFERENCE_ACCURACY, integrator="yoshida4")
+    return simulator.state
+
+
+def moon_errors(catalog, state, reference) -> np.ndarray:
+    """
+    funksjon som returnerer den relative feilen i posisjonen til hver måne relativt til planeten sin
+    """
+    groups = catalog.satellite_groups()
+    moons = np.concatenate([group[1:] for group in groups])
+    planets = np.concatenate([np.full(len(group) - 1, group[0]) for group in groups])
+    relative = state.pos[moons] - state.pos[planets]
+    expected = reference.pos[moons] - reference.pos[planets]
+    return np.hypot(*(relative - expected).T) / np.hypot(*expected.T)
+
+
+@pytest.mark.parametrize("integrator, accuracy, limit", MOON_ERROR)
+def test_moons_follow_planets(catalog, reference, integrator, accuracy, limit):
+    """
+    test som sjekker at månene i satellittsystemer havner nær referanseløsningen relativt til planeten sin
+    """
+    simulator = Simulator(catalog.state.copy(), satellites=catalog.satellite_groups())
+    simulator.fast_forward(DAYS * SECONDS_PER_DAY, accuracy, integrator=integrator)
+    assert simulator.state.time == reference.time
+    assert moon_errors(catalog, simulator.state, reference).max() < limit
+
+
+def test_moons_lost_without_satellite_systems(catalog, reference):
+    """
+    test som sjekker at det samme nøyaktighetsmålet uten satellittsystemer gir et tidssteg som er for langt for månene, slik at testen over faktisk måler noe
+    """
+    simulator = Simulator(catalog.state.copy())
+    simulator.fast_forward(DAYS * SECONDS_PER_DAY, MOON_ERROR[0][1], integrator=MOON_ERROR[0][0])
+    assert moon_errors(catalog, simulator.state, reference).max() > 0.1
@@ -0,0 +1,135 @@
+"""
+tester for lagringsplassene og autolagringen i src/save_slots.py
+"""
+import threading # importerer bibliotek for å holde igjen autolagringstråden
+import time # importerer bibliotek for å vente på tråden
+import pytest # importerer pytest for fixtures
+from src.save_slots import SaveSlots, Autosaver # importerer lagringsplassene og autolagringen som testes
+from src.simulation import init_system_state # importerer solsystemet som lagres
+
+TIMEOUT = 10 # største antall sekunder det ventes på tråden
+
+
+@pytest.fixture
+def slots(tmp_path):
+    """
+    fixture med tomme lagringsplasser i en midlertidig mappe
+    """
+    return SaveSlots(str(tmp_path / "saves"))
+
+
+def set_saved_at(slots: SaveSlots, **saved_at: float) -> None:
+    """
+    funksjon som setter når slottene ble lagret i indeksen, slik at rekkefølgen ikke avhenger av klokken
+    """
+    index = slots.read_index()
+    for slot, value in saved_at.items():
+        index[slot]["saved_at"] = value
+    slots.write_index(index)
+
+
+def test_latest(slots):
+    """
+    test som sjekker at latest gir slotten som ble lagret sist, og hopper over slotter som mangler snapshot filen
+    """
+    assert slots.latest() is None
+    state = init_system_state()
+    slots.save("resume", state, 100, 1, 1, (0, 0))
+    slots.save("autosave", state, 200, 1, 1, (0, 0))
+    set_saved_at(slots, resume=2.0, autosave=1.0)
+    assert slots.latest() == "resume"
+    slots.storage("resume").clear() # snapshot filen er borte, men indeksen har den fortsatt
+    assert slots.latest() == "autosave"
+
+
+def test_archive(slots):
+    """
+    test som sjekker at archive kopierer den nyeste av slottene til målet og sletter slottene
+    """
+    state = init_system_state()
+    slots.save("resume", state, 100, 1, 1, (0, 0))
+    slots.save("autosave", state, 200, 1, 1, (0, 0))
+    set_saved_at(slots, resume=1.0, autosave=2.0)
+    slots.archive(["resume", "autosave"], "previous")
+    assert set(slots.read_index()) == {"previous"}
+    assert slots.read_index()["previous"]["time"] == 200
+    assert slots.storage("previous").get()["time"] == 200
+    assert slots.storage("resume").get() is None and slots.storage("autosave").get() is None
+    assert slots.latest() == "previous"
+
+
+def test_archive_without_saves(slots):
+    """
+    test som sjekker at archive ikke lager målet når ingen av slottene er lagret
+    """
+    slots.archive(["resume", "autosave"], "previous")
+    assert slots.read_index() == {} and slots.latest() is None
+
+
+class GatedSlots(SaveSlots):
+    """
+    lagringsplasser der hver lagring venter på gate, slik at testen bestemmer når autolagringstråden blir ferdig
+    """
+    def __init__(self, directory: str) -> None:
+        super().__init__(directory)
+        self.gate = threading.Event() # lagringen venter til denne er satt
+        self.saved = [] # simuleringstiden til hver lagring
+
+    def save(self, slot, state, sim_time, *args) -> None:
+        self.gate.wait(TIMEOUT)
+        super().save(slot, state, sim_time, *args)
+        self.saved.append(sim_time)
+
+
+def test_close_flushes_pending(tmp_path):
+    """
+    test som sjekker at close skriver den siste kopien som venter før tråden avslutter, og at en eldre kopi som venter blir erstattet av en nyere
+    """
+    slots = GatedSlots(str(tmp_path / "saves"))
+    autosaver = Autosaver(slots, interval=0, debounce=0)
+    state = init_system_state()
+    autosaver.request(state, 100, 1, 1, (0, 0))
+    deadline = time.monotonic() + TIMEOUT
+    while autosaver.pending is not None and time.monotonic() < deadline: # venter til tråden har tatt den første kopien og venter på gate
+        time.sleep(0.001)
+    autosaver.request(state, 200, 1, 1, (0, 0)) # venter, blir erstattet
+    autosaver.request(state, 300, 1, 1, (0, 0)) # venter til close
+    threading.Timer(0.05, slots.gate.set).start() # slipper tråden mens close venter på den
+    autosaver.close()
+    assert slots.saved == [100, 300]
+    assert SaveSlots(slots.directory).storage("autosave").get()["time"] == 300
+
+
+def test_skips_unchanged(slots):
+    """
+    test som sjekker at maybe_save ikke lager en ny kopi når simuleringstiden og kameraet er de samme som i forrige kopi, men gjør det når kameraet er flyttet
+    """
+    autosaver = Autosaver(slots, interval=0, debounce=0)
+    state = init_system_state()
+    try:
+        autosaver.maybe_save(state, 100, 1, 1, (0, 0))
+        requested_at = autosaver.requested_at
+        autosaver.maybe_save(state, 100, 1, 1, (0, 0)) # pauset, ingenting er endret
+        assert autosaver.requested_at == requested_at
+        autosaver.maybe_save(state, 100, 1, 1, (5, 0)) # kameraet er flyttet
+        assert autosaver.requested_at > requested_at
+    finally:
+        autosaver.close()
+    assert slots.storage("autosave").get()["camera_offset"] == [5, 0]
+
+
+def test_debounce_writes_latest(tmp_path):
+    """
+    test som sjekker at kopier som kommer rett etter hverandre blir en lagring av den siste
+    """
+    slots = GatedSlots(str(tmp_path / "saves"))
+    slots.gate.set()
+    autosaver = Autosaver(slots, interval=0, debounce=0.2)
+    state = init_system_state()
+    for sim_time in (100, 200, 300):
+        autosaver.request(state, sim_time, 1, 1, (0, 0))
+    deadline = time.monotonic() + TIMEOUT
+    while not slots.saved and time.monotonic() < deadline: # venter til tråden har skrevet
+        time.sleep(0.01)
+    autosaver.close()
+    assert slots.saved == [300]
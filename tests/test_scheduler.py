@@ -0,0 +1,65 @@
+"""
+tester for src/scheduler.py: at simuleringen kommer like langt med de samme stegene uansett hvor lang tid hver frame tar
+"""
+import numpy as np # importerer numpy for å lage frame tider
+import pytest # importerer pytest for parametriserte tester
+from src.scheduler import FixedStepScheduler, BATCH_SIZE, PHYSICS_DT # importerer scheduleren som testes
+
+DT_PER_S = 86400 # ett døgn simuleringstid per sekund
+WALL_TIME = 2.05 # sekunder virkelig tid. Gir ikke et helt antall delsteg, slik at avrunding i akkumulatoren blir testet
+BUDGET = 10.0 # stort budsjett slik at ingen steg blir kastet
+
+
+def frame_times(fps: float|None) -> list[float]:
+    """
+    funksjon som returnerer tiden hver frame tar over WALL_TIME sekunder, med fast FPS eller tilfeldig lange frames hvis fps er None
+    """
+    rng = np.random.default_rng(0)
+    times = [] # tiden hver frame tar
+    while sum(times) < WALL_TIME:
+        frame_time = rng.uniform(0.001, 0.1) if fps is None else 1 / fps
+        times.append(min(frame_time, WALL_TIME - sum(times))) # siste frame slutter på WALL_TIME
+    return times
+
+
+def run(fps: float|None, merge_steps: bool) -> tuple[float, list[tuple[float, float]]]:
+    """
+    funksjon som kjører scheduleren over alle framene og returnerer simuleringstiden og hvert steg som (starttid, lengde)
+    """
+    scheduler = FixedStepScheduler(budget=BUDGET, merge_steps=merge_steps)
+    sim_time = 0.0
+    steps = []
+
+    def step(dt: float, n: int) -> None:
+        nonlocal sim_time
+        for _ in range(n):
+            steps.append((sim_time, dt))
+            sim_time += dt
+
+    for frame_time in frame_times(fps):
+        scheduler.advance(frame_time, DT_PER_S, step, sim_time)
+        assert not scheduler.falling_behind
+    return sim_time, steps
+
+
+@pytest.mark.parametrize("merge_steps", [False, True])
+def test_same_steps_at_any_frame_rate(merge_steps):
+    """
+    test som sjekker at 30 FPS, 144 FPS og tilfeldig lange frames gir samme simuleringstid og nøyaktig de samme stegene
+    """
+    expected_time, expected_steps = run(30, merge_steps)
+    block = PHYSICS_DT * (BATCH_SIZE if merge_steps else 1) # lengden på hvert steg
+    assert expected_time == int(WALL_TIME * DT_PER_S // block) * block
+    assert all(dt == block for _, dt in expected_steps)
+    for fps in (144, None):
+        assert run(fps, merge_steps) == (expected_time, expected_steps)
+
+
+def test_budget_drops_steps():
+    """
+    test som sjekker at steg som ikke rekkes innenfor budsjettet blir kastet istedenfor å samles opp
+    """
+    scheduler = FixedStepScheduler(budget=0.0)
+    taken = []
+    scheduler.advance(0.1, DT_PER_S, lambda dt, n: taken.append(n))
+    assert taken == [] and scheduler.falling_behind and scheduler.accumulator == 0
@@ -0,0 +1,47 @@
+"""
+tester for fast forward i src/simulation.py: at klokken lander nøyaktig på målet, at integrasjonen kan avbrytes, og at standard integrator og nøyaktighet holder seg nær en referanseløsning
+"""
+import numpy as np # importerer numpy for å sammenligne posisjoner
+from src import simulation # importerer modulen for å endre PROGRESS_INTERVAL
+from src.simulation import Simulator, init_system_state, SECONDS_PER_DAY # importerer simuleringskjernen
+
+TARGET = 365 * SECONDS_PER_DAY + 1234 # ett år og et tidspunkt som ikke går opp i tidssteget
+
+
+def test_lands_on_target():
+    """
+    test som sjekker at klokken er et heltall som lander nøyaktig på målet, både fram og tilbake i tid
+    """
+    simulator = Simulator(init_system_state())
+    assert simulator.fast_forward(TARGET)
+    assert simulator.state.time == TARGET and isinstance(simulator.state.time, int)
+    assert simulator.fast_forward(0)
+    assert simulator.state.time == 0
+
+
+def test_matches_reference():
+    """
+    test som sjekker at standard integrator og nøyaktighet havner nær en referanseløsning med yoshida4 og et lite tidssteg. Grensen er omtrent fem ganger det den gir i dag
+    """
+    reference = Simulator(init_system_state())
+    reference.fast_forward(TARGET, accuracy=0.0025, integrator="yoshida4")
+    simulator = Simulator(init_system_state())
+    simulator.fast_forward(TARGET)
+    assert np.max(np.hypot(*(simulator.state.pos - reference.state.pos).T)) < 1e9
+
+
+def test_progress_cancels(monkeypatch):
+    """
+    test som sjekker at fremdriften øker, og at integrasjonen stopper før målet når progress returnerer False
+    """
+    monkeypatch.setattr(simulation, "PROGRESS_INTERVAL", -1) # rapporterer fremdrift etter hver bit med steg
+    reports = []
+
+    def progress(done: float) -> bool:
+        reports.append(done)
+        return len(reports) < 3 # avbryter ved tredje rapport
+
+    simulator = Simulator(init_system_state())
+    assert not simulator.fast_forward(10 * TARGET, progress=progress)
+    assert len(reports) == 3 and reports == sorted(reports) and 0 < reports[-1] < 1
+    assert 0 < simulator.state.time < 10 * TARGET
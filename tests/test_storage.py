@@ -0,0 +1,97 @@
+"""
+tester for den binære lagringen i src/storage.py
+"""
+import json # importerer bibliotek for å lage en lagring i det gamle json formatet
+import numpy as np # importerer numpy for å sammenligne arrays
+import pytest # importerer pytest for parametriserte tester
+from src.simulation import init_system_state # importerer solsystemet som lagres
+from src.storage import Storage, HEADER, MAGIC, VERSION # importerer lagringen som testes
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """
+    fixture med en tom lagring i en midlertidig mappe
+    """
+    return Storage(str(tmp_path / "storage.bin"))
+
+
+def test_roundtrip(storage):
+    """
+    test som sjekker at tilstand, klokke og kamera er de samme etter lagring og lesing
+    """
+    state = init_system_state()
+    storage.update(state, 86400.5, 3600, 1.5, (12.0, -7.0))
+    data = Storage(storage.file_path).get() # ny instans, slik at filen faktisk leses fra disk
+    assert data["names"] == state.names
+    np.testing.assert_array_equal(data["mass"], state.mass)
+    np.testing.assert_array_equal(data["pos"], state.pos)
+    np.testing.assert_array_equal(data["vel"], state.vel)
+    assert (data["time"], data["dt_per_s"], data["zoom"], data["camera_offset"]) == (86400.5, 3600, 1.5, [12.0, -7.0])
+
+
+def test_empty_and_cleared(storage):
+    """
+    test som sjekker at get gir None når ingenting er lagret, også etter clear
+    """
+    assert storage.get() is None
+    storage.update(init_system_state(), 0, 1, 1, (0, 0))
+    assert storage.get() is not None
+    storage.clear()
+    assert storage.get() is None
+
+
+def test_cache_follows_file(storage):
+    """
+    test som sjekker at en ny lagring blir lest selv om den forrige ligger i cachen
+    """
+    state = init_system_state()
+    storage.update(state, 0, 1, 1, (0, 0))
+    assert storage.get()["time"] == 0
+    storage.update(state, 100, 1, 1, (0, 0))
+    assert storage.get()["time"] == 100
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda raw: raw[:HEADER.size - 1], # avkuttet header
+    lambda raw: raw[:-8], # avkuttet data
+    lambda raw: raw + b"\0", # ekstra bytes på slutten
+    lambda raw: b"XXXXXX" + raw[len(MAGIC):], # feil magic
+    lambda raw: b"", # tom fil
+    lambda raw: raw[:HEADER.size] + b"\xff" + raw[HEADER.size + 1:], # navn som ikke er utf-8
+    lambda raw: raw[:HEADER.size] + raw[HEADER.size:].replace(b"\n", b"_", 1), # ett navn for lite
+])
+def test_rejects_corrupt_file(storage, corrupt):
+    """
+    test som sjekker at en ødelagt fil gir None istedenfor en feil eller halvveis lest tilstand
+    """
+    storage.update(init_system_state(), 0, 1, 1, (0, 0))
+    with open(storage.file_path, "rb") as f:
+        raw = f.read()
+    storage.write(corrupt(raw))
+    assert storage.get() is None
+
+
+def test_rejects_other_version(storage):
+    """
+    test som sjekker at en fil med en annen versjon av formatet ikke blir lest
+    """
+    storage.update(init_system_state(), 0, 1, 1, (0, 0))
+    with open(storage.file_path, "rb") as f:
+        raw = bytearray(f.read())
+    raw[len(MAGIC):len(MAGIC) + 2] = (VERSION - 1).to_bytes(2, "little") # versjonen står rett etter magic
+    storage.write(bytes(raw))
+    assert storage.get() is None
+
+
+def test_imports_legacy_json(tmp_path):
+    """
+    test som sjekker at en lagring i det gamle json formatet blir importert når den binære filen ikke finnes
+    """
+    legacy = tmp_path / "storage_data.json"
+    legacy.write_text(json.dumps({"space_objects": [{"name": "Jorda", "x": 1.0, "y": 2.0, "v_x": 3.0, "v_y": 4.0}], "time": 50, "dt_per_s": 10, "zoom": 2, "camera_offset": [1, 2]}))
+    data = Storage(str(tmp_path / "storage.bin"), str(legacy)).get()
+    assert data["names"] == ["Jorda"]
+    np.testing.assert_array_equal(data["pos"], [[1.0, 2.0]])
+    np.testing.assert_array_equal(data["vel"], [[3.0, 4.0]])
+    assert data["time"] == 50
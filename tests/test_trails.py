@@ -0,0 +1,70 @@
+"""
+tester for ringbufferen i src/trails.py: at punkter bare legges til når simuleringstiden har endret seg nok, og at ordered gir punktene fra eldst til nyest også etter at bufferen har gått rundt
+"""
+import numpy as np # importerer numpy for å sammenligne punktene
+from src.trails import OrbitTrails # importerer banene som testes
+
+CAPACITY = 4 # antall punkter i ringbufferen
+INTERVAL = 10.0 # simuleringstid mellom hvert punkt
+
+
+def positions(i: int) -> np.ndarray:
+    """
+    funksjon som lager posisjonene til to legemer ved punkt nummer i, slik at hvert punkt kan kjennes igjen
+    """
+    return np.array([[i, -i], [100.0 + i, 0.0]], dtype=np.float64)
+
+
+def record_points(trails: OrbitTrails, points: range) -> None:
+    """
+    funksjon som legger til et punkt for hvert tall i points, med INTERVAL simuleringstid mellom hvert
+    """
+    for i in points:
+        trails.record(positions(i), i * INTERVAL)
+
+
+def test_record_skips_short_intervals():
+    """
+    test som sjekker at et punkt bare blir lagt til når simuleringstiden har endret seg med minst sample_interval, både fram og tilbake i tid
+    """
+    trails = OrbitTrails(2, capacity=CAPACITY, sample_interval=INTERVAL)
+    trails.record(positions(0), 0.0)
+    trails.record(positions(1), INTERVAL / 2) # for kort tid
+    assert trails.count == 1
+    trails.record(positions(2), -INTERVAL) # bakover i tid
+    assert trails.count == 2
+    np.testing.assert_array_equal(trails.ordered(), np.stack([positions(0), positions(2)], axis=1))
+
+
+def test_ordered_before_wraparound():
+    """
+    test som sjekker at ordered gir bare punktene som er lagret, eldst først, før bufferen er full
+    """
+    trails = OrbitTrails(2, capacity=CAPACITY, sample_interval=INTERVAL)
+    assert trails.ordered().shape == (2, 0, 2)
+    record_points(trails, range(3))
+    np.testing.assert_array_equal(trails.ordered(), np.stack([positions(i) for i in range(3)], axis=1))
+
+
+def test_ordered_after_wraparound():
+    """
+    test som sjekker at ordered gir de siste capacity punktene eldst først etter at bufferen har skrevet over de eldste, for hver posisjon head kan ha
+    """
+    for n in range(CAPACITY, 3 * CAPACITY):
+        trails = OrbitTrails(2, capacity=CAPACITY, sample_interval=INTERVAL)
+        record_points(trails, range(n))
+        assert trails.count == CAPACITY
+        np.testing.assert_array_equal(trails.ordered(), np.stack([positions(i) for i in range(n - CAPACITY, n)], axis=1))
+
+
+def test_clear_and_new_bodies():
+    """
+    test som sjekker at clear sletter punktene, og at bufferen starter på nytt når antall legemer endres
+    """
+    trails = OrbitTrails(2, capacity=CAPACITY, sample_interval=INTERVAL)
+    record_points(trails, range(6))
+    trails.clear()
+    assert trails.ordered().shape == (2, 0, 2)
+    trails.record(positions(7), 0.0) # rett etter clear blir punktet lagt til uansett tid
+    trails.record(np.zeros((3, 2)), 2 * INTERVAL) # et legeme er lagt til
+    assert trails.ordered().shape == (3, 1, 2)
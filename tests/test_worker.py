@@ -0,0 +1,104 @@
+"""
+tester for workeren i src/worker.py: at tilstanden kommer uendret gjennom det delte minnet, og at workeren følger kommandoene for tidsendring og pause
+"""
+import time # importerer bibliotek for å vente på workeren
+import numpy as np # importerer numpy for å sammenligne tilstander
+from src.simulation import SystemState # importerer tilstanden som publiseres
+from src.worker import PhysicsWorker, SnapshotBuffer, HEADER_SIZE # importerer workeren som testes
+
+TIMEOUT = 10 # største antall sekunder det ventes på workeren
+
+
+def two_bodies(time: float=0) -> SystemState:
+    """
+    funksjon som lager en tilstand med en stjerne og en planet i bane rundt den
+    """
+    state = SystemState(["sol", "planet"], [2e30, 6e24], [[0.0, 0.0], [1.5e11, 0.0]], [[0.0, 0.0], [0.0, 3e4]], time)
+    state.acc[:] = [[1e-8, 2e-8], [-6e-3, 0.0]]
+    return state
+
+
+def wait_for(worker: PhysicsWorker, condition) -> None:
+    """
+    funksjon som leser tilstanden fra workeren til condition er sann for den, eller feiler etter TIMEOUT sekunder
+    """
+    deadline = time.monotonic() + TIMEOUT
+    while time.monotonic() < deadline:
+        worker.update_state(interpolate=False)
+        if condition(worker.state):
+            return
+        time.sleep(0.01)
+    raise AssertionError("workeren publiserte ikke den forventede tilstanden")
+
+
+def test_snapshot_roundtrip():
+    """
+    test som sjekker at en tilstand skrevet til bufferen blir lest likt tilbake av en buffer som er koblet til samme delte minne
+    """
+    state = two_bodies(time=1234.5)
+    writer = SnapshotBuffer(len(state))
+    reader = SnapshotBuffer(len(state), name=writer.shm.name)
+    try:
+        assert reader.read() is None # ingenting er publisert enda
+        writer.write(state, 10.0, 3600.0, True)
+        snapshot = reader.read()
+        assert snapshot[0] % 2 == 0 # skrivingen er ferdig
+        assert tuple(snapshot[1:HEADER_SIZE]) == (1234.5, 10.0, 3600.0, 1.0)
+        np.testing.assert_array_equal(snapshot[HEADER_SIZE:].reshape(3, 2, 2), [state.pos, state.vel, state.acc])
+        state.pos += 1.0 # ny tilstand går til den andre bufferen
+        writer.write(state, 11.0, 3600.0, False)
+        np.testing.assert_array_equal(reader.read()[HEADER_SIZE:HEADER_SIZE + 4].reshape(2, 2), state.pos)
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_speed_and_pause():
+    """
+    test som sjekker at workeren står stille med tidsendring 0, går framover etter "speed", og står stille igjen etter "pause"
+    """
+    worker = PhysicsWorker(two_bodies(), dt_per_s=0)
+    worker.start()
+    try:
+        time.sleep(0.1)
+        wait_for(worker, lambda state: state.time == 0) # tidsendring 0, ingenting skjer
+        worker.send("speed", 1e6)
+        wait_for(worker, lambda state: state.time > 0)
+        worker.send("pause")
+        time.sleep(0.1) # workeren har fått med seg pausen
+        worker.update_state(interpolate=False)
+        paused_time = worker.state.time
+        time.sleep(0.1)
+        worker.update_state(interpolate=False)
+        assert worker.state.time == paused_time
+    finally:
+        worker.stop()
+
+
+def test_display_state_is_one_epoch():
+    """
+    test som sjekker at tilstanden som vises har posisjoner og fartsvektorer fra samme tidspunkt mellom de to siste tilstandene, og at latest_state er den nyeste tilstanden uten interpolasjon
+    """
+    first = two_bodies(time=0)
+    second = two_bodies(time=100)
+    second.pos += 1e6
+    second.vel += 1e3
+    second.acc *= 2
+    worker = PhysicsWorker(first.copy(), dt_per_s=0) # workeren startes ikke, tilstandene skrives direkte til det delte minnet
+    try:
+        now = time.monotonic()
+        worker.snapshots.write(first, now - 1.5, 0.0, False)
+        worker.poll()
+        worker.snapshots.write(second, now - 0.5, 0.0, False) # visningen er omtrent halvveis mellom tilstandene
+        worker.update_state()
+        alpha = worker.state.time / second.time # hvor langt mellom tilstandene visningen er
+        assert 0 < alpha < 1
+        np.testing.assert_allclose(worker.state.pos, first.pos + (second.pos - first.pos) * alpha)
+        np.testing.assert_allclose(worker.state.vel, first.vel + (second.vel - first.vel) * alpha)
+        np.testing.assert_allclose(worker.state.acc, first.acc + (second.acc - first.acc) * alpha)
+        assert worker.latest_state.time == second.time
+        np.testing.assert_array_equal(worker.latest_state.pos, second.pos)
+        np.testing.assert_array_equal(worker.latest_state.vel, second.vel)
+        np.testing.assert_array_equal(worker.latest_state.acc, second.acc)
+    finally:
+        worker.snapshots.close()